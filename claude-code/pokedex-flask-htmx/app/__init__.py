@@ -1,6 +1,15 @@
+import atexit
 import os
 from flask import Flask, render_template
-from app.config import config
+from app.assets import init_assets
+from app.compression import init_compression
+from app.config import config, Config
+from app.fragment_cache import init_fragment_cache
+from app.http_cache import compute_template_version, init_page_cache
+from app.metrics import init_metrics
+from app.profiling import init_profiling
+from app.sequencing import init_sequencing
+from app.services.pokeapi import PokeAPIService
 
 
 def create_app(test_config=None):
@@ -12,19 +21,48 @@ def create_app(test_config=None):
         env = os.environ.get("FLASK_ENV", "development")
         app.config.from_object(config.get(env, config["default"]))
     else:
-        # Load the test config
+        # Load the test config on top of the base defaults
+        app.config.from_object(Config)
         app.config.from_mapping(test_config)
 
+    # Installed first, so the metrics and profiling middleware also see replayed pages
+    init_page_cache(app)
+    if app.config["METRICS_ENABLED"]:
+        init_metrics(app)
+    if app.config["PROFILE_ENABLED"]:
+        init_profiling(app)
+
+    # Fingerprinted CSS/JS from `flask pokedex build-assets`, if built
+    init_assets(app)
+    init_compression(app)
+
+    # Part of every ETag, so changed templates invalidate cached pages
+    app.config.setdefault("TEMPLATE_VERSION", compute_template_version(app))
+    init_fragment_cache(app)
+    init_sequencing(app)
+
     # Ensure instance folder exists
     try:
         os.makedirs(app.instance_path)
     except OSError:
         pass
 
+    # One PokeAPI service per process so upstream connections are reused
+    service = PokeAPIService.from_config(app.config)
+    app.extensions["pokeapi"] = service
+    atexit.register(service.close)
+
     # Register blueprints
-    from app.routes import main
+    from app.routes import admin, api, main
 
     app.register_blueprint(main.bp)
+    app.register_blueprint(api.bp)
+    app.register_blueprint(admin.bp)
+
+    # Register CLI commands
+    from app.cli import pokedex_cli
+
+    app.cli.add_command(pokedex_cli)
 
     # Register error handlers
     @app.errorhandler(404)
@@ -35,4 +73,8 @@ def create_app(test_config=None):
     def internal_error(error):
         return render_template("errors/500.html"), 500
 
+    @app.errorhandler(503)
+    def unavailable_error(error):
+        return render_template("errors/503.html"), 503
+
     return app
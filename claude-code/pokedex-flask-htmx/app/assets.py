@@ -0,0 +1,95 @@
+"""
+Fingerprinted static assets.
+
+`flask pokedex build-assets` writes the built CSS and JS to app/static/dist
+under content-hashed names, plus a manifest.json mapping logical names
+("app.css") to them. Templates call asset_url(), which returns None while
+no build exists so development can fall back to the CDN tags. Hashed files
+never change, so they are served with a one-year immutable Cache-Control.
+"""
+import hashlib
+import json
+import os
+from typing import Dict, Optional
+
+from flask import current_app, request, url_for
+
+ASSET_DIR = "dist"
+MANIFEST_NAME = "manifest.json"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def manifest_path(static_folder: str) -> str:
+    return os.path.join(static_folder, ASSET_DIR, MANIFEST_NAME)
+
+
+def fingerprint(data: bytes) -> str:
+    """Short content hash used in asset filenames."""
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
+def build_assets(static_folder: str, sources: Dict[str, bytes]) -> Dict[str, str]:
+    """
+    Write assets under hashed names and replace the manifest.
+
+    Files from earlier builds that are no longer referenced are removed.
+
+    Args:
+        static_folder: The app's static folder
+        sources: Logical name ("app.css") to file contents
+
+    Returns:
+        The new manifest, logical name to path relative to static_folder
+    """
+    dist = os.path.join(static_folder, ASSET_DIR)
+    os.makedirs(dist, exist_ok=True)
+
+    manifest = {}
+    for logical, data in sources.items():
+        stem, ext = os.path.splitext(logical)
+        filename = f"{stem}.{fingerprint(data)}{ext}"
+        with open(os.path.join(dist, filename), "wb") as f:
+            f.write(data)
+        manifest[logical] = f"{ASSET_DIR}/{filename}"
+
+    keep = {os.path.basename(path) for path in manifest.values()} | {MANIFEST_NAME}
+    for filename in os.listdir(dist):
+        if filename not in keep:
+            os.remove(os.path.join(dist, filename))
+
+    tmp_path = manifest_path(static_folder) + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, manifest_path(static_folder))
+    return manifest
+
+
+def load_manifest(static_folder: str) -> Dict[str, str]:
+    """Read the asset manifest, or an empty one if assets were never built."""
+    try:
+        with open(manifest_path(static_folder)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def asset_url(logical: str) -> Optional[str]:
+    """URL of a built asset, or None if it is not in the manifest."""
+    path = current_app.extensions["assets"].get(logical)
+    return url_for("static", filename=path) if path else None
+
+
+def mark_immutable(response):
+    """after_request hook: far-future caching for fingerprinted files."""
+    if request.endpoint == "static" and response.status_code in (200, 304):
+        filename = (request.view_args or {}).get("filename", "")
+        if filename.startswith(f"{ASSET_DIR}/") and not filename.endswith(MANIFEST_NAME):
+            response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+    return response
+
+
+def init_assets(app) -> None:
+    """Load the manifest and expose asset_url() to templates."""
+    app.extensions["assets"] = load_manifest(app.static_folder)
+    app.add_template_global(asset_url)
+    app.after_request(mark_immutable)
@@ -0,0 +1,166 @@
+import os
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+from app.assets import build_assets
+from app.http_cache import record_page_purge
+from app.profiling import COLLAPSED_SUFFIX, profile_dir, profile_files, summarize_collapsed, summarize_pstats
+from app.services.cache import create_cache
+from app.services.pokeapi import PokeAPIService
+from app.services.snapshot import SnapshotError, build_snapshot, save_snapshot
+from app.services.warmup import warm_cache
+
+pokedex_cli = AppGroup("pokedex", help="Pokédex data management commands.")
+
+
+@pokedex_cli.command("snapshot")
+@click.option("--limit", default=None, type=int, help="Number of pokemon to include (defaults to POKEDEX_SIZE).")
+@click.option("--output", default=None, help="Snapshot file (defaults to POKEDEX_SNAPSHOT_PATH).")
+def snapshot_command(limit, output):
+    """Fetch the list and details from PokeAPI into a local snapshot file."""
+    config = current_app.config
+    output = output or config["POKEDEX_SNAPSHOT_PATH"]
+    # Always read from the network, even when the app runs in local mode
+    service = PokeAPIService(
+        config["POKEAPI_BASE_URL"],
+        pool_connections=config["POKEAPI_POOL_CONNECTIONS"],
+        pool_maxsize=config["POKEAPI_POOL_MAXSIZE"],
+        timeout=config["POKEAPI_TIMEOUT"],
+        cache_timeout=0,
+    )
+
+    try:
+        snapshot = build_snapshot(service, limit=limit or config["POKEDEX_SIZE"])
+    except SnapshotError as e:
+        raise click.ClickException(str(e))
+    finally:
+        service.close()
+
+    save_snapshot(snapshot, output)
+    click.echo(f"Wrote {snapshot['count']} pokemon to {output}")
+
+
+@pokedex_cli.command("purge-cache")
+@click.option("--responses", is_flag=True, help="Also drop cached PokeAPI responses.")
+def purge_cache_command(responses):
+    """
+    Drop cached pages from the configured cache backend.
+
+    Reaches every worker when CACHE_BACKEND is disk or redis; the in-memory
+    backend lives inside each worker, use POST /admin/cache/purge instead.
+    """
+    if current_app.config["CACHE_BACKEND"] == "memory":
+        raise click.ClickException(
+            "The memory backend lives inside each worker, so this process has nothing to purge; "
+            "use POST /admin/cache/purge on the running app instead"
+        )
+    namespaces = ["page"] + (["pokeapi"] if responses else [])
+    for namespace in namespaces:
+        cache = create_cache(current_app.config, namespace=namespace)
+        if cache is not None:
+            cache.clear()
+            cache.close()
+    record_page_purge(current_app.config)
+    click.echo(f"Purged {', '.join(namespaces)} cache ({current_app.config['CACHE_BACKEND']} backend)")
+
+
+@pokedex_cli.command("warm")
+@click.option("--limit", default=None, type=int, help="Number of pokemon to warm (defaults to POKEDEX_SIZE).")
+@click.option("--concurrency", default=None, type=int, help="Parallel requests (defaults to CACHE_WARM_CONCURRENCY).")
+def warm_command(limit, concurrency):
+    """
+    Fetch the list and every detail into the configured cache backend.
+
+    Useful after a deploy with CACHE_BACKEND=disk or redis, where the
+    workers read what this command writes. The in-memory backend is private
+    to each process, which the server warms itself (gunicorn before forking,
+    run.py with CACHE_WARM_ON_START).
+    """
+    config = current_app.config
+    service = current_app.extensions["pokeapi"]
+    if service.snapshot is not None or service.cache is None:
+        raise click.ClickException("Nothing to warm: caching is disabled or the app serves a local snapshot")
+
+    report = warm_cache(
+        service,
+        limit=limit or config["POKEDEX_SIZE"],
+        page_size=config["POKEDEX_PAGE_SIZE"],
+        concurrency=concurrency or config["CACHE_WARM_CONCURRENCY"],
+    )
+    click.echo(f"{report} using the {config['CACHE_BACKEND']} backend")
+    if report.failures:
+        click.echo(f"Failed: {', '.join(report.failures)}", err=True)
+        raise SystemExit(1)
+
+
+@pokedex_cli.command("build-assets")
+@click.option("--css", "css_path", default="build/tailwind.css", show_default=True, help="Built Tailwind CSS.")
+@click.option(
+    "--htmx",
+    "htmx_path",
+    default="node_modules/htmx.org/dist/htmx.min.js",
+    show_default=True,
+    help="Minified htmx.",
+)
+def build_assets_command(css_path, htmx_path):
+    """
+    Fingerprint the built CSS and htmx into app/static/dist.
+
+    Run `npm install && npm run build:css` first; the Tailwind output and
+    css/styles.css are combined into one app.css. Pages link the hashed
+    files (served with immutable caching) instead of the CDN scripts.
+    """
+    sources = {}
+    try:
+        with open(css_path, "rb") as f:
+            css = f.read()
+        with open(os.path.join(current_app.static_folder, "css", "styles.css"), "rb") as f:
+            sources["app.css"] = css + b"\n" + f.read()
+        with open(htmx_path, "rb") as f:
+            sources["htmx.js"] = f.read()
+    except OSError as e:
+        raise click.ClickException(f"{e}; run `npm install && npm run build:css` first")
+
+    manifest = build_assets(current_app.static_folder, sources)
+    for logical, path in sorted(manifest.items()):
+        click.echo(f"{logical} -> static/{path} ({len(sources[logical]) / 1024:.1f} KiB)")
+
+
+@pokedex_cli.command("profile-summary")
+@click.option("--top", default=20, show_default=True, help="Number of functions to list.")
+@click.option(
+    "--sort",
+    type=click.Choice(["cumulative", "own"]),
+    default="cumulative",
+    show_default=True,
+    help="Rank by time including callees, or spent in the function itself.",
+)
+@click.option("--dir", "directory", default=None, help="Profile directory (defaults to PROFILE_DIR).")
+@click.option("--last", default=None, type=int, help="Only read the most recent N profiles.")
+def profile_summary_command(top, sort, directory, last):
+    """
+    List the hottest functions across captured request profiles.
+
+    .pstats files (PROFILE_MODE=cprofile) are ranked by seconds and
+    .collapsed files (PROFILE_MODE=sample) by stack samples.
+    """
+    files = profile_files(directory or profile_dir(current_app))
+    if last:
+        files = files[-last:]
+    collapsed = [path for path in files if path.endswith(COLLAPSED_SUFFIX)]
+    pstats_files = [path for path in files if path not in collapsed]
+    if not files:
+        raise click.ClickException("No profiles captured yet; set PROFILE_ENABLED=1 and send the profile header")
+
+    if pstats_files:
+        click.echo(f"{len(pstats_files)} cProfile profiles, by {sort} time")
+        click.echo(f"{'calls':>9} {'own s':>9} {'cum s':>9}  function")
+        for function, calls, own, cumulative in summarize_pstats(pstats_files, top, sort):
+            click.echo(f"{calls:>9} {own:>9.4f} {cumulative:>9.4f}  {function}")
+    if collapsed:
+        click.echo(f"{len(collapsed)} sampled profiles, by {sort} samples")
+        click.echo(f"{'own':>9} {'total':>9}  frame")
+        for frame, own, total in summarize_collapsed(collapsed, top, sort):
+            click.echo(f"{own:>9} {total:>9}  {frame}")
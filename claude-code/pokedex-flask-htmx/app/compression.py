@@ -0,0 +1,127 @@
+"""
+Response compression: brotli when the brotli package is installed, else gzip.
+
+init_compression() registers compress_response() as an app-wide
+after_request hook covering HTML pages, HTMX fragments, the JSON API and
+text static files. Buffered bodies are compressed in one go; responses
+carrying an ETag (cached pages, API documents) keep their compressed body
+in a small per-worker cache, so a page cache hit does not pay for
+compression again. A compressed body gets its own ETag (the identity one
+plus an encoding suffix), as the bytes differ from the identity body's.
+Streamed bodies (NDJSON) are compressed chunk by chunk
+with a flush after each, so consumers can decode lines as they arrive.
+"""
+import gzip
+import zlib
+from typing import Iterable, Iterator, Optional
+
+from flask import current_app, request
+
+from app.http_cache import encoded_etag
+from app.services.cache import MemoryCache
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = frozenset(
+    {
+        "text/html",
+        "text/css",
+        "text/plain",
+        "text/javascript",
+        "application/javascript",
+        "application/json",
+        "application/x-ndjson",
+        "image/svg+xml",
+    }
+)
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+# Compressed bodies kept per worker, keyed by (ETag, encoding)
+COMPRESSED_CACHE_SIZE = 256
+
+
+def choose_encoding() -> Optional[str]:
+    """Pick the best supported Content-Encoding the client accepts, if any."""
+    offers = ["br", "gzip"] if brotli is not None else ["gzip"]
+    return request.accept_encodings.best_match(offers)
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """Compress a whole body."""
+    if encoding == "br":
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def compress_stream(chunks: Iterable[bytes], encoding: str) -> Iterator[bytes]:
+    """Compress a streamed body, flushing after every chunk."""
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        for chunk in chunks:
+            data = compressor.process(chunk) + compressor.flush()
+            if data:
+                yield data
+        yield compressor.finish()
+    else:
+        compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)  # 31: gzip container
+        for chunk in chunks:
+            data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            if data:
+                yield data
+        yield compressor.flush()
+
+
+def compress_response(response):
+    """after_request hook compressing text responses the client accepts compressed."""
+    if (
+        response.status_code != 200
+        or "Content-Encoding" in response.headers
+        or response.mimetype not in COMPRESSIBLE_MIMETYPES
+        or not current_app.config["COMPRESS_ENABLED"]
+    ):
+        return response
+
+    response.vary.add("Accept-Encoding")
+    encoding = choose_encoding()
+    if encoding is None:
+        return response
+
+    if response.direct_passthrough:
+        # send_file() bodies (static CSS/JS): small, so buffer and compress them whole
+        response.direct_passthrough = False
+        response.get_data()
+
+    if response.is_streamed:
+        response.response = compress_stream(response.iter_encoded(), encoding)
+        response.headers.pop("Content-Length", None)
+    else:
+        data = response.get_data()
+        if len(data) < current_app.config["COMPRESS_MIN_SIZE"]:
+            return response
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            tagged = encoded_etag(etag, encoding)
+            response.set_etag(tagged)
+            if tagged in request.if_none_match:  # e.g. send_file, which only knows the identity ETag
+                response.status_code = 304
+                response.set_data(b"")
+                response.headers.pop("Content-Length", None)
+                return response
+        cache = current_app.extensions["compressed_bodies"]
+        body = cache.get((etag, encoding)) if etag else None
+        if body is None:
+            body = compress(data, encoding)
+            if etag:
+                cache.set((etag, encoding), body)
+        response.set_data(body)
+    response.headers["Content-Encoding"] = encoding
+    return response
+
+
+def init_compression(app) -> None:
+    """Compress every eligible response of the app."""
+    app.extensions["compressed_bodies"] = MemoryCache(maxsize=COMPRESSED_CACHE_SIZE, ttl=3600)
+    app.after_request(compress_response)
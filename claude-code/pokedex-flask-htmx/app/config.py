@@ -9,8 +9,100 @@ class Config:
     """Base configuration."""
 
     SECRET_KEY = os.environ.get("SECRET_KEY") or "dev-secret-key-change-in-production"
-    POKEAPI_BASE_URL = "https://pokeapi.co/api/v2"
+    POKEAPI_BASE_URL = os.environ.get("POKEAPI_BASE_URL", "https://pokeapi.co/api/v2")
     CACHE_TIMEOUT = 3600  # 1 hour in seconds
+    CACHE_MAXSIZE = 1024  # cached upstream responses per worker
+    # Expired entries younger than this are served while being refreshed in
+    # the background, and keep being served if PokeAPI is down
+    CACHE_MAX_STALE = int(os.environ.get("CACHE_MAX_STALE", 86400))
+
+    # Response cache backend: "memory" (per worker), "disk" (SQLite shared by
+    # the workers on one host), "redis" (shared across hosts) or "none"
+    CACHE_BACKEND = os.environ.get("CACHE_BACKEND", "memory")
+    CACHE_PATH = os.environ.get("CACHE_PATH", str(BASE_DIR / "instance" / "cache.sqlite3"))
+    CACHE_REDIS_URL = os.environ.get("CACHE_REDIS_URL", "redis://localhost:6379/0")
+
+    # Fetch the list and every detail into the cache when the dev server (run.py) starts;
+    # gunicorn always warms in the master before forking, and create_app (so the flask CLI)
+    # never does. Serving processes re-warm every CACHE_WARM_INTERVAL seconds (0 disables;
+    # keep it below CACHE_TIMEOUT so entries are refreshed before they expire)
+    CACHE_WARM_ON_START = os.environ.get("CACHE_WARM_ON_START", "0") == "1"
+    CACHE_WARM_INTERVAL = int(os.environ.get("CACHE_WARM_INTERVAL", 0))
+    CACHE_WARM_CONCURRENCY = int(os.environ.get("CACHE_WARM_CONCURRENCY", 10))
+
+    # Number of pokemon served (151 = Gen 1, 1025 = national dex) and how
+    # many cards each page of the list renders
+    POKEDEX_SIZE = int(os.environ.get("POKEDEX_SIZE", 151))
+    POKEDEX_PAGE_SIZE = int(os.environ.get("POKEDEX_PAGE_SIZE", 48))
+
+    # Show types and base stat totals on the list page (fetched once per
+    # pokemon per cache lifetime through the batched detail pipeline)
+    POKEDEX_ENRICHED_LIST = os.environ.get("POKEDEX_ENRICHED_LIST", "0") == "1"
+
+    # Data source: "remote" (PokeAPI at request time) or "local" (answer only
+    # from the snapshot written by `flask pokedex snapshot`, no network calls)
+    POKEDEX_DATA_MODE = os.environ.get("POKEDEX_DATA_MODE", "remote")
+    POKEDEX_SNAPSHOT_PATH = os.environ.get(
+        "POKEDEX_SNAPSHOT_PATH", str(BASE_DIR / "instance" / "pokedex-snapshot.json")
+    )
+
+    # Full rendered pages (per-route TTLs are set on the views); shares
+    # CACHE_BACKEND so disk/redis backends share pages between workers
+    PAGE_CACHE_ENABLED = os.environ.get("PAGE_CACHE_ENABLED", "1") == "1"
+
+    # gzip/brotli compression of HTML, JSON and text static files; bodies
+    # below COMPRESS_MIN_SIZE bytes are sent as is
+    COMPRESS_ENABLED = os.environ.get("COMPRESS_ENABLED", "1") == "1"
+    COMPRESS_MIN_SIZE = int(os.environ.get("COMPRESS_MIN_SIZE", 512))
+
+    # Prometheus text-format metrics (request/upstream/render latency, cache
+    # hit ratios) at METRICS_PATH. Off by default: the endpoint has no
+    # authentication, so only turn it on where the internet cannot reach it
+    METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "0") == "1"
+    METRICS_PATH = os.environ.get("METRICS_PATH", "/metrics")
+
+    # Navbar search: wait SEARCH_DEBOUNCE_MS after the last keystroke before
+    # requesting (hx-trigger delay), and skip names shorter than SEARCH_MIN_LENGTH
+    SEARCH_DEBOUNCE_MS = int(os.environ.get("SEARCH_DEBOUNCE_MS", 250))
+    SEARCH_MIN_LENGTH = int(os.environ.get("SEARCH_MIN_LENGTH", 2))
+
+    # Bearer token for /admin endpoints; they return 404 while unset
+    ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN")
+
+    # Per-request profiling: requests sending PROFILE_HEADER with the admin
+    # token, plus a PROFILE_SAMPLE_RATE fraction of all requests, write a
+    # cProfile .pstats ("cprofile") or collapsed-stack ("sample") file to
+    # PROFILE_DIR (instance/profiles by default), keeping the last PROFILE_KEEP
+    PROFILE_ENABLED = os.environ.get("PROFILE_ENABLED", "0") == "1"
+    PROFILE_MODE = os.environ.get("PROFILE_MODE", "cprofile")
+    PROFILE_SAMPLE_RATE = float(os.environ.get("PROFILE_SAMPLE_RATE", 0))
+    PROFILE_HEADER = os.environ.get("PROFILE_HEADER", "X-Profile")
+    PROFILE_INTERVAL = float(os.environ.get("PROFILE_INTERVAL", 0.005))  # seconds between stack samples
+    PROFILE_KEEP = int(os.environ.get("PROFILE_KEEP", 200))
+    PROFILE_DIR = os.environ.get("PROFILE_DIR")
+
+    # Rendered template fragments (cards, stat bars) kept per worker; 0 disables
+    FRAGMENT_CACHE_MAXSIZE = int(os.environ.get("FRAGMENT_CACHE_MAXSIZE", 4096))
+
+    # Upstream HTTP connection pool (one PokeAPIService per worker process)
+    POKEAPI_POOL_CONNECTIONS = int(os.environ.get("POKEAPI_POOL_CONNECTIONS", 10))
+    POKEAPI_POOL_MAXSIZE = int(os.environ.get("POKEAPI_POOL_MAXSIZE", 10))
+    POKEAPI_TIMEOUT = 10  # seconds; upper bound for the adaptive connect/read timeouts
+
+    # Upstream resilience: failed requests (errors, timeouts, 429/5xx) are
+    # retried with jittered backoff, retries are capped at a fraction of
+    # requests, and after POKEAPI_BREAKER_FAILURES failures (or calls slower
+    # than POKEAPI_SLOW_CALL seconds) within POKEAPI_BREAKER_WINDOW seconds
+    # the upstream is not called for POKEAPI_BREAKER_RESET seconds
+    POKEAPI_MAX_RETRIES = int(os.environ.get("POKEAPI_MAX_RETRIES", 2))
+    POKEAPI_RETRY_BUDGET = float(os.environ.get("POKEAPI_RETRY_BUDGET", 0.2))
+    POKEAPI_BREAKER_FAILURES = int(os.environ.get("POKEAPI_BREAKER_FAILURES", 5))
+    POKEAPI_BREAKER_WINDOW = float(os.environ.get("POKEAPI_BREAKER_WINDOW", 30))
+    POKEAPI_BREAKER_RESET = float(os.environ.get("POKEAPI_BREAKER_RESET", 15))
+    POKEAPI_SLOW_CALL = float(os.environ.get("POKEAPI_SLOW_CALL", 5))
+    # In remote mode, answer from the snapshot at POKEDEX_SNAPSHOT_PATH (if
+    # present) whenever PokeAPI fails and nothing is cached
+    POKEDEX_SNAPSHOT_FALLBACK = os.environ.get("POKEDEX_SNAPSHOT_FALLBACK", "0") == "1"
 
 
 class DevelopmentConfig(Config):
@@ -0,0 +1,53 @@
+from jinja2 import nodes
+from jinja2.ext import Extension
+
+from app.services.cache import MemoryCache
+
+
+class FragmentCacheExtension(Extension):
+    """
+    Jinja tag that caches rendered markup by key.
+
+    Usage::
+
+        {% cache "pokemon_card", pokemon.id, pokemon.name %}
+            ...markup that depends only on the key...
+        {% endcache %}
+
+    The key is the template name, the listed values and the app's template
+    version, so a template change never serves old markup. Fragments live
+    in a bounded LRU store on the Jinja environment (environment.fragment_cache);
+    without one the block is simply rendered.
+    """
+
+    tags = {"cache"}
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        parts = [parser.parse_expression()]
+        while parser.stream.skip_if("comma"):
+            parts.append(parser.parse_expression())
+        body = parser.parse_statements(("name:endcache",), drop_needle=True)
+
+        args = [nodes.Const(parser.name), nodes.List(parts)]
+        return nodes.CallBlock(self.call_method("_render", args), [], [], body).set_lineno(lineno)
+
+    def _render(self, template_name, parts, caller):
+        store = getattr(self.environment, "fragment_cache", None)
+        if store is None:
+            return caller()
+
+        key = repr((self.environment.fragment_cache_version, template_name, parts))
+        markup = store.get(key)
+        if markup is None:
+            markup = caller()
+            store.set(key, markup)
+        return markup
+
+
+def init_fragment_cache(app) -> None:
+    """Register the {% cache %} tag and give it a bounded store."""
+    app.jinja_env.add_extension(FragmentCacheExtension)
+    maxsize = app.config["FRAGMENT_CACHE_MAXSIZE"]
+    app.jinja_env.fragment_cache = MemoryCache(maxsize=maxsize, ttl=app.config["CACHE_TIMEOUT"]) if maxsize else None
+    app.jinja_env.fragment_cache_version = app.config["TEMPLATE_VERSION"]
@@ -0,0 +1,314 @@
+import hashlib
+import os
+import time
+from functools import wraps
+from typing import Callable, Iterable, Optional
+from urllib.parse import urlencode
+
+from flask import current_app, g, make_response, request
+
+from app.sequencing import SEQUENCE_TOKEN_HEADER
+from app.services.cache import CacheBackend, MemoryCache, create_cache
+
+# Headers that select a different representation of the same URL
+PAGE_VARY = ("HX-Request",)
+# Appended to the ETag of a compressed body: each encoding is its own representation
+ETAG_ENCODING_SUFFIXES = {"gzip": "-gz", "br": "-br"}
+# Finished page responses PageCacheMiddleware keeps per worker
+RESPONSE_CACHE_SIZE = 256
+# Where a purge of a shared (disk/redis) page cache is recorded, so every worker
+# stops replaying the pages it held (see record_page_purge)
+PURGE_NAMESPACE = "page_purge"
+PURGED_AT_KEY = "purged_at"
+# Environ keys: set by cached_page on a response the page cache holds, and by
+# PageCacheMiddleware on a replayed one (the view's endpoint, for metrics)
+PAGE_ENVIRON_KEY = "pokedex.page"
+CACHED_ENDPOINT_ENVIRON_KEY = "pokedex.cached_endpoint"
+# Requests the middleware leaves to Flask: revalidations, and numbered searches drop_superseded must see
+PASS_THROUGH_ENVIRON_KEYS = ("HTTP_IF_NONE_MATCH", "HTTP_" + SEQUENCE_TOKEN_HEADER.upper().replace("-", "_"))
+
+
+def compute_template_version(app) -> str:
+    """
+    Hash every template file so ETags change whenever the markup does.
+
+    Computed once at startup; a deploy that touches a template therefore
+    invalidates every ETag the previous release handed out. The asset
+    manifest is included too, since pages link the fingerprinted files.
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    template_root = os.path.join(app.root_path, app.template_folder)
+    for directory, _, files in sorted(os.walk(template_root)):
+        for filename in sorted(files):
+            path = os.path.join(directory, filename)
+            digest.update(os.path.relpath(path, template_root).encode())
+            with open(path, "rb") as f:
+                digest.update(f.read())
+    digest.update(repr(sorted(app.extensions.get("assets", {}).items())).encode())
+    return digest.hexdigest()
+
+
+def make_etag(*parts) -> str:
+    """
+    Build a strong ETag from the data a response is rendered from.
+
+    Parts should be small model objects (their repr is hashed), not raw
+    upstream payloads.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(current_app.config["TEMPLATE_VERSION"].encode())
+    for part in parts:
+        digest.update(b"\0")
+        digest.update(repr(part).encode())
+    return digest.hexdigest()
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """ETag of the body compressed with encoding (see compress_response)."""
+    return etag + ETAG_ENCODING_SUFFIXES[encoding]
+
+
+def matching_etag(etag: str) -> Optional[str]:
+    """
+    The tag in If-None-Match naming this response in any encoding, or None.
+
+    Clients send back the ETag they were given, which carries the suffix
+    of the encoding they received it in.
+    """
+    for candidate in (etag, *(etag + suffix for suffix in ETAG_ENCODING_SUFFIXES.values())):
+        if candidate in request.if_none_match:
+            return candidate
+    return None
+
+
+def conditional_response(etag: str, render: Callable[[], str]):
+    """
+    Answer If-None-Match with 304 without rendering, otherwise render and tag.
+
+    Args:
+        etag: ETag for the response, from make_etag
+        render: Called to produce the body only when the client's copy is stale
+    """
+    matched = matching_etag(etag)
+    if matched:
+        response = current_app.response_class(status=304)
+        response.set_etag(matched)
+    else:
+        response = make_response(render())
+        response.set_etag(etag)
+    return response
+
+
+def mark_degraded() -> None:
+    """
+    Flag the current response as built from incomplete data.
+
+    Views call it when the upstream failed and they render a page without
+    the data (an empty list, no search results). cached_page then neither
+    stores the response nor lets browsers or proxies cache it.
+    """
+    g.page_degraded = True
+
+
+def page_cache_key(vary: Iterable[str] = PAGE_VARY) -> str:
+    """
+    Cache key for the current request: path, sorted query args and Vary headers.
+
+    Prefixed with the template version so a shared (disk/redis) page cache
+    never serves a previous release's markup or asset URLs.
+    """
+    query = urlencode(sorted(request.args.items(multi=True)))
+    varies = "|".join(request.headers.get(name, "") for name in vary)
+    return f"{current_app.config['TEMPLATE_VERSION']}:{request.path}?{query}|{varies}"
+
+
+def _apply_cache_headers(response, cache_control: str, vary: Iterable[str]) -> None:
+    # Plain header strings: the cache_control/vary accessors cost more than the cache hit.
+    response.headers["Cache-Control"] = cache_control
+    for header in vary:
+        response.vary.add(header)
+
+
+def cached_page(ttl: int, vary: Iterable[str] = PAGE_VARY):
+    """
+    Cache a view's full 200 response for ttl seconds.
+
+    Entries live in app.extensions["page_cache"] (any cache backend, so a
+    disk or Redis backend shares pages between workers) under a key built
+    from the path, query args and Vary headers. Responses also get
+    Cache-Control/Vary headers so browsers and front proxies can cache them
+    for the same time, and a hit still honours If-None-Match. Responses a
+    view marked degraded (see mark_degraded) are sent with no-store instead.
+
+    Args:
+        ttl: Seconds the page may be served from cache
+        vary: Request headers that change the response
+    """
+
+    cache_control = f"public, max-age={ttl}"
+    vary = tuple(vary)
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            cache = current_app.extensions.get("page_cache")
+            key = page_cache_key(vary) if cache is not None else None
+            entry = cache.get(key) if cache is not None else None
+
+            if entry is not None and time.time() - entry["cached_at"] < ttl:
+                etag = entry["etag"]
+                matched = matching_etag(etag) if etag else None
+                if matched:
+                    response = current_app.response_class(status=304)
+                    response.set_etag(matched)
+                else:
+                    response = current_app.response_class(entry["body"], mimetype=entry["mimetype"])
+                    if etag:
+                        response.set_etag(etag)
+                response.headers["X-Cache"] = "HIT"
+                cached_at = entry["cached_at"]
+            else:
+                response = make_response(view(*args, **kwargs))
+                if g.get("page_degraded"):
+                    response.headers["Cache-Control"] = "no-store"
+                    response.headers["X-Cache"] = "MISS"
+                    return response
+                cached_at = None
+                if cache is not None and response.status_code == 200 and not response.is_streamed:
+                    cached_at = time.time()
+                    cache.set(
+                        key,
+                        {
+                            "cached_at": cached_at,
+                            "body": response.get_data(as_text=True),
+                            "mimetype": response.mimetype,
+                            "etag": response.get_etag()[0],
+                        },
+                    )
+                response.headers["X-Cache"] = "MISS"
+
+            if response.status_code in (200, 304):
+                _apply_cache_headers(response, cache_control, vary)
+            if cached_at is not None and response.status_code == 200:
+                expires_at = cached_at + min(ttl, cache.ttl)
+                request.environ[PAGE_ENVIRON_KEY] = (cached_at, expires_at, request.endpoint)
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+class PageCacheMiddleware:
+    """
+    WSGI middleware answering page cache hits before Flask sees the request.
+
+    A cached_page hit still pays for the request context, URL matching and
+    the after_request hooks, compression included. This middleware keeps
+    the finished response (status, headers and encoded body) of every page
+    cached_page answered with 200 and replays it byte for byte. Entries are
+    keyed on the raw path, query string, HX-Request and Accept-Encoding
+    headers, so a request spelled differently (reordered query args, another
+    Accept-Encoding) goes through Flask rather than getting the wrong bytes.
+
+    A copy expires with the page cache entry it came from. The admin purge
+    endpoint clears this worker's copies; with a shared backend, every hit
+    also reads when the page cache was last purged (one small lookup, where
+    a hit through Flask reads the whole page) and ignores older copies.
+    """
+
+    def __init__(self, wsgi_app, responses: MemoryCache, purges: Optional[CacheBackend] = None):
+        """
+        Args:
+            wsgi_app: The Flask WSGI app
+            responses: Where finished responses are kept
+            purges: Where purges of a shared page cache are recorded, None
+                for the memory backend (only this process can purge it)
+        """
+        self.wsgi_app = wsgi_app
+        self.responses = responses
+        self.purges = purges
+
+    def __call__(self, environ, start_response):
+        if environ["REQUEST_METHOD"] != "GET" or any(key in environ for key in PASS_THROUGH_ENVIRON_KEYS):
+            return self.wsgi_app(environ, start_response)
+
+        key = (
+            environ.get("PATH_INFO", ""),
+            environ.get("QUERY_STRING", ""),
+            environ.get("HTTP_HX_REQUEST", ""),
+            environ.get("HTTP_ACCEPT_ENCODING", ""),
+        )
+        entry = self.responses.get(key)
+        if entry is not None:
+            cached_at, expires_at, status, headers, body, endpoint = entry
+            if expires_at > time.time() and (self.purges is None or cached_at > (self.purges.get(PURGED_AT_KEY) or 0)):
+                environ[CACHED_ENDPOINT_ENVIRON_KEY] = endpoint
+                start_response(status, list(headers))
+                return [body]
+
+        started = []
+
+        def capture(status, headers, *exc_info):
+            started[:] = [status, headers]
+            return start_response(status, headers, *exc_info)
+
+        app_iter = self.wsgi_app(environ, capture)
+        page = environ.get(PAGE_ENVIRON_KEY)
+        if page is None or not started or not started[0].startswith("200"):
+            return app_iter
+        status, headers = started
+        if any(name.lower() == "set-cookie" for name, _ in headers):
+            return app_iter
+
+        # cached_page only marks buffered responses, so this joins a list of bytes
+        try:
+            body = b"".join(app_iter)
+        finally:
+            if hasattr(app_iter, "close"):
+                app_iter.close()
+        cached_at, expires_at, endpoint = page
+        replayed = tuple((name, "HIT" if name == "X-Cache" else value) for name, value in headers)
+        self.responses.set(key, (cached_at, expires_at, status, replayed, body, endpoint))
+        return [body]
+
+
+def init_page_cache(app) -> None:
+    """
+    Create the page cache cached_page uses, and serve its hits at the WSGI level.
+
+    Call before middleware that should see replayed responses too
+    (metrics, profiling) wraps app.wsgi_app.
+    """
+    if not app.config["PAGE_CACHE_ENABLED"]:
+        app.extensions["page_cache"] = None
+        return
+    # Full rendered pages, on the same kind of backend as upstream responses
+    page_cache = create_cache(app.config, namespace="page")
+    app.extensions["page_cache"] = page_cache
+    if page_cache is None:
+        return
+    # Entries carry their page's expiry; the cache TTL only has to outlast it
+    responses = MemoryCache(maxsize=RESPONSE_CACHE_SIZE, ttl=page_cache.ttl)
+    purges = None
+    if not isinstance(page_cache, MemoryCache):
+        purges = create_cache(app.config, namespace=PURGE_NAMESPACE)
+    app.extensions["page_responses"] = responses
+    app.extensions["page_purges"] = purges
+    app.wsgi_app = PageCacheMiddleware(app.wsgi_app, responses, purges)
+
+
+def record_page_purge(config) -> None:
+    """
+    Record that the shared page cache was just purged.
+
+    Workers then stop replaying the responses they kept from before (see
+    PageCacheMiddleware). The memory backend needs no record: only the
+    process holding it can purge it.
+    """
+    if config["CACHE_BACKEND"] == "memory":
+        return
+    purges = create_cache(config, namespace=PURGE_NAMESPACE)
+    if purges is not None:
+        purges.set(PURGED_AT_KEY, time.time())
+        purges.close()
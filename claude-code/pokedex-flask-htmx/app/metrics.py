@@ -0,0 +1,443 @@
+"""
+In-process metrics in the Prometheus text format, served at /metrics.
+
+Metric objects are module-level so services can record into them without
+a Flask app. Until init_metrics() runs (METRICS_ENABLED is off by
+default), timed() and record_upstream() record nothing, so views and the
+PokeAPI client pay nothing for metrics nobody can scrape.
+
+On the request path, observations are not aggregated where they happen:
+they are appended to a queue on the metric (a deque append is atomic, so
+no lock is taken) and folded in, a batch at a time, at scrape time or
+once a request queue grows past PENDING_MAX. All the instrumentation a
+request pays for stays under 5 µs (see benchmarks/bench_metrics.py).
+Cache hit ratios and circuit breaker state are read from the existing
+stats() methods at scrape time instead.
+
+Every gunicorn worker keeps its own numbers and a scrape reaches one of
+them, so each sample carries a `pid` label; sum over it in queries.
+"""
+import os
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import deque
+from itertools import repeat, starmap
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from flask import Response, current_app
+from jinja2 import Template
+
+from app.http_cache import CACHED_ENDPOINT_ENVIRON_KEY
+
+# Seconds; covers cached pages (sub-millisecond) up to upstream timeouts
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+# Requests queued on one series that trigger folding outside a scrape
+PENDING_MAX = 4096
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], base: Tuple[str, ...] = ()) -> str:
+    """{pid="1",name="value",...}; base holds preformatted pairs."""
+    pairs = list(base) + [f'{name}="{value}"' for name, value in zip(names, values)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _take(queue: deque) -> list:
+    """Pop what is in queue now; appends racing with this are left for next time."""
+    return list(starmap(queue.popleft, repeat((), len(queue))))
+
+
+class _Value:
+    __slots__ = ("value", "lock", "pending")
+
+    def __init__(self):
+        self.value = 0
+        self.lock = threading.Lock()
+        # Amounts added without the lock, see fold()
+        self.pending = deque()
+
+    def inc(self, amount: float = 1) -> None:
+        with self.lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        with self.lock:
+            self.value -= amount
+
+    def fold(self) -> None:
+        amounts = _take(self.pending)
+        if amounts:
+            self.inc(sum(amounts))
+
+
+class _HistogramValue:
+    __slots__ = ("upper_bounds", "counts", "sum", "lock", "pending")
+
+    def __init__(self, upper_bounds: Tuple[float, ...]):
+        self.upper_bounds = upper_bounds
+        self.counts = [0] * (len(upper_bounds) + 1)
+        self.sum = 0.0
+        self.lock = threading.Lock()
+        # Values observed without the lock, see fold()
+        self.pending = deque()
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.upper_bounds, value)
+        with self.lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    def observe_many(self, values: List[float]) -> None:
+        """Observe a batch: sort it once, then find each bucket boundary in it."""
+        values.sort()
+        at_most = [bisect_right(values, bound) for bound in self.upper_bounds] + [len(values)]
+        total = sum(values)
+        with self.lock:
+            previous = 0
+            for index, count in enumerate(at_most):
+                self.counts[index] += count - previous
+                previous = count
+            self.sum += total
+
+    def fold(self) -> None:
+        values = _take(self.pending)
+        if values:
+            self.observe_many(values)
+
+
+class _RequestSeries:
+    """What a finished request records: latency, status count and in-flight gauge, in one append."""
+
+    __slots__ = ("latency", "responses", "in_flight", "pending")
+
+    def __init__(self, latency: _HistogramValue, responses: _Value, in_flight: _Value):
+        self.latency = latency
+        self.responses = responses
+        self.in_flight = in_flight
+        self.pending = deque()
+
+    def fold(self) -> None:
+        elapsed = _take(self.pending)
+        if elapsed:
+            self.latency.observe_many(elapsed)
+            self.responses.inc(len(elapsed))
+            self.in_flight.dec(len(elapsed))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        """
+        Args:
+            name: Metric name
+            documentation: HELP text
+            labelnames: Label names, in the order labels() takes values
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str):
+        """Child metric for one combination of label values."""
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _new_child(self):
+        return _Value()
+
+    def reset_after_fork(self) -> None:
+        # A worker is a new process to Prometheus (new pid label): start from zero
+        self._lock = threading.Lock()
+        self._children = {}
+
+    def collect(self, base: Tuple[str, ...] = ()) -> List[str]:
+        """Exposition lines; base holds label pairs added to every sample."""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for values, child in sorted(self._children.copy().items()):
+            lines.extend(self._sample_lines(base, values, child))
+        return lines
+
+    def _sample_lines(self, base, values, child) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, values, base)} {_format_value(child.value)}"]
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+
+class Gauge(_Metric):
+    """Value that goes up and down."""
+
+    kind = "gauge"
+
+
+class Histogram(_Metric):
+    """Bucketed distribution of observed values (seconds, by default)."""
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def _sample_lines(self, base, values, child) -> List[str]:
+        with child.lock:
+            counts, total = list(child.counts), child.sum
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else repr(float(bound))
+            labels = _format_labels(self.labelnames + ("le",), values + (le,), base)
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.labelnames, values, base)
+        lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+REQUEST_LATENCY = Histogram(
+    "pokedex_http_request_duration_seconds", "Time to produce a response, by route.", ("endpoint", "method")
+)
+REQUESTS = Counter(
+    "pokedex_http_requests_total", "Responses sent, by route and status.", ("endpoint", "method", "status")
+)
+IN_FLIGHT = Gauge("pokedex_http_requests_in_flight", "Requests being handled by this worker.")
+UPSTREAM_LATENCY = Histogram(
+    "pokedex_upstream_request_duration_seconds", "Time of each PokeAPI request attempt.", ("endpoint",)
+)
+UPSTREAM_REQUESTS = Counter(
+    "pokedex_upstream_requests_total",
+    "PokeAPI request attempts by outcome (HTTP status, error, timeout or short_circuit).",
+    ("endpoint", "status"),
+)
+RENDER_LATENCY = Histogram("pokedex_template_render_seconds", "Jinja render time, by template.", ("template",))
+MODEL_BUILD_LATENCY = Histogram(
+    "pokedex_model_build_seconds", "Time to build models from upstream records, per response.", ("model",)
+)
+
+REGISTRY = (
+    REQUEST_LATENCY,
+    REQUESTS,
+    IN_FLIGHT,
+    UPSTREAM_LATENCY,
+    UPSTREAM_REQUESTS,
+    RENDER_LATENCY,
+    MODEL_BUILD_LATENCY,
+)
+
+
+# Set by init_metrics; until then the recording helpers below do nothing
+_enabled = False
+_fold_lock = threading.Lock()
+# IN_FLIGHT has no labels: the middleware keeps its one child at hand
+_in_flight = IN_FLIGHT.labels()
+# (endpoint, method, status) -> _RequestSeries, so a request finds its series with one lookup
+_request_series: Dict[Tuple[str, str, str], _RequestSeries] = {}
+
+
+def _fold_pending() -> None:
+    """Fold queued observations into the metrics; one thread at a time, others skip."""
+    if not _fold_lock.acquire(blocking=False):
+        return
+    try:
+        # Requests before the rest: a request queued on IN_FLIGHT after it was
+        # folded must not be counted as finished already
+        for series in list(_request_series.values()):
+            series.fold()
+        for metric in REGISTRY:
+            for child in list(metric._children.values()):
+                child.fold()
+    finally:
+        _fold_lock.release()
+
+
+def timed(histogram: Histogram, label: str, fn: Callable, *args):
+    """
+    Call fn(*args), observing how long it takes when metrics are enabled.
+
+    A plain call rather than a with-block: entering and leaving a
+    context manager object costs more than the rest of the timing.
+    """
+    if not _enabled:
+        return fn(*args)
+    started = time.perf_counter()
+    try:
+        return fn(*args)
+    finally:
+        histogram.labels(label).pending.append(time.perf_counter() - started)
+
+
+def record_upstream(endpoint: str, status: str, elapsed: Optional[float] = None) -> None:
+    """Count a PokeAPI request attempt by outcome, and time it when elapsed is given."""
+    if not _enabled:
+        return
+    if elapsed is not None:
+        UPSTREAM_LATENCY.labels(endpoint).pending.append(elapsed)
+    UPSTREAM_REQUESTS.labels(endpoint, status).pending.append(1)
+
+
+def render_metrics(collectors: Iterable[Callable[[str], List[str]]] = ()) -> str:
+    """
+    The registry, plus scrape-time collectors, in the text exposition format.
+
+    Collectors are called with the preformatted pid label pair.
+    """
+    _fold_pending()
+    pid = f'pid="{os.getpid()}"'
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.collect((pid,)))
+    for collect in collectors:
+        lines.extend(collect(pid))
+    return "\n".join(lines) + "\n"
+
+
+def reset_after_fork() -> None:
+    """Drop values and locks a forked worker inherited from the master."""
+    global _fold_lock, _request_series, _in_flight
+    _fold_lock = threading.Lock()
+    _request_series = {}
+    for metric in REGISTRY:
+        metric.reset_after_fork()
+    _in_flight = IN_FLIGHT.labels()
+
+
+def _cache_lines(caches: Dict[str, object], pid: str) -> List[str]:
+    """Hit/miss counters and hit ratio of every cache."""
+    hits = ["# HELP pokedex_cache_hits_total Cache lookups answered.", "# TYPE pokedex_cache_hits_total counter"]
+    misses = ["# HELP pokedex_cache_misses_total Cache lookups missed.", "# TYPE pokedex_cache_misses_total counter"]
+    ratio = ["# HELP pokedex_cache_hit_ratio Hits over lookups since start.", "# TYPE pokedex_cache_hit_ratio gauge"]
+    for name, cache in caches.items():
+        stats = cache.stats()
+        lookups = stats["hits"] + stats["misses"]
+        labels = f'{{{pid},cache="{name}"}}'
+        hits.append(f"pokedex_cache_hits_total{labels} {stats['hits']}")
+        misses.append(f"pokedex_cache_misses_total{labels} {stats['misses']}")
+        ratio.append(f"pokedex_cache_hit_ratio{labels} {stats['hits'] / lookups if lookups else 0.0!r}")
+    return hits + misses + ratio
+
+
+def _upstream_lines(service, pid: str) -> List[str]:
+    """Circuit breaker, retry and timeout state of the PokeAPI client."""
+    upstream = service.upstream_stats()
+    labels = f"{{{pid}}}"
+    return [
+        "# HELP pokedex_upstream_circuit_open Whether the PokeAPI circuit breaker is refusing calls.",
+        "# TYPE pokedex_upstream_circuit_open gauge",
+        f"pokedex_upstream_circuit_open{labels} {int(upstream['breaker']['state'] != 'closed')}",
+        "# HELP pokedex_upstream_retries_total Retried PokeAPI requests.",
+        "# TYPE pokedex_upstream_retries_total counter",
+        f"pokedex_upstream_retries_total{labels} {upstream['retry_budget']['retries']}",
+        "# HELP pokedex_upstream_read_timeout_seconds Current adaptive read timeout.",
+        "# TYPE pokedex_upstream_read_timeout_seconds gauge",
+        f"pokedex_upstream_read_timeout_seconds{labels} {upstream['timeouts']['read_timeout']!r}",
+    ]
+
+
+def _sequencer_lines(sequencer, pid: str) -> List[str]:
+    """Requests dropped because a newer one from the same client overtook them."""
+    return [
+        "# HELP pokedex_superseded_requests_total Requests answered 204 because a newer one replaced them.",
+        "# TYPE pokedex_superseded_requests_total counter",
+        f"pokedex_superseded_requests_total{{{pid}}} {sequencer.stats()['superseded']}",
+    ]
+
+
+class MetricsMiddleware:
+    """
+    WSGI middleware timing each request up to the start of its response.
+
+    Working at the WSGI level keeps Flask's context-local proxies (g,
+    request) off the hot path: the route name is read from the request
+    object Flask keeps in the environ while the response starts.
+    """
+
+    def __init__(self, wsgi_app):
+        self.wsgi_app = wsgi_app
+
+    def __call__(self, environ, start_response):
+        started = time.perf_counter()
+        status = "500"
+        endpoint = None
+        _in_flight.pending.append(1)
+
+        def record_status(status_line, headers, *exc_info):
+            nonlocal status, endpoint
+            status = status_line[:3]
+            # Flask clears environ["werkzeug.request"] once the request context is popped
+            # Set when PageCacheMiddleware replayed a page without Flask
+            endpoint = environ.get(CACHED_ENDPOINT_ENVIRON_KEY)
+            if endpoint is None:
+                flask_request = environ.get("werkzeug.request")
+                endpoint = flask_request.endpoint if flask_request is not None else None
+            return start_response(status_line, headers, *exc_info)
+
+        try:
+            return self.wsgi_app(environ, record_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            key = (endpoint or "unmatched", environ["REQUEST_METHOD"], status)
+            series = _request_series.get(key)
+            if series is None:
+                series = _request_series.setdefault(
+                    key, _RequestSeries(REQUEST_LATENCY.labels(*key[:2]), REQUESTS.labels(*key), _in_flight)
+                )
+            series.pending.append(elapsed)
+            if len(series.pending) > PENDING_MAX:
+                _fold_pending()
+
+
+class TimedTemplate(Template):
+    """Template class whose top-level renders are timed per template."""
+
+    def render(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return Template.render(self, *args, **kwargs)
+        finally:
+            RENDER_LATENCY.labels(self.name or "string").pending.append(time.perf_counter() - started)
+
+
+def metrics_view():
+    """Prometheus scrape endpoint."""
+    service = current_app.extensions["pokeapi"]
+    caches = {
+        "responses": service.cache,
+        "pages": current_app.extensions.get("page_cache"),
+        "page_responses": current_app.extensions.get("page_responses"),
+        "fragments": getattr(current_app.jinja_env, "fragment_cache", None),
+        "compressed": current_app.extensions.get("compressed_bodies"),
+    }
+    caches = {name: cache for name, cache in caches.items() if cache is not None}
+    collectors = [lambda pid: _cache_lines(caches, pid), lambda pid: _upstream_lines(service, pid)]
+    sequencer = current_app.extensions.get("request_sequencer")
+    if sequencer is not None:
+        collectors.append(lambda pid: _sequencer_lines(sequencer, pid))
+    body = render_metrics(collectors)
+    return Response(body, content_type=CONTENT_TYPE, headers={"Cache-Control": "no-store"})
+
+
+def init_metrics(app) -> None:
+    """Time every request and template render, and serve METRICS_PATH."""
+    global _enabled
+    _enabled = True
+    app.wsgi_app = MetricsMiddleware(app.wsgi_app)
+    app.jinja_env.template_class = TimedTemplate
+    app.add_url_rule(app.config["METRICS_PATH"], "metrics", metrics_view)
@@ -1,5 +1,6 @@
+import sys
 from dataclasses import dataclass
-from typing import List, Dict, Optional
+from typing import Dict, Iterable, Iterator, NamedTuple, Optional, Tuple
 
 
 # Tailwind color classes for pokemon types
@@ -25,13 +26,83 @@ TYPE_COLORS = {
 }
 
 
-@dataclass
+def type_color(type_name: str) -> str:
+    """Get Tailwind color class for a pokemon type."""
+    return TYPE_COLORS.get(type_name.lower(), "bg-gray-400")
+
+
+def intern_all(values: Iterable[str]) -> Tuple[str, ...]:
+    """Intern a handful of repeating strings (types, abilities) into a tuple."""
+    return tuple(sys.intern(value) for value in values)
+
+
+class Stats(NamedTuple):
+    """
+    Base stats in PokeAPI's fixed order, stored as a plain tuple.
+
+    Reads like the dict it replaces: stats.hp and stats["special-attack"]
+    both work, and "hp" in stats, keys(), values(), items() and get() use
+    PokeAPI stat names, so templates and callers are unchanged. Iterating
+    and len() still go over the values, as for any tuple.
+    """
+
+    hp: int = 0
+    attack: int = 0
+    defense: int = 0
+    special_attack: int = 0
+    special_defense: int = 0
+    speed: int = 0
+
+    @classmethod
+    def from_api(cls, stats: Iterable[Dict]) -> "Stats":
+        """Create from the "stats" array of a PokeAPI detail response, ignoring unknown stats."""
+        values = {stat["stat"]["name"].replace("-", "_"): stat["base_stat"] for stat in stats}
+        return cls(**{name: values[name] for name in cls._fields if name in values})
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            name = key.replace("-", "_")
+            if name not in self._fields:
+                raise KeyError(key)
+            return getattr(self, name)
+        return tuple.__getitem__(self, key)
+
+    def __contains__(self, key) -> bool:
+        """Whether key names a stat, like `in` on the dict."""
+        return isinstance(key, str) and key.replace("-", "_") in self._fields
+
+    @property
+    def total(self) -> int:
+        """Sum of all base stats."""
+        return sum(self)
+
+    def get(self, key: str, default: Optional[int] = None) -> Optional[int]:
+        """Value of a stat by PokeAPI name, or default for unknown stats."""
+        return self[key] if key in self else default
+
+    def keys(self) -> Iterator[str]:
+        """Yield PokeAPI stat names."""
+        return (name.replace("_", "-") for name in self._fields)
+
+    def values(self) -> Iterator[int]:
+        """Yield stat values in PokeAPI order."""
+        return iter(tuple(self))
+
+    def items(self) -> Iterator[Tuple[str, int]]:
+        """Yield (PokeAPI stat name, value) pairs."""
+        return zip(self.keys(), self)
+
+
+@dataclass(frozen=True, slots=True)
 class PokemonListItem:
     """Simplified Pokemon data for list view."""
 
     id: int
     name: str
     display_name: str
+    # Only filled in for the enriched list view
+    types: Tuple[str, ...] = ()
+    base_stat_total: Optional[int] = None
 
     @classmethod
     def from_api(cls, data: Dict) -> "PokemonListItem":
@@ -40,51 +111,83 @@ class PokemonListItem:
         url = data["url"]
         pokemon_id = int(url.rstrip("/").split("/")[-1])
 
-        return cls(id=pokemon_id, name=data["name"], display_name=data["name"].capitalize())
+        name = data["name"]
+        return cls(id=pokemon_id, name=sys.intern(name), display_name=sys.intern(name.capitalize()))
+
+    @classmethod
+    def from_detail(cls, data: Dict) -> "PokemonListItem":
+        """Create an enriched item (types, base stat total) from a detail response."""
+        return cls(
+            id=data["id"],
+            name=sys.intern(data["name"]),
+            display_name=sys.intern(data["name"].capitalize()),
+            types=intern_all(t["type"]["name"].capitalize() for t in data["types"]),
+            base_stat_total=sum(stat["base_stat"] for stat in data["stats"]),
+        )
 
+    def get_type_color(self, type_name: str) -> str:
+        """Get Tailwind color class for a pokemon type."""
+        return type_color(type_name)
+
+    def to_dict(self) -> Dict:
+        """JSON-ready representation for the API (enriched fields only when set)."""
+        data = {"id": self.id, "name": self.name, "display_name": self.display_name}
+        if self.types:
+            data["types"] = list(self.types)
+        if self.base_stat_total is not None:
+            data["base_stat_total"] = self.base_stat_total
+        return data
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class Pokemon:
-    """Complete Pokemon data for detail view."""
+    """
+    Complete Pokemon data for detail view.
+
+    Slotted and immutable, with interned strings and tuple-backed
+    collections, so many instances can be kept in memory cheaply.
+    """
 
     id: int
     name: str
     display_name: str
-    height_m: float
-    weight_kg: float
-    types: List[str]
-    stats: Dict[str, int]
-    abilities: List[str]
+    height_m: Optional[float]
+    weight_kg: Optional[float]
+    types: Tuple[str, ...]
+    stats: Stats
+    abilities: Tuple[str, ...]
     sprite_url: Optional[str]
     artwork_url: Optional[str]
 
     @classmethod
     def from_api(cls, data: Dict) -> "Pokemon":
         """Create from PokeAPI response."""
-        # Convert height from decimeters to meters
-        height_m = data["height"] / 10
+        # Convert height from decimeters to meters (None when unknown)
+        height_m = data["height"] / 10 if data.get("height") is not None else None
 
-        # Convert weight from hectograms to kilograms
-        weight_kg = data["weight"] / 10
+        # Convert weight from hectograms to kilograms (None when unknown)
+        weight_kg = data["weight"] / 10 if data.get("weight") is not None else None
 
         # Extract types and capitalize
-        types = [t["type"]["name"].capitalize() for t in data["types"]]
+        types = intern_all(t["type"]["name"].capitalize() for t in data["types"])
 
-        # Extract stats into a clean dict
-        stats = {stat["stat"]["name"]: stat["base_stat"] for stat in data["stats"]}
+        # Extract stats into a fixed-order tuple
+        stats = Stats.from_api(data["stats"])
 
         # Extract abilities and capitalize
-        abilities = [a["ability"]["name"].capitalize().replace("-", " ") for a in data["abilities"]]
+        abilities = intern_all(a["ability"]["name"].capitalize().replace("-", " ") for a in data["abilities"])
 
-        # Get sprite URLs
+        # Get sprite URLs (interned: a handful per pokemon, shared by every instance)
         sprites = data.get("sprites", {})
         sprite_url = sprites.get("front_default")
         artwork_url = sprites.get("other", {}).get("official-artwork", {}).get("front_default")
+        sprite_url = sys.intern(sprite_url) if sprite_url else sprite_url
+        artwork_url = sys.intern(artwork_url) if artwork_url else artwork_url
 
         return cls(
             id=data["id"],
-            name=data["name"],
-            display_name=data["name"].capitalize(),
+            name=sys.intern(data["name"]),
+            display_name=sys.intern(data["name"].capitalize()),
             height_m=height_m,
             weight_kg=weight_kg,
             types=types,
@@ -96,4 +199,19 @@ class Pokemon:
 
     def get_type_color(self, type_name: str) -> str:
         """Get Tailwind color class for a pokemon type."""
-        return TYPE_COLORS.get(type_name.lower(), "bg-gray-400")
+        return type_color(type_name)
+
+    def to_dict(self) -> Dict:
+        """JSON-ready representation for the API, with stats keyed by PokeAPI name."""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "display_name": self.display_name,
+            "height_m": self.height_m,
+            "weight_kg": self.weight_kg,
+            "types": list(self.types),
+            "stats": dict(self.stats.items()),
+            "abilities": list(self.abilities),
+            "sprite_url": self.sprite_url,
+            "artwork_url": self.artwork_url,
+        }
@@ -0,0 +1,255 @@
+"""
+Opt-in profiling of individual requests.
+
+ProfilerMiddleware profiles a request when it carries the profile header
+(with the admin token) or is picked by PROFILE_SAMPLE_RATE, and writes
+one file per request to PROFILE_DIR:
+
+- "cprofile" mode: a cProfile `.pstats` file (snakeviz, `python -m pstats`)
+- "sample" mode: a background thread samples the request thread's stack
+  every PROFILE_INTERVAL seconds into a `.collapsed` file, one
+  "frame;frame;frame count" line per stack, which flamegraph.pl and
+  speedscope turn into a flame graph
+
+Unsampled requests pay one header lookup (and one random() call when a
+sample rate is set). Only one request per process is profiled at a time.
+`flask pokedex profile-summary` lists the hottest functions across the
+captured files.
+"""
+import cProfile
+import hmac
+import os
+import pstats
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+PSTATS_SUFFIX = ".pstats"
+COLLAPSED_SUFFIX = ".collapsed"
+
+
+class StackSampler:
+    """Count the stacks of one thread, sampled from a background thread."""
+
+    def __init__(self, thread_id: int, interval: float = 0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="pokedex-stack-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[collapse(frame)] += 1
+
+    def dump(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+def frame_label(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def collapse(frame) -> str:
+    """Root-first, semicolon-separated stack of a frame, as flamegraph.pl reads it."""
+    labels = []
+    while frame is not None:
+        labels.append(frame_label(frame.f_code))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+def profile_filename(environ, elapsed: float, suffix: str) -> str:
+    """`<time>-<method>-<path>-<ms>ms-<pid><suffix>`, sortable by capture time."""
+    path = environ.get("PATH_INFO", "/").strip("/").replace("/", "_") or "root"
+    now = time.time()
+    stamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime(now))
+    return (
+        f"{stamp}.{int(now * 1000) % 1000:03d}-{environ.get('REQUEST_METHOD', 'GET')}"
+        f"-{path[:60]}-{elapsed * 1000:.0f}ms-{os.getpid()}{suffix}"
+    )
+
+
+class ProfilerMiddleware:
+    """
+    WSGI middleware profiling selected requests, body iteration included.
+
+    Profiled responses are read in full before they are returned, so a
+    streamed response (the NDJSON export) arrives in one piece when it is
+    profiled; other requests are passed through untouched.
+    """
+
+    def __init__(
+        self,
+        wsgi_app,
+        output_dir: str,
+        mode: str = "cprofile",
+        sample_rate: float = 0.0,
+        header: str = "X-Profile",
+        token: Optional[str] = None,
+        interval: float = 0.005,
+        keep: int = 200,
+    ):
+        """
+        Initialize the middleware.
+
+        Args:
+            wsgi_app: WSGI application to wrap
+            output_dir: Directory profiles are written to (created on first write)
+            mode: "cprofile" for .pstats files, "sample" for collapsed stacks
+            sample_rate: Fraction of requests profiled without the header (0 to 1)
+            header: Request header asking for a profile
+            token: Value the header must carry; the header is ignored while unset
+            interval: Seconds between stack samples in "sample" mode
+            keep: Most recent profiles kept in output_dir
+        """
+        if mode not in ("cprofile", "sample"):
+            raise ValueError(f"Unknown profiling mode: {mode!r}")
+        self.wsgi_app = wsgi_app
+        self.output_dir = output_dir
+        self.mode = mode
+        self.sample_rate = sample_rate
+        self.environ_key = "HTTP_" + header.upper().replace("-", "_")
+        self.token = token
+        self.interval = interval
+        self.keep = keep
+        # cProfile (sys.monitoring since 3.12) allows one active profiler per process
+        self._busy = threading.Lock()
+
+    def __call__(self, environ, start_response):
+        requested = environ.get(self.environ_key)
+        if requested is None and (not self.sample_rate or random.random() >= self.sample_rate):
+            return self.wsgi_app(environ, start_response)
+        if requested is not None and not (self.token and hmac.compare_digest(requested, self.token)):
+            return self.wsgi_app(environ, start_response)
+        if not self._busy.acquire(blocking=False):
+            return self.wsgi_app(environ, start_response)
+        try:
+            return self._profile(environ, start_response)
+        finally:
+            self._busy.release()
+
+    def _profile(self, environ, start_response) -> List[bytes]:
+        if self.mode == "cprofile":
+            profiler = cProfile.Profile()
+            profiler.enable()
+        else:
+            profiler = StackSampler(threading.get_ident(), self.interval)
+            profiler.start()
+        started = time.perf_counter()
+        try:
+            iterable = self.wsgi_app(environ, start_response)
+            try:
+                body = list(iterable)
+            finally:
+                if hasattr(iterable, "close"):
+                    iterable.close()
+        finally:
+            elapsed = time.perf_counter() - started
+            if self.mode == "cprofile":
+                profiler.disable()
+            else:
+                profiler.stop()
+        self._save(profiler, environ, elapsed)
+        return body
+
+    def _save(self, profiler, environ, elapsed: float) -> None:
+        suffix = PSTATS_SUFFIX if self.mode == "cprofile" else COLLAPSED_SUFFIX
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, profile_filename(environ, elapsed, suffix))
+        if self.mode == "cprofile":
+            profiler.dump_stats(path)
+        else:
+            profiler.dump(path)
+        files = profile_files(self.output_dir)
+        for old in files[: max(len(files) - self.keep, 0)]:
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+
+
+def profile_files(directory: str) -> List[str]:
+    """Captured profiles in a directory, oldest first."""
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return []
+    return [
+        os.path.join(directory, name)
+        for name in sorted(names)
+        if name.endswith(PSTATS_SUFFIX) or name.endswith(COLLAPSED_SUFFIX)
+    ]
+
+
+def summarize_pstats(paths: List[str], top: int, sort: str = "cumulative") -> List[Tuple[str, int, float, float]]:
+    """
+    Hottest functions across .pstats files.
+
+    Returns:
+        (function, calls, own seconds, cumulative seconds) rows, hottest first
+    """
+    stats = pstats.Stats(*paths)
+    key = 3 if sort == "cumulative" else 2
+    rows = [
+        (f"{func} ({os.path.basename(filename)}:{line})", calls, own, cumulative)
+        for (filename, line, func), (_, calls, own, cumulative, _) in stats.stats.items()
+    ]
+    rows.sort(key=lambda row: row[key], reverse=True)
+    return rows[:top]
+
+
+def summarize_collapsed(paths: List[str], top: int, sort: str = "cumulative") -> List[Tuple[str, int, int]]:
+    """
+    Hottest frames across .collapsed files.
+
+    Returns:
+        (frame, own samples, total samples) rows, hottest first
+    """
+    own: Dict[str, int] = Counter()
+    total: Dict[str, int] = Counter()
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                stack, _, count = line.rstrip("\n").rpartition(" ")
+                frames = stack.split(";")
+                own[frames[-1]] += int(count)
+                for frame in set(frames):
+                    total[frame] += int(count)
+    key = 2 if sort == "cumulative" else 1
+    rows = [(frame, own[frame], samples) for frame, samples in total.items()]
+    rows.sort(key=lambda row: row[key], reverse=True)
+    return rows[:top]
+
+
+def profile_dir(app) -> str:
+    return app.config["PROFILE_DIR"] or os.path.join(app.instance_path, "profiles")
+
+
+def init_profiling(app) -> None:
+    """Wrap the app in ProfilerMiddleware configured from PROFILE_* settings."""
+    config = app.config
+    app.wsgi_app = ProfilerMiddleware(
+        app.wsgi_app,
+        output_dir=profile_dir(app),
+        mode=config["PROFILE_MODE"],
+        sample_rate=config["PROFILE_SAMPLE_RATE"],
+        header=config["PROFILE_HEADER"],
+        token=config["ADMIN_TOKEN"],
+        interval=config["PROFILE_INTERVAL"],
+        keep=config["PROFILE_KEEP"],
+    )
@@ -0,0 +1,43 @@
+import hmac
+
+from flask import Blueprint, abort, current_app, jsonify, request
+
+from app.http_cache import record_page_purge
+
+bp = Blueprint("admin", __name__, url_prefix="/admin")
+
+
+@bp.before_request
+def require_token():
+    """Hide the admin endpoints unless a matching ADMIN_TOKEN bearer token is sent."""
+    token = current_app.config.get("ADMIN_TOKEN")
+    supplied = request.headers.get("Authorization", "").removeprefix("Bearer ")
+    if not token or not hmac.compare_digest(supplied, token):
+        abort(404)
+
+
+@bp.route("/cache/purge", methods=["POST"])
+def purge_cache():
+    """Drop cached pages (and upstream responses with ?responses=1) in this worker."""
+    purged = []
+
+    page_cache = current_app.extensions.get("page_cache")
+    if page_cache is not None:
+        page_cache.clear()
+        current_app.extensions["page_responses"].clear()
+        record_page_purge(current_app.config)
+        purged.append("pages")
+
+    if request.args.get("responses") == "1":
+        service = current_app.extensions["pokeapi"]
+        if service.cache is not None:
+            service.cache.clear()
+            purged.append("responses")
+
+    return jsonify(purged=purged)
+
+
+@bp.route("/upstream")
+def upstream_status():
+    """Circuit breaker, retry budget and timeout state of this worker's PokeAPI client."""
+    return jsonify(current_app.extensions["pokeapi"].upstream_stats())
@@ -0,0 +1,149 @@
+from flask import Blueprint, abort, current_app, request
+
+from app.http_cache import cached_page, conditional_response, make_etag
+from app.metrics import MODEL_BUILD_LATENCY, timed
+from app.models.pokemon import Pokemon, PokemonListItem
+from app.services import jsoncodec
+from app.services.pokeapi import UpstreamUnavailable
+
+bp = Blueprint("api", __name__, url_prefix="/api/v1")
+
+# Most lookups a single batch request may ask for
+MAX_BATCH = 200
+# Details fetched per step while streaming the dex as NDJSON
+STREAM_CHUNK = 50
+
+
+def get_pokeapi_service():
+    """Get the shared PokeAPI service instance."""
+    return current_app.extensions["pokeapi"]
+
+
+def json_response(data, status: int = 200):
+    """Compact JSON response (no indentation or spaces)."""
+    return current_app.response_class(jsoncodec.dumps(data), status=status, mimetype="application/json")
+
+
+@bp.errorhandler(400)
+@bp.errorhandler(404)
+@bp.errorhandler(503)
+def api_error(error):
+    """Errors as {"error": message} instead of HTML pages."""
+    return json_response({"error": error.description}, status=error.code)
+
+
+@bp.route("/pokemon")
+@cached_page(ttl=3600, vary=())
+def pokemon_collection():
+    """
+    List pokemon, or look many up at once with ?ids=1,4,pikachu.
+
+    Batch lookups are answered from the cache or snapshot, with misses
+    fetched in parallel; unknown names or IDs are reported in "missing".
+    If the upstream fails for any of them the whole batch is a 503.
+    """
+    if "ids" in request.args:
+        return pokemon_batch(request.args["ids"])
+
+    dex_size = current_app.config["POKEDEX_SIZE"]
+    limit = min(max(request.args.get("limit", current_app.config["POKEDEX_PAGE_SIZE"], type=int), 1), MAX_BATCH)
+    offset = max(request.args.get("offset", 0, type=int), 0)
+    limit = min(limit, max(dex_size - offset, 0))
+
+    items = []
+    if limit:
+        response = get_pokeapi_service().get_pokemon_list(limit=limit, offset=offset)
+        if response is None:
+            abort(503, description="Pokemon list unavailable")
+        items = timed(
+            MODEL_BUILD_LATENCY,
+            "PokemonListItem",
+            lambda: [PokemonListItem.from_api(p) for p in response.get("results", [])],
+        )
+
+    next_offset = offset + len(items) if items and offset + len(items) < dex_size else None
+    return conditional_response(
+        make_etag("api_list", items, dex_size, next_offset),
+        lambda: json_response(
+            {"count": dex_size, "next_offset": next_offset, "results": [item.to_dict() for item in items]}
+        ),
+    )
+
+
+def resolve_names(service, keys):
+    """
+    Map numeric IDs in the dex to names.
+
+    Detail responses are cached by URL and the pages fetch by name, so
+    looking IDs up by name reuses those entries instead of fetching again.
+    """
+    index = service.get_search_index(limit=current_app.config["POKEDEX_SIZE"])
+    if index is None:
+        return keys
+    names = []
+    for key in keys:
+        item = index.get(int(key)) if key.isdigit() else None
+        names.append(item.name if item is not None else key)
+    return names
+
+
+def pokemon_batch(ids: str):
+    """Answer a batch lookup for a comma-separated list of names or IDs."""
+    keys = list(dict.fromkeys(part.strip().lower() for part in ids.split(",") if part.strip()))
+    if not keys:
+        abort(400, description="ids must list at least one name or ID")
+    if len(keys) > MAX_BATCH:
+        abort(400, description=f"At most {MAX_BATCH} ids per request")
+
+    service = get_pokeapi_service()
+    try:
+        details = service.get_pokemon_details_many(resolve_names(service, keys), strict=True)
+    except UpstreamUnavailable:
+        abort(503, description="Pokemon details unavailable")
+    results = timed(MODEL_BUILD_LATENCY, "Pokemon", lambda: [Pokemon.from_api(detail) for detail in details if detail])
+    missing = [key for key, detail in zip(keys, details) if not detail]
+
+    return conditional_response(
+        make_etag("api_batch", results, missing),
+        lambda: json_response({"results": [pokemon.to_dict() for pokemon in results], "missing": missing}),
+    )
+
+
+@bp.route("/pokemon/<string:name>")
+@cached_page(ttl=3600, vary=())
+def pokemon_detail(name):
+    """A single pokemon by name or ID."""
+    service = get_pokeapi_service()
+    try:
+        detail = service.get_pokemon_detail(resolve_names(service, [name.strip().lower()])[0], strict=True)
+    except UpstreamUnavailable:
+        abort(503, description="Pokemon details unavailable")
+    if not detail:
+        abort(404, description=f"No pokemon named {name!r}")
+
+    pokemon = timed(MODEL_BUILD_LATENCY, "Pokemon", Pokemon.from_api, detail)
+    return conditional_response(make_etag("api_detail", pokemon), lambda: json_response(pokemon.to_dict()))
+
+
+@bp.route("/pokemon.ndjson")
+def pokemon_ndjson():
+    """
+    Stream the whole dex, one JSON object per line.
+
+    Details are fetched (from the cache where possible) a chunk at a time,
+    so the first lines go out before the last pokemon is loaded. Pokemon
+    that cannot be fetched are skipped.
+    """
+    service = get_pokeapi_service()
+    listing = service.get_pokemon_list(limit=current_app.config["POKEDEX_SIZE"])
+    if listing is None:
+        abort(503, description="Pokemon list unavailable")
+    names = [p["name"] for p in listing.get("results", [])]
+
+    def generate():
+        for start in range(0, len(names), STREAM_CHUNK):
+            for detail in service.get_pokemon_details_many(names[start : start + STREAM_CHUNK]):
+                if detail:
+                    yield jsoncodec.dumps(Pokemon.from_api(detail).to_dict()) + "\n"
+
+    return current_app.response_class(generate(), mimetype="application/x-ndjson")
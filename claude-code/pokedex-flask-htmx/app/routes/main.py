@@ -1,16 +1,20 @@
 from flask import Blueprint, render_template, current_app, abort, request
-from app.services.pokeapi import PokeAPIService
+from app.http_cache import cached_page, conditional_response, make_etag, mark_degraded
+from app.metrics import MODEL_BUILD_LATENCY, timed
+from app.sequencing import drop_superseded, is_superseded, superseded_response
 from app.models.pokemon import PokemonListItem, Pokemon
+from app.services.pokeapi import UpstreamUnavailable
 
 bp = Blueprint("main", __name__)
 
 
 def get_pokeapi_service():
-    """Get PokeAPI service instance."""
-    return PokeAPIService(current_app.config["POKEAPI_BASE_URL"])
+    """Get the shared PokeAPI service instance."""
+    return current_app.extensions["pokeapi"]
 
 
 @bp.route("/")
+@cached_page(ttl=3600)
 def index():
     """Home page with featured pokemon."""
     service = get_pokeapi_service()
@@ -20,73 +24,145 @@ def index():
 
     featured = []
     if response and "results" in response:
-        featured = [PokemonListItem.from_api(p) for p in response["results"]]
+        featured = timed(
+            MODEL_BUILD_LATENCY, "PokemonListItem", lambda: [PokemonListItem.from_api(p) for p in response["results"]]
+        )
+    else:
+        mark_degraded()
+
+    return conditional_response(
+        make_etag("index", featured),
+        lambda: render_template("index.html", featured=featured),
+    )
+
+
+def get_pokemon_page(service, offset):
+    """
+    Fetch one page of the list.
+
+    Offsets are snapped to page boundaries so every page maps to a single
+    cached upstream response. If the upstream fails the page is marked
+    degraded, so the empty (or unenriched) page is not cached.
+
+    Returns:
+        Tuple of (items, total, next_offset); next_offset is None on the last page
+    """
+    page_size = current_app.config["POKEDEX_PAGE_SIZE"]
+    dex_size = current_app.config["POKEDEX_SIZE"]
+    offset = max(0, offset) // page_size * page_size
+    if offset >= dex_size:
+        return [], dex_size, None
+
+    response = service.get_pokemon_list(limit=min(page_size, dex_size - offset), offset=offset)
+
+    items = []
+    total = 0
+    if response and "results" in response:
+        items = timed(
+            MODEL_BUILD_LATENCY, "PokemonListItem", lambda: [PokemonListItem.from_api(p) for p in response["results"]]
+        )
+        total = min(response.get("count", offset + len(items)), dex_size)
+    else:
+        mark_degraded()
+
+    if current_app.config["POKEDEX_ENRICHED_LIST"] and items:
+        # Add types and stat totals; fall back to the plain item on failures
+        details = service.get_pokemon_details_many(p.name for p in items)
+        if not all(details):
+            mark_degraded()
+        items = [PokemonListItem.from_detail(detail) if detail else item for item, detail in zip(items, details)]
 
-    return render_template("index.html", featured=featured)
+    next_offset = offset + page_size if items and offset + page_size < total else None
+    return items, total, next_offset
 
 
 @bp.route("/pokemon")
+@cached_page(ttl=3600)
 def pokemon_list():
-    """Full pokemon list page (Gen 1)."""
+    """Pokemon list page, first page of cards (more load on scroll)."""
     service = get_pokeapi_service()
 
-    # Fetch all 151 Gen 1 pokemon
-    response = service.get_pokemon_list(limit=151)
+    pokemon_list, total, next_offset = get_pokemon_page(service, 0)
 
-    pokemon_list = []
-    if response and "results" in response:
-        pokemon_list = [PokemonListItem.from_api(p) for p in response["results"]]
+    return conditional_response(
+        make_etag("pokemon_list", pokemon_list, total, next_offset),
+        lambda: render_template("pokemon_list.html", pokemon_list=pokemon_list, total=total, next_offset=next_offset),
+    )
 
-    return render_template("pokemon_list.html", pokemon_list=pokemon_list)
+
+@bp.route("/pokemon/cards")
+@cached_page(ttl=3600)
+def pokemon_cards():
+    """HTMX partial with the next page of cards for infinite scroll."""
+    service = get_pokeapi_service()
+
+    offset = request.args.get("offset", 0, type=int)
+    pokemon_list, _, next_offset = get_pokemon_page(service, offset)
+
+    return conditional_response(
+        make_etag("pokemon_cards", pokemon_list, next_offset),
+        lambda: render_template("components/pokemon_page.html", pokemon_list=pokemon_list, next_offset=next_offset),
+    )
 
 
 @bp.route("/pokemon/<string:name>")
+@cached_page(ttl=3600)
 def pokemon_detail(name):
     """Pokemon detail page."""
     service = get_pokeapi_service()
 
-    # Fetch pokemon details
-    response = service.get_pokemon_detail(name)
+    # Fetch pokemon details; an outage is not a missing pokemon
+    try:
+        response = service.get_pokemon_detail(name, strict=True)
+    except UpstreamUnavailable:
+        abort(503)
 
     if not response:
         abort(404)
 
-    pokemon = Pokemon.from_api(response)
+    pokemon = timed(MODEL_BUILD_LATENCY, "Pokemon", Pokemon.from_api, response)
 
-    return render_template("pokemon_detail.html", pokemon=pokemon)
+    return conditional_response(
+        make_etag("pokemon_detail", pokemon, current_app.config["POKEDEX_SIZE"]),
+        lambda: render_template("pokemon_detail.html", pokemon=pokemon),
+    )
 
 
 @bp.route("/search")
+@drop_superseded
+@cached_page(ttl=600)
 def search():
-    """Search pokemon by name or number."""
+    """
+    Search pokemon by name or number.
+
+    Requests a newer keystroke from the same search box has overtaken are
+    answered with 204 (see app.sequencing), as are names shorter than
+    SEARCH_MIN_LENGTH, so htmx leaves the current results in place.
+    """
     query = request.args.get("q", "").strip()
     service = get_pokeapi_service()
 
     results = []
 
     if not query:
-        # Empty query - return no results
+        # Empty query - clear the search box's results, or say there are none
+        if request.headers.get("HX-Request"):
+            return ""
         return render_template("components/search_results.html", results=results)
 
-    # Check if query is a number (search by ID)
-    if query.isdigit():
-        pokemon_id = int(query)
-        # Only search for Gen 1 pokemon (1-151)
-        if 1 <= pokemon_id <= 151:
-            response = service.get_pokemon_detail(pokemon_id)
-            if response:
-                pokemon = PokemonListItem(
-                    id=response["id"], name=response["name"], display_name=response["name"].capitalize()
-                )
-                results.append(pokemon)
+    if len(query) < current_app.config["SEARCH_MIN_LENGTH"] and not query.isdigit():
+        return current_app.response_class(status=204)
+
+    # Name and number lookups are answered from the prebuilt index
+    index = service.get_search_index(limit=current_app.config["POKEDEX_SIZE"])
+    if index is not None:
+        results = index.search(query, limit=10)
     else:
-        # Search by name - filter Gen 1 list
-        response = service.get_pokemon_list(limit=151)
-        if response and "results" in response:
-            # Filter pokemon that contain the query string
-            query_lower = query.lower()
-            filtered = [PokemonListItem.from_api(p) for p in response["results"] if query_lower in p["name"].lower()]
-            # Limit to 10 results
-            results = filtered[:10]
-
-    return render_template("components/search_results.html", results=results)
+        mark_degraded()
+    if is_superseded():
+        return superseded_response()
+
+    return conditional_response(
+        make_etag("search", results),
+        lambda: render_template("components/search_results.html", results=results),
+    )
@@ -0,0 +1,107 @@
+"""
+Dropping superseded HTMX requests.
+
+The search box sends a request per pause in typing and the browser only
+keeps the last response. Each request carries a per-page-load token
+(SEQUENCE_TOKEN_HEADER) and an increasing number (SEQUENCE_HEADER), set by
+the navbar script. RequestSequencer remembers the highest number seen per
+token, so a request that a newer one has already overtaken is answered
+with an empty 204 (which htmx does not swap) instead of being searched
+and rendered.
+
+The numbers are kept per worker. Keep-alive connections usually carry a
+page's requests to the same worker; when they do not, requests are
+simply not dropped.
+"""
+import threading
+from functools import wraps
+
+from flask import current_app, request
+
+from app.services.cache import MemoryCache
+
+SEQUENCE_TOKEN_HEADER = "X-Request-Token"
+SEQUENCE_HEADER = "X-Request-Seq"
+
+
+class RequestSequencer:
+    """Highest request number seen per client token."""
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 300):
+        """
+        Initialize the sequencer.
+
+        Args:
+            maxsize: Client tokens remembered (least recently used are forgotten)
+            ttl: Seconds a token is remembered after its last request
+        """
+        self._latest = MemoryCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+        self.superseded = 0
+
+    def advance(self, token: str, sequence: int) -> bool:
+        """Record a request; False if a newer one from the same client came first."""
+        with self._lock:
+            latest = self._latest.get(token)
+            if latest is not None and sequence < latest:
+                self.superseded += 1
+                return False
+            self._latest.set(token, sequence)
+            return True
+
+    def is_latest(self, token: str, sequence: int) -> bool:
+        """Whether no newer request from the same client has arrived since."""
+        latest = self._latest.get(token)
+        if latest is None or sequence >= latest:
+            return True
+        with self._lock:
+            self.superseded += 1
+        return False
+
+    def reset_after_fork(self) -> None:
+        self._latest.reset_after_fork()
+        self._lock = threading.Lock()
+
+    def stats(self):
+        return {"clients": len(self._latest), "superseded": self.superseded}
+
+
+def _sequence():
+    """(token, number) sent with the current request, or None."""
+    token = request.headers.get(SEQUENCE_TOKEN_HEADER)
+    number = request.headers.get(SEQUENCE_HEADER, "")
+    if not token or not number.isdigit():
+        return None
+    return token[:64], int(number)
+
+
+def superseded_response():
+    """Empty 204: htmx keeps what is on the page."""
+    return current_app.response_class(status=204)
+
+
+def is_superseded() -> bool:
+    """
+    Whether a newer request from this client arrived while this one ran.
+
+    Views call it after their lookups, before rendering.
+    """
+    sequence = _sequence()
+    return sequence is not None and not current_app.extensions["request_sequencer"].is_latest(*sequence)
+
+
+def drop_superseded(view):
+    """Answer requests that a newer one from the same client already overtook with 204."""
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        sequence = _sequence()
+        if sequence is not None and not current_app.extensions["request_sequencer"].advance(*sequence):
+            return superseded_response()
+        return view(*args, **kwargs)
+
+    return wrapper
+
+
+def init_sequencing(app) -> None:
+    app.extensions["request_sequencer"] = RequestSequencer()
@@ -0,0 +1,411 @@
+import os
+import socket
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+from urllib.parse import urlparse
+
+from app.services import jsoncodec
+
+
+class CacheBackend:
+    """
+    Interface shared by the response cache backends.
+
+    Values must be JSON-serializable so every backend can store them.
+    Backends never raise on lookup failures; a broken cache behaves like
+    an empty one.
+    """
+
+    def __init__(self, ttl: float = 3600):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._stats_lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None if missing or expired."""
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any) -> None:
+        """Store value under key for ttl seconds."""
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        """Drop every entry owned by this cache."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release connections held by the backend."""
+
+    def reset_after_fork(self) -> None:
+        """Drop locks and connections inherited from a parent process, keeping entries."""
+        self._stats_lock = threading.Lock()
+
+    def _count(self, counter: str) -> None:
+        with self._stats_lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss/error counters for this process."""
+        return {"hits": self.hits, "misses": self.misses, "errors": self.errors}
+
+
+class MemoryCache(CacheBackend):
+    """Thread-safe in-process cache with a per-entry TTL and LRU eviction."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 3600, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries before the least recently used is evicted
+            ttl: Seconds an entry stays valid after it is stored
+            clock: Monotonic time source (overridable in tests)
+        """
+        super().__init__(ttl)
+        self.maxsize = maxsize
+        self._clock = clock
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._data[key]
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (self._clock() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def reset_after_fork(self) -> None:
+        super().reset_after_fork()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "errors": self.errors,
+                "evictions": self.evictions,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+            }
+
+
+class DiskCache(CacheBackend):
+    """
+    SQLite-backed cache shared by every worker process on one host.
+
+    Entries expire by wall-clock time so all processes agree on freshness.
+    Every evict_every sets (1% of maxsize, at most 100) the expired entries
+    are deleted and, past maxsize, the entries closest to expiry are
+    dropped first, so the namespace may briefly overshoot maxsize by 1%.
+    """
+
+    def __init__(self, path: str, maxsize: int = 10000, ttl: float = 3600, namespace: str = "pokeapi"):
+        """
+        Initialize the cache.
+
+        Args:
+            path: SQLite database file (created if missing)
+            maxsize: Maximum number of entries kept in this namespace
+            ttl: Seconds an entry stays valid after it is stored
+            namespace: Prefix separating independent caches in one file
+        """
+        super().__init__(ttl)
+        self.path = str(path)
+        self.maxsize = maxsize
+        self.namespace = namespace
+        self.evictions = 0
+        self.evict_every = max(1, min(100, maxsize // 100))
+        self._sets = 0
+        # Keys in this namespace, as a range the primary key index can answer
+        # (";" sorts right after ":")
+        self._key_range = (f"{namespace}:", f"{namespace};")
+        self._local = threading.local()
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connect().execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection (sqlite3 connections are not shareable)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    def get(self, key: str) -> Optional[Any]:
+        try:
+            row = (
+                self._connect()
+                .execute("SELECT value, expires_at FROM cache WHERE key = ?", (self._key(key),))
+                .fetchone()
+            )
+            if row is None or row[1] <= time.time():
+                self._count("misses")
+                return None
+            value = jsoncodec.loads(row[0])
+        except (sqlite3.Error, ValueError):
+            # ValueError: a row that is not valid JSON (truncated or written by something else)
+            self._count("errors")
+            return None
+
+        self._count("hits")
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        try:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (self._key(key), jsoncodec.dumps(value), time.time() + self.ttl),
+            )
+            # Not locked: a lost increment only delays an eviction pass
+            self._sets += 1
+            if self._sets % self.evict_every == 0:
+                self._evict(conn)
+        except sqlite3.Error:
+            self._count("errors")
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        low, high = self._key_range
+        conn.execute("DELETE FROM cache WHERE key >= ? AND key < ? AND expires_at <= ?", (low, high, time.time()))
+        (size,) = conn.execute("SELECT COUNT(*) FROM cache WHERE key >= ? AND key < ?", (low, high)).fetchone()
+        if size > self.maxsize:
+            conn.execute(
+                "DELETE FROM cache WHERE key IN "
+                "(SELECT key FROM cache WHERE key >= ? AND key < ? ORDER BY expires_at LIMIT ?)",
+                (low, high, size - self.maxsize),
+            )
+            with self._stats_lock:
+                self.evictions += size - self.maxsize
+
+    def clear(self) -> None:
+        try:
+            self._connect().execute("DELETE FROM cache WHERE key >= ? AND key < ?", self._key_range)
+        except sqlite3.Error:
+            self._count("errors")
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def reset_after_fork(self) -> None:
+        # sqlite3 connections must not cross a fork; abandon (not close) the parent's
+        super().reset_after_fork()
+        self._local = threading.local()
+
+    def stats(self) -> Dict[str, int]:
+        stats = super().stats()
+        stats["evictions"] = self.evictions
+        return stats
+
+
+class RedisError(Exception):
+    """Raised when a Redis server replies with an error."""
+
+
+class RedisCache(CacheBackend):
+    """
+    Cache stored in a Redis-protocol server, shared across hosts.
+
+    Speaks just enough RESP2 (GET, SET EX, SCAN, DEL, SELECT) to avoid a
+    client dependency, so it also works with Valkey, KeyDB or a fake
+    server in tests. Expiry is delegated to the server.
+    """
+
+    def __init__(self, url: str = "redis://localhost:6379/0", ttl: float = 3600, namespace: str = "pokeapi", timeout=1):
+        """
+        Initialize the cache.
+
+        Args:
+            url: Server URL, redis://host:port/db
+            ttl: Seconds an entry stays valid after it is stored
+            namespace: Key prefix for this cache
+            timeout: Socket timeout in seconds
+        """
+        super().__init__(ttl)
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.namespace = namespace
+        self.timeout = timeout
+        self._sock = None
+        self._reader = None
+        self._lock = threading.Lock()
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    def _connect(self) -> None:
+        self._sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._reader = self._sock.makefile("rb")
+        if self.db:
+            self._send("SELECT", self.db)
+
+    def _disconnect(self) -> None:
+        if self._sock is not None:
+            try:
+                self._reader.close()
+                self._sock.close()
+            except OSError:
+                pass
+        self._sock = None
+        self._reader = None
+
+    def _send(self, *args) -> Any:
+        parts = [f"*{len(args)}\r\n".encode()]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        self._sock.sendall(b"".join(parts))
+        return self._read_reply()
+
+    def _read_reply(self) -> Any:
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError("connection closed by server")
+        kind, rest = line[:1], line[1:-2]
+        if kind == b"+":
+            return rest.decode()
+        if kind == b"-":
+            raise RedisError(rest.decode())
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            length = int(rest)
+            if length == -1:
+                return None
+            data = self._reader.read(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            length = int(rest)
+            if length == -1:
+                return None
+            return [self._read_reply() for _ in range(length)]
+        raise RedisError(f"unexpected reply: {line!r}")
+
+    def execute(self, *args) -> Any:
+        """Run one command, reconnecting once if the connection dropped."""
+        with self._lock:
+            for attempt in range(2):
+                try:
+                    if self._sock is None:
+                        self._connect()
+                    return self._send(*args)
+                except (OSError, ConnectionError):
+                    self._disconnect()
+                    if attempt:
+                        raise
+
+    def get(self, key: str) -> Optional[Any]:
+        try:
+            data = self.execute("GET", self._key(key))
+            if data is None:
+                self._count("misses")
+                return None
+            value = jsoncodec.loads(data)
+        except (OSError, ConnectionError, RedisError, ValueError):
+            self._count("errors")
+            return None
+
+        self._count("hits")
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        try:
+            payload = jsoncodec.dumps(value)
+            self.execute("SET", self._key(key), payload, "EX", max(1, int(self.ttl)))
+        except (OSError, ConnectionError, RedisError):
+            self._count("errors")
+
+    def clear(self) -> None:
+        try:
+            cursor = "0"
+            while True:
+                cursor, keys = self.execute("SCAN", cursor, "MATCH", f"{self.namespace}:*", "COUNT", 500)
+                cursor = cursor.decode() if isinstance(cursor, bytes) else str(cursor)
+                if keys:
+                    self.execute("DEL", *keys)
+                if cursor == "0":
+                    break
+        except (OSError, ConnectionError, RedisError):
+            self._count("errors")
+
+    def close(self) -> None:
+        with self._lock:
+            self._disconnect()
+
+    def reset_after_fork(self) -> None:
+        # Closing the inherited socket only closes this process's descriptor
+        super().reset_after_fork()
+        self._lock = threading.Lock()
+        self._disconnect()
+
+
+def create_cache(config, namespace: str = "pokeapi", ttl: Optional[float] = None) -> Optional[CacheBackend]:
+    """
+    Build the cache backend selected by CACHE_BACKEND.
+
+    Args:
+        config: Flask config mapping
+        namespace: Key prefix so several caches can share one store
+        ttl: Entry lifetime, defaults to CACHE_TIMEOUT
+
+    Returns:
+        A cache backend, or None when caching is disabled
+    """
+    backend = config["CACHE_BACKEND"]
+    ttl = config["CACHE_TIMEOUT"] if ttl is None else ttl
+    if backend == "none" or ttl <= 0:
+        return None
+    if backend == "memory":
+        return MemoryCache(maxsize=config["CACHE_MAXSIZE"], ttl=ttl)
+    if backend == "disk":
+        return DiskCache(config["CACHE_PATH"], maxsize=config["CACHE_MAXSIZE"], ttl=ttl, namespace=namespace)
+    if backend == "redis":
+        return RedisCache(config["CACHE_REDIS_URL"], ttl=ttl, namespace=namespace)
+    raise ValueError(f"Unknown CACHE_BACKEND: {backend!r}")
@@ -0,0 +1,27 @@
+"""
+JSON encode/decode, using orjson when it is installed.
+
+orjson parses PokeAPI documents several times faster than the standard
+library and is optional: without it everything falls back to json.
+"""
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Decode a JSON document from str or bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(value: Any) -> str:
+    """Encode a value as compact JSON text."""
+    if orjson is not None:
+        return orjson.dumps(value).decode()
+    return json.dumps(value, separators=(",", ":"))
@@ -1,53 +1,446 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
-from typing import Optional, Dict
+from requests.adapters import HTTPAdapter
+from typing import Callable, Iterable, List, Optional, Dict
+from urllib.parse import urlencode
+
+from app.metrics import record_upstream
+from app.services import jsoncodec
+from app.services.cache import CacheBackend, MemoryCache, create_cache
+from app.services.resilience import AdaptiveTimeout, CircuitBreaker, RetryBudget, backoff_delay
+from app.services.search import SearchIndex
+from app.services.singleflight import SingleFlight
+from app.services.snapshot import Snapshot, slim_detail
+
+
+class UpstreamUnavailable(Exception):
+    """PokeAPI could not answer: errors, timeouts, 429/5xx, bad JSON or an open breaker."""
+
+
+def endpoint_label(base_url: str, url: str) -> str:
+    """Metric label for an upstream URL, with the name or ID replaced: /pokemon/{name}."""
+    resource, _, name = url[len(base_url) :].strip("/").partition("/")
+    return f"/{resource}/{{name}}" if name else f"/{resource}"
+
+
+def cache_key(url: str, params: Optional[Dict] = None) -> str:
+    """Build a cache key from the URL and its sorted query params."""
+    if not params:
+        return url
+    return f"{url}?{urlencode(sorted(params.items()))}"
 
 
 class PokeAPIService:
     """Service for interacting with PokeAPI."""
 
-    def __init__(self, base_url: str):
-        """Initialize the service with base URL."""
+    def __init__(
+        self,
+        base_url: str,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        timeout: float = 10,
+        cache_timeout: float = 3600,
+        cache_maxsize: int = 1024,
+        max_stale: float = 0,
+        cache: Optional[CacheBackend] = None,
+        snapshot: Optional[Snapshot] = None,
+        max_retries: int = 2,
+        breaker: Optional[CircuitBreaker] = None,
+        retry_budget: Optional[RetryBudget] = None,
+        fallback: Optional[Snapshot] = None,
+        refresh_concurrency: int = 2,
+    ):
+        """
+        Initialize the service with base URL.
+
+        A single instance is meant to be shared by every request in a worker
+        process so the underlying keep-alive connections and the response
+        cache get reused.
+
+        Args:
+            base_url: PokeAPI base URL
+            pool_connections: Number of per-host connection pools to keep
+            pool_maxsize: Maximum connections kept alive per host
+            timeout: Longest timeout in seconds for upstream requests; shorter
+                connect/read timeouts are derived from observed latency
+            cache_timeout: Seconds a successful response is fresh (0 disables caching)
+            cache_maxsize: Maximum number of cached responses
+            max_stale: Seconds past freshness an entry may still be served while
+                it is refreshed in the background (0 disables stale-while-revalidate)
+            cache: Cache backend to use instead of a private in-memory one; its
+                ttl should cover cache_timeout + max_stale
+            snapshot: Local dataset to answer from instead of the network
+            max_retries: Retries after a failed request (connection errors,
+                timeouts, 429 and 5xx), with jittered backoff
+            breaker: Circuit breaker guarding the upstream (default: 5
+                failures in 30s open it for 15s)
+            retry_budget: Shared limit on retries (default: 20% of requests)
+            fallback: Local dataset answering while the upstream fails
+            refresh_concurrency: Threads refreshing stale entries in the
+                background; further refreshes wait for a free thread
+        """
         self.base_url = base_url.rstrip("/")
-        self.session = requests.Session()
+        self.timeout = timeout
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.session = self._create_session()
+        if cache is None and cache_timeout > 0:
+            cache = MemoryCache(maxsize=cache_maxsize, ttl=cache_timeout + max_stale)
+        self.cache = cache
+        self.cache_timeout = cache_timeout
+        self.max_stale = max_stale
+        self.stale_served = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+        self._refreshing = set()
+        self._refresh_lock = threading.Lock()
+        self.refresh_concurrency = refresh_concurrency
+        self._refresh_executor = None
+        self.snapshot = snapshot
+        self.fallback = fallback
+        self.max_retries = max_retries
+        self.breaker = breaker or CircuitBreaker()
+        self.retry_budget = retry_budget or RetryBudget()
+        self.timeouts = AdaptiveTimeout(ceiling=timeout)
+        self.inflight = SingleFlight()
+        self.batch_concurrency = pool_maxsize
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._search_index = None
+        self._search_index_key = None
+        self._search_index_lock = threading.Lock()
+
+    def _create_session(self) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    @classmethod
+    def from_config(cls, config) -> "PokeAPIService":
+        """Create a service from a Flask config mapping."""
+        cache = None
+        if config["CACHE_TIMEOUT"] > 0:
+            # Entries are kept past freshness so they can be served stale
+            cache = create_cache(config, ttl=config["CACHE_TIMEOUT"] + config["CACHE_MAX_STALE"])
+        snapshot = fallback = None
+        if config["POKEDEX_DATA_MODE"] == "local":
+            snapshot = Snapshot.load(config["POKEDEX_SNAPSHOT_PATH"])
+        elif config["POKEDEX_SNAPSHOT_FALLBACK"] and os.path.exists(config["POKEDEX_SNAPSHOT_PATH"]):
+            fallback = Snapshot.load(config["POKEDEX_SNAPSHOT_PATH"])
+        return cls(
+            config["POKEAPI_BASE_URL"],
+            pool_connections=config["POKEAPI_POOL_CONNECTIONS"],
+            pool_maxsize=config["POKEAPI_POOL_MAXSIZE"],
+            timeout=config["POKEAPI_TIMEOUT"],
+            cache_timeout=config["CACHE_TIMEOUT"] if cache is not None else 0,
+            max_stale=config["CACHE_MAX_STALE"],
+            cache=cache,
+            snapshot=snapshot,
+            max_retries=config["POKEAPI_MAX_RETRIES"],
+            breaker=CircuitBreaker(
+                failure_threshold=config["POKEAPI_BREAKER_FAILURES"],
+                window=config["POKEAPI_BREAKER_WINDOW"],
+                reset_timeout=config["POKEAPI_BREAKER_RESET"],
+                slow_call=config["POKEAPI_SLOW_CALL"],
+            ),
+            retry_budget=RetryBudget(ratio=config["POKEAPI_RETRY_BUDGET"]),
+            fallback=fallback,
+        )
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        for executor in (self._executor, self._refresh_executor):
+            if executor is not None:
+                executor.shutdown(wait=False)
+        self.session.close()
+        if self.cache is not None:
+            self.cache.close()
 
-    def get_pokemon_list(self, limit: int = 151, offset: int = 0) -> Optional[Dict]:
+    def reset_after_fork(self) -> None:
+        """
+        Make a service inherited through fork() safe to use in the child.
+
+        Pooled sockets, executor threads and locks do not survive a fork
+        (threads are gone and a lock may have been held by one of them), so
+        they are replaced. Cached data and the search index are kept, which
+        is what makes warming the parent before forking worthwhile.
+        """
+        self.session = self._create_session()
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._refreshing = set()
+        self._refresh_lock = threading.Lock()
+        self._refresh_executor = None
+        self._search_index_lock = threading.Lock()
+        self.inflight = SingleFlight()
+        self.breaker.reset_after_fork()
+        self.retry_budget.reset_after_fork()
+        self.timeouts.reset_after_fork()
+        if self.cache is not None:
+            self.cache.reset_after_fork()
+
+    def cache_stats(self) -> Dict[str, int]:
+        """Return response cache counters (empty when caching is disabled)."""
+        if self.cache is None:
+            return {}
+        stats = self.cache.stats()
+        stats.update(
+            stale_served=self.stale_served,
+            refreshes=self.refreshes,
+            refresh_failures=self.refresh_failures,
+        )
+        return stats
+
+    def upstream_stats(self) -> Dict:
+        """Return circuit breaker, retry and timeout state."""
+        return {
+            "breaker": self.breaker.stats(),
+            "retry_budget": self.retry_budget.stats(),
+            "timeouts": self.timeouts.stats(),
+        }
+
+    def _get_json(
+        self,
+        url: str,
+        params: Optional[Dict] = None,
+        refresh: bool = False,
+        project: Optional[Callable[[Dict], Dict]] = None,
+    ) -> Optional[Dict]:
+        """
+        GET a JSON document, serving it from the cache when possible.
+
+        Fresh entries are returned as is. Entries past cache_timeout but
+        within max_stale are returned immediately while a background thread
+        refreshes them; if that refresh fails the stale copy keeps being
+        served. Concurrent misses for the same key share one upstream request.
+        With refresh=True the cache is bypassed for reading (but still
+        written), and a failure leaves the existing entry in place.
+        project, when given, reduces a fetched document to what callers
+        use before it is cached, so the full payload is never kept.
+        """
+        key = cache_key(url, params)
+        if self.cache is not None and not refresh:
+            entry = self.cache.get(key)
+            if entry is not None:
+                age = time.time() - entry["fetched_at"]
+                if age < self.cache_timeout:
+                    return entry["data"]
+                if age < self.cache_timeout + self.max_stale:
+                    with self._refresh_lock:
+                        self.stale_served += 1
+                    self._refresh_in_background(key, url, params, project)
+                    return entry["data"]
+
+        return self.inflight.do(key, lambda: self._fetch(key, url, params, project))
+
+    def _refresh_in_background(
+        self, key: str, url: str, params: Optional[Dict] = None, project: Optional[Callable[[Dict], Dict]] = None
+    ) -> None:
+        """Queue a refresh of a stale key, unless one is already queued or running."""
+        with self._refresh_lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+            self.refreshes += 1
+            if self._refresh_executor is None:
+                self._refresh_executor = ThreadPoolExecutor(
+                    max_workers=self.refresh_concurrency, thread_name_prefix="pokeapi-refresh"
+                )
+            executor = self._refresh_executor
+
+        def refresh():
+            try:
+                self.inflight.do(key, lambda: self._fetch(key, url, params, project))
+            except UpstreamUnavailable:
+                with self._refresh_lock:
+                    self.refresh_failures += 1
+            finally:
+                with self._refresh_lock:
+                    self._refreshing.discard(key)
+
+        try:
+            executor.submit(refresh)
+        except RuntimeError:  # closed; the stale copy is still served
+            with self._refresh_lock:
+                self._refreshing.discard(key)
+
+    def _fetch(
+        self, key: str, url: str, params: Optional[Dict] = None, project: Optional[Callable[[Dict], Dict]] = None
+    ) -> Optional[Dict]:
+        """
+        Request a document from the upstream and cache it (projected, if asked) on success.
+
+        Connection errors, timeouts, 429 and 5xx responses are retried with
+        jittered backoff as long as the breaker and the retry budget allow.
+        A 404 (or other 4xx) is an answer, not a failure, and returns None.
+
+        Raises:
+            UpstreamUnavailable: At once while the circuit breaker is open,
+                or once retries are exhausted
+        """
+        endpoint = endpoint_label(self.base_url, url)
+        if not self.breaker.allow():
+            record_upstream(endpoint, "short_circuit")
+            raise UpstreamUnavailable(f"Circuit open for {endpoint}")
+        self.retry_budget.deposit()
+
+        attempt = 0
+        while True:
+            connect_timeout, read_timeout = self.timeouts.current
+            started = time.monotonic()
+            try:
+                response = self.session.get(url, params=params, timeout=(connect_timeout, read_timeout))
+            except requests.Timeout:
+                # Count the timeout as a latency sample so timeouts can grow back
+                self.timeouts.record(read_timeout)
+                self.breaker.record_failure()
+                record_upstream(endpoint, "timeout", time.monotonic() - started)
+            except requests.RequestException:
+                self.breaker.record_failure()
+                record_upstream(endpoint, "error")
+            else:
+                elapsed = time.monotonic() - started
+                record_upstream(endpoint, str(response.status_code), elapsed)
+                if response.status_code == 200:
+                    try:
+                        data = jsoncodec.loads(response.content)
+                    except ValueError:
+                        # A body that is not valid JSON
+                        self.breaker.record_failure()
+                        raise UpstreamUnavailable(f"Invalid JSON from {url}")
+                    self.breaker.record_success(elapsed)
+                    self.timeouts.record(elapsed)
+                    if project is not None:
+                        data = project(data)
+                    if self.cache is not None:
+                        self.cache.set(key, {"fetched_at": time.time(), "data": data})
+                    return data
+                if response.status_code != 429 and response.status_code < 500:
+                    self.breaker.record_success(elapsed)
+                    return None
+                self.breaker.record_failure()
+
+            if attempt >= self.max_retries or not self.breaker.allow() or not self.retry_budget.try_spend():
+                raise UpstreamUnavailable(f"{endpoint} failed after {attempt + 1} attempts")
+            attempt += 1
+            time.sleep(backoff_delay(attempt))
+
+    def get_pokemon_list(self, limit: int = 151, offset: int = 0, refresh: bool = False) -> Optional[Dict]:
         """
         Fetch a list of pokemon.
 
         Args:
             limit: Number of pokemon to fetch (default 151 for Gen 1)
             offset: Offset for pagination
+            refresh: Fetch from the upstream even if a fresh copy is cached
 
         Returns:
             Dictionary with pokemon list or None on error
         """
-        try:
-            url = f"{self.base_url}/pokemon"
-            params = {"limit": limit, "offset": offset}
-            response = self.session.get(url, params=params, timeout=10)
+        if self.snapshot is not None:
+            return self.snapshot.get_pokemon_list(limit=int(limit), offset=int(offset))
 
-            if response.status_code == 200:
-                return response.json()
-            return None
-        except requests.RequestException:
+        url = f"{self.base_url}/pokemon"
+        params = {"limit": int(limit), "offset": int(offset)}
+        try:
+            return self._get_json(url, params=params, refresh=refresh)
+        except UpstreamUnavailable:
+            if self.fallback is not None and not refresh:
+                return self.fallback.get_pokemon_list(limit=int(limit), offset=int(offset))
             return None
 
-    def get_pokemon_detail(self, name_or_id: str) -> Optional[Dict]:
+    def get_pokemon_detail(self, name_or_id: str, refresh: bool = False, strict: bool = False) -> Optional[Dict]:
         """
         Fetch detailed information for a specific pokemon.
 
         Args:
             name_or_id: Pokemon name or ID
+            refresh: Fetch from the upstream even if a fresh copy is cached
+            strict: Raise UpstreamUnavailable when the upstream (and fallback)
+                cannot answer, instead of returning None as for a 404
 
         Returns:
-            Dictionary with pokemon details or None if not found
+            Detail dictionary reduced to the rendered fields (see slim_detail),
+            or None if not found (or, unless strict, unavailable)
         """
-        try:
-            url = f"{self.base_url}/pokemon/{name_or_id.lower()}"
-            response = self.session.get(url, timeout=10)
+        if self.snapshot is not None:
+            return self.snapshot.get_pokemon_detail(name_or_id)
 
-            if response.status_code == 200:
-                return response.json()
-            return None
-        except requests.RequestException:
+        url = f"{self.base_url}/pokemon/{str(name_or_id).strip().lower()}"
+        try:
+            return self._get_json(url, refresh=refresh, project=slim_detail)
+        except UpstreamUnavailable:
+            if self.fallback is not None and not refresh:
+                detail = self.fallback.get_pokemon_detail(name_or_id)
+                if detail is not None:
+                    return detail
+            if strict:
+                raise
             return None
+
+    def get_pokemon_details_many(self, names: Iterable, strict: bool = False) -> List[Optional[Dict]]:
+        """
+        Fetch detailed information for many pokemon in parallel.
+
+        Each lookup goes through the cache and the single-flight group, so a
+        pokemon costs at most one upstream request per cache lifetime no
+        matter how many pages or threads ask for it. Misses are fetched on
+        a shared thread pool no wider than the connection pool.
+
+        Args:
+            names: Pokemon names or IDs
+            strict: Raise UpstreamUnavailable if any lookup could not be
+                answered, so None only means not found
+
+        Returns:
+            Detail dictionaries in the same order as names, None for failures
+        """
+        names = list(names)
+        if self.snapshot is not None:
+            return [self.snapshot.get_pokemon_detail(name) for name in names]
+
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.batch_concurrency, thread_name_prefix="pokeapi-batch"
+                )
+        return list(self._executor.map(lambda name: self.get_pokemon_detail(name, strict=strict), names))
+
+    def get_search_index(self, limit: int = 151) -> Optional[SearchIndex]:
+        """
+        Return a search index over the first `limit` pokemon.
+
+        The index is rebuilt from the (cached) list once the response cache
+        would have expired it, so keystrokes in between never hit the
+        upstream. Returns None if the list cannot be fetched.
+
+        Args:
+            limit: Number of pokemon to index (default 151 for Gen 1)
+        """
+        ttl = self.cache_timeout if self.cache is not None else 0
+        if self.snapshot is not None:
+            ttl = float("inf")
+
+        index, key = self._search_index, self._search_index_key
+        if index is not None and key[0] == limit and time.monotonic() < key[1] + ttl:
+            return index
+
+        with self._search_index_lock:
+            if self._search_index is not index and self._search_index_key[0] == limit:
+                # Another thread rebuilt it while we waited
+                return self._search_index
+
+            listing = self.get_pokemon_list(limit=limit)
+            if not listing or "results" not in listing:
+                # Keep answering from the previous index if we had one
+                return index if index is not None and key[0] == limit else None
+
+            self._search_index = SearchIndex.from_list_results(listing["results"])
+            self._search_index_key = (limit, time.monotonic())
+            return self._search_index
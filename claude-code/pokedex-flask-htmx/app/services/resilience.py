@@ -0,0 +1,225 @@
+"""
+Guards for calls to an unreliable upstream.
+
+CircuitBreaker stops calling PokeAPI for a while once it keeps failing or
+answering slowly, so worker threads fail fast instead of queueing behind
+timeouts. RetryBudget caps retries at a fraction of first attempts, so
+retries cannot multiply the load on an upstream that is already
+struggling. AdaptiveTimeout derives connect/read timeouts from observed
+latency instead of a fixed worst case.
+"""
+import random
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Tuple
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open breaker over a sliding failure window.
+
+    Failures (errors, 5xx, timeouts and calls slower than slow_call) are
+    counted over the last `window` seconds. Once `failure_threshold` of
+    them accumulate the breaker opens and allow() refuses calls for
+    `reset_timeout` seconds. It then lets a single probe through
+    (half-open); the probe's outcome closes or re-opens it.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        window: float = 30,
+        reset_timeout: float = 15,
+        slow_call: float = 5,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the breaker.
+
+        Args:
+            failure_threshold: Failures within the window that open the breaker
+            window: Seconds over which failures are counted
+            reset_timeout: Seconds the breaker stays open before a probe
+            slow_call: Successful calls slower than this many seconds count as failures
+            clock: Monotonic time source (overridable in tests)
+        """
+        self.failure_threshold = failure_threshold
+        self.window = window
+        self.reset_timeout = reset_timeout
+        self.slow_call = slow_call
+        self._clock = clock
+        self._failures: Deque[float] = deque()
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+        self.opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+                return HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may go to the upstream now."""
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+                self._state = HALF_OPEN
+                self._probing = False
+            if self._state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self, duration: float) -> None:
+        """Record a completed call; slow ones count as failures."""
+        if duration > self.slow_call:
+            self.record_failure()
+            return
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._state = CLOSED
+                self._failures.clear()
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            now = self._clock()
+            if self._state == HALF_OPEN:
+                self._open(now)
+                return
+            self._failures.append(now)
+            while self._failures and self._failures[0] <= now - self.window:
+                self._failures.popleft()
+            if self._state == CLOSED and len(self._failures) >= self.failure_threshold:
+                self._open(now)
+
+    def _open(self, now: float) -> None:
+        self._state = OPEN
+        self._opened_at = now
+        self._probing = False
+        self._failures.clear()
+        self.opened += 1
+
+    def reset_after_fork(self) -> None:
+        self._lock = threading.Lock()
+
+    def stats(self) -> Dict:
+        return {"state": self.state, "opened": self.opened, "rejected": self.rejected}
+
+
+class RetryBudget:
+    """
+    Token bucket allowing retries for a fraction of first attempts.
+
+    Each first attempt deposits `ratio` tokens (up to `max_tokens`); a
+    retry spends one. The bucket starts with `min_tokens` so a quiet
+    service can still retry its first few failures.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_tokens: float = 10, max_tokens: float = 100):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = float(min_tokens)
+        self._lock = threading.Lock()
+        self.retries = 0
+        self.exhausted = 0
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._tokens = min(self._tokens + self.ratio, self.max_tokens)
+
+    def try_spend(self) -> bool:
+        """Take a token for one retry, if the budget has one."""
+        with self._lock:
+            if self._tokens >= 1:
+                self._tokens -= 1
+                self.retries += 1
+                return True
+            self.exhausted += 1
+            return False
+
+    def reset_after_fork(self) -> None:
+        self._lock = threading.Lock()
+
+    def stats(self) -> Dict:
+        return {"tokens": round(self._tokens, 1), "retries": self.retries, "exhausted": self.exhausted}
+
+
+def backoff_delay(attempt: int, base: float = 0.1, cap: float = 2.0) -> float:
+    """Full-jitter exponential backoff: uniform in [0, min(cap, base * 2**attempt)]."""
+    return random.uniform(0, min(cap, base * 2**attempt))
+
+
+class AdaptiveTimeout:
+    """
+    Connect/read timeouts derived from recent upstream latency.
+
+    Keeps the last `sample_size` response times (time to response
+    headers). The read timeout is `multiplier` times their p99 and the
+    connect timeout `multiplier` times their p50 (a connection costs about
+    one round trip, which the median response time bounds), each clamped
+    to [floor, ceiling]. Until `min_samples` are seen, both are `ceiling`.
+    """
+
+    def __init__(
+        self,
+        ceiling: float = 10,
+        floor: float = 1,
+        multiplier: float = 3,
+        sample_size: int = 200,
+        min_samples: int = 20,
+    ):
+        """
+        Initialize the timeouts.
+
+        Args:
+            ceiling: Largest timeout, and the one used while warming up
+            floor: Smallest timeout, so a burst of fast responses cannot make it fragile
+            multiplier: Headroom over the observed percentile
+            sample_size: Response times remembered
+            min_samples: Samples needed before timeouts adapt
+        """
+        self.ceiling = ceiling
+        self.floor = floor
+        self.multiplier = multiplier
+        self.min_samples = min_samples
+        self._samples: Deque[float] = deque(maxlen=sample_size)
+        self._lock = threading.Lock()
+        self._current = (ceiling, ceiling)
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+            if len(self._samples) < self.min_samples:
+                return
+            ordered = sorted(self._samples)
+            p50 = ordered[len(ordered) // 2]
+            p99 = ordered[min(int(len(ordered) * 0.99), len(ordered) - 1)]
+            self._current = (self._clamp(p50 * self.multiplier), self._clamp(p99 * self.multiplier))
+
+    def _clamp(self, seconds: float) -> float:
+        return min(max(seconds, self.floor), self.ceiling)
+
+    @property
+    def current(self) -> Tuple[float, float]:
+        """(connect, read) timeouts, in the form requests accepts."""
+        return self._current
+
+    def reset_after_fork(self) -> None:
+        self._lock = threading.Lock()
+
+    def stats(self) -> Dict:
+        connect, read = self._current
+        return {"connect_timeout": round(connect, 3), "read_timeout": round(read, 3), "samples": len(self._samples)}
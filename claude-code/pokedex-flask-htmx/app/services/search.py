@@ -0,0 +1,195 @@
+import heapq
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set
+
+from app.models.pokemon import PokemonListItem
+
+# Substrings up to this length are indexed directly; longer queries
+# intersect the postings of their n-grams and verify the candidates.
+NGRAM_SIZE = 3
+
+# Fuzzy matching only kicks in for queries at least this long
+FUZZY_MIN_LENGTH = 3
+
+# Upper bound on edit-distance computations per query; candidates sharing
+# the most bigrams with the query are verified first
+FUZZY_MAX_CANDIDATES = 32
+
+
+def _ngrams(text: str, size: int) -> Set[str]:
+    return {text[i : i + size] for i in range(len(text) - size + 1)}
+
+
+def max_typos(query: str) -> int:
+    """Number of edits tolerated for a query of this length."""
+    return 1 if len(query) <= 5 else 2
+
+
+def _pattern_masks(query: str) -> Dict[str, int]:
+    """Bitmask of the positions of each character in query."""
+    masks: Dict[str, int] = {}
+    for i, char in enumerate(query):
+        masks[char] = masks.get(char, 0) | (1 << i)
+    return masks
+
+
+def _prefix_distance(masks: Dict[str, int], length: int, name: str) -> int:
+    """
+    Bit-parallel (Myers/Hyyrö) edit distance between the query described by
+    masks/length and the best prefix of name.
+
+    One pass over name tracks distance(query, name[:j]) for every j using
+    a handful of integer operations per character instead of a DP row.
+    """
+    all_ones = (1 << length) - 1
+    high_bit = 1 << (length - 1)
+    positive, negative = all_ones, 0
+    score = best = length
+    for char in name:
+        eq = masks.get(char, 0)
+        xv = eq | negative
+        xh = (((eq & positive) + positive) ^ positive) | eq
+        hp = negative | (~(xh | positive) & all_ones)
+        hn = positive & xh
+        if hp & high_bit:
+            score += 1
+        elif hn & high_bit:
+            score -= 1
+            if score < best:
+                best = score
+        hp = ((hp << 1) | 1) & all_ones
+        hn = (hn << 1) & all_ones
+        positive = hn | (~(xv | hp) & all_ones)
+        negative = hp & xv
+    return best
+
+
+def prefix_edit_distance(query: str, name: str, max_distance: int) -> Optional[int]:
+    """
+    Smallest edit distance between query and any prefix of name.
+
+    Covers both a fully typed misspelling ("charzard") and a word still
+    being typed ("charz"). Returns None if it exceeds max_distance.
+    """
+    if not query:
+        return 0
+    # Prefixes longer than this are always more than max_distance away
+    best = _prefix_distance(_pattern_masks(query), len(query), name[: len(query) + max_distance])
+    return best if best <= max_distance else None
+
+
+class SearchIndex:
+    """
+    In-memory name/ID index over the pokemon list.
+
+    Built once from a list response so each keystroke is answered without
+    touching the upstream or rebuilding models. Prefix matches use a sorted
+    name array and bisect; substring matches use an n-gram posting index.
+    """
+
+    def __init__(self, items: Iterable[PokemonListItem]):
+        self.items: List[PokemonListItem] = sorted(items, key=lambda item: item.id)
+        self._by_id: Dict[int, PokemonListItem] = {item.id: item for item in self.items}
+        self._lower_names = [item.name.lower() for item in self.items]
+        self._names = sorted((item.name.lower(), position) for position, item in enumerate(self.items))
+        self._sorted_names = [name for name, _ in self._names]
+
+        self._postings: Dict[str, Set[int]] = {}
+        for position, item in enumerate(self.items):
+            name = item.name.lower()
+            for size in range(1, NGRAM_SIZE + 1):
+                for gram in _ngrams(name, size):
+                    self._postings.setdefault(gram, set()).add(position)
+
+    @classmethod
+    def from_list_results(cls, results: List[Dict]) -> "SearchIndex":
+        """Build an index from the "results" of a list response."""
+        return cls(PokemonListItem.from_api(p) for p in results)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def get(self, pokemon_id: int):
+        """Return the item with this ID, or None."""
+        return self._by_id.get(pokemon_id)
+
+    def prefix_matches(self, prefix: str) -> List[int]:
+        """Return positions of names starting with prefix, exact match first, then dex order."""
+        start = bisect_left(self._sorted_names, prefix)
+        end = bisect_left(self._sorted_names, prefix + "\uffff", start)
+        positions = [position for _, position in self._names[start:end]]
+        return sorted(positions, key=lambda p: (len(self.items[p].name) != len(prefix), p))
+
+    def substring_matches(self, query: str) -> List[int]:
+        """Return positions of names containing query, in dex order."""
+        if len(query) <= NGRAM_SIZE:
+            return sorted(self._postings.get(query, ()))
+
+        grams = sorted(_ngrams(query, NGRAM_SIZE), key=lambda g: len(self._postings.get(g, ())))
+        candidates = set(self._postings.get(grams[0], ()))
+        for gram in grams[1:]:
+            if not candidates:
+                break
+            candidates &= self._postings.get(gram, set())
+        return sorted(p for p in candidates if query in self._lower_names[p])
+
+    def fuzzy_matches(self, query: str) -> List[int]:
+        """
+        Return positions of names within a few typos of query, best first.
+
+        Candidates are pre-filtered by shared bigrams (a string within k
+        edits of the query shares at least len(bigrams) - 2k of them) and
+        at most FUZZY_MAX_CANDIDATES of them, those sharing the most, are
+        scored with a bounded prefix edit distance. This keeps the cost of a
+        query flat however large the index grows.
+        """
+        if len(query) < FUZZY_MIN_LENGTH:
+            return []
+
+        max_distance = max_typos(query)
+        grams = _ngrams(query, 2)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self._postings.get(gram, ()))
+        threshold = max(1, len(grams) - 2 * max_distance)
+
+        candidates = [(count, position) for position, count in shared.items() if count >= threshold]
+        if len(candidates) > FUZZY_MAX_CANDIDATES:
+            candidates = heapq.nlargest(FUZZY_MAX_CANDIDATES, candidates)
+
+        masks, length, window = _pattern_masks(query), len(query), len(query) + max_distance
+        scored = []
+        for _, position in candidates:
+            distance = _prefix_distance(masks, length, self._lower_names[position][:window])
+            if distance <= max_distance:
+                scored.append((distance, position))
+
+        return [position for _, position in sorted(scored)]
+
+    def search(self, query: str, limit: int = 10) -> List[PokemonListItem]:
+        """
+        Find pokemon by number or name.
+
+        Numeric queries match the ID exactly. Name queries return prefix
+        matches first, then other names containing the query, then names
+        within a few typos of it (closest first).
+        """
+        query = query.strip().lower()
+        if not query:
+            return []
+
+        if query.isdigit():
+            item = self._by_id.get(int(query))
+            return [item] if item else []
+
+        ranked = self.prefix_matches(query)
+        seen = set(ranked)
+        for matcher in (self.substring_matches, self.fuzzy_matches):
+            if len(ranked) >= limit:
+                break
+            for position in matcher(query):
+                if position not in seen:
+                    ranked.append(position)
+                    seen.add(position)
+        return [self.items[p] for p in ranked[:limit]]
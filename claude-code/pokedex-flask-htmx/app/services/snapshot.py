@@ -0,0 +1,127 @@
+import json
+import os
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+SNAPSHOT_VERSION = 1
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot cannot be built or loaded."""
+
+
+def slim_detail(data: Dict) -> Dict:
+    """
+    Keep only the parts of a PokeAPI detail document the app renders.
+
+    The result has the same shape as the upstream payload, so
+    Pokemon.from_api accepts it unchanged, and slimming is idempotent.
+    The service caches this projection instead of the full document
+    (moves, game indices and sprite variants are over 99% of it).
+    """
+    sprites = data.get("sprites") or {}
+    artwork = (sprites.get("other") or {}).get("official-artwork") or {}
+    return {
+        "id": data["id"],
+        "name": data["name"],
+        "height": data.get("height"),
+        "weight": data.get("weight"),
+        "types": [{"slot": t.get("slot"), "type": {"name": t["type"]["name"]}} for t in data.get("types", [])],
+        "stats": [{"base_stat": s["base_stat"], "stat": {"name": s["stat"]["name"]}} for s in data.get("stats", [])],
+        "abilities": [{"ability": {"name": a["ability"]["name"]}} for a in data.get("abilities", [])],
+        "sprites": {
+            "front_default": sprites.get("front_default"),
+            "other": {"official-artwork": {"front_default": artwork.get("front_default")}},
+        },
+    }
+
+
+def build_snapshot(service, limit: int = 151) -> Dict:
+    """
+    Fetch the list and every detail record from the upstream.
+
+    Details are fetched in parallel with get_pokemon_details_many, as
+    wide as the service's connection pool.
+
+    Args:
+        service: PokeAPIService used for the fetches
+        limit: Number of pokemon to include (151 for Gen 1)
+
+    Returns:
+        Snapshot document ready for save_snapshot
+    """
+    listing = service.get_pokemon_list(limit=limit, offset=0)
+    if not listing or "results" not in listing:
+        raise SnapshotError("Could not fetch the pokemon list")
+
+    results = listing["results"]
+    names = [entry["name"] for entry in results]
+    details = service.get_pokemon_details_many(names)
+    missing = [name for name, detail in zip(names, details) if not detail]
+    if missing:
+        raise SnapshotError(f"Could not fetch details for {', '.join(missing)}")
+    pokemon = [slim_detail(detail) for detail in details]
+
+    return {
+        "version": SNAPSHOT_VERSION,
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "source": service.base_url,
+        "count": len(results),
+        "results": results,
+        "pokemon": pokemon,
+        "index": _build_index(pokemon),
+    }
+
+
+def _build_index(pokemon: List[Dict]) -> Dict[str, int]:
+    """Map names and IDs to positions in the pokemon array."""
+    index = {}
+    for position, record in enumerate(pokemon):
+        index[record["name"]] = position
+        index[str(record["id"])] = position
+    return index
+
+
+def save_snapshot(snapshot: Dict, path: str) -> None:
+    """Write a snapshot atomically as compact JSON."""
+    directory = os.path.dirname(str(path))
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(snapshot, f, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+class Snapshot:
+    """Read-only, fully in-memory view of a saved snapshot."""
+
+    def __init__(self, data: Dict):
+        if data.get("version") != SNAPSHOT_VERSION:
+            raise SnapshotError(f"Unsupported snapshot version: {data.get('version')!r}")
+        self.generated_at = data["generated_at"]
+        self.source = data["source"]
+        self.results = data["results"]
+        self.pokemon = data["pokemon"]
+        self.index = data.get("index") or _build_index(self.pokemon)
+
+    @classmethod
+    def load(cls, path: str) -> "Snapshot":
+        """Load a snapshot file written by save_snapshot."""
+        try:
+            with open(path, encoding="utf-8") as f:
+                return cls(json.load(f))
+        except (OSError, ValueError) as e:
+            raise SnapshotError(f"Could not load snapshot {path}: {e}") from e
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    def get_pokemon_list(self, limit: int = 151, offset: int = 0) -> Dict:
+        """Return a page of the list in the PokeAPI response shape."""
+        return {"count": len(self.results), "results": self.results[offset : offset + limit]}
+
+    def get_pokemon_detail(self, name_or_id) -> Optional[Dict]:
+        """Return the detail record for a name or ID, or None."""
+        position = self.index.get(str(name_or_id).strip().lower())
+        return self.pokemon[position] if position is not None else None
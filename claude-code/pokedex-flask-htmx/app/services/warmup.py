@@ -0,0 +1,152 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WarmupReport:
+    """Outcome of one warm-up run."""
+
+    duration: float = 0.0
+    fetched: int = 0
+    failed: int = 0
+    failures: List[str] = field(default_factory=list)
+
+    def __str__(self) -> str:
+        return f"Warmed {self.fetched} documents in {self.duration:.2f}s ({self.failed} failed)"
+
+
+def warm_cache(service, limit: int = 151, page_size: Optional[int] = None, concurrency: int = 10) -> WarmupReport:
+    """
+    Fetch everything the pages need into the service's cache.
+
+    Refreshes the full list, each list page and every detail record from
+    the upstream (bypassing fresh cache entries, so a scheduled run also
+    pushes expiry back), then builds the search index. Details are fetched
+    on their own pool of `concurrency` threads. Failed fetches leave any
+    existing cache entry untouched.
+
+    Args:
+        service: PokeAPIService whose cache is filled
+        limit: Number of pokemon to warm (default 151 for Gen 1)
+        page_size: Size of the /pokemon list pages, to warm them as well
+        concurrency: Maximum simultaneous upstream requests
+
+    Returns:
+        WarmupReport with duration and fetched/failed counts
+    """
+    report = WarmupReport()
+    if service.snapshot is not None or service.cache is None:
+        # Nothing to warm: answers come from local data or are never cached
+        return report
+
+    started = time.perf_counter()
+
+    def record(label: str, data) -> None:
+        if data is None:
+            report.failed += 1
+            report.failures.append(label)
+        else:
+            report.fetched += 1
+
+    listing = service.get_pokemon_list(limit=limit, refresh=True)
+    record(f"list?limit={limit}", listing)
+
+    if page_size:
+        for offset in range(0, limit, page_size):
+            page_limit = min(page_size, limit - offset)
+            if (page_limit, offset) != (limit, 0):
+                page = service.get_pokemon_list(limit=page_limit, offset=offset, refresh=True)
+                record(f"list?limit={page_limit}&offset={offset}", page)
+
+    if listing is not None:
+        names = [item["name"] for item in listing.get("results", [])]
+        with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="pokeapi-warm") as executor:
+            details = executor.map(lambda name: service.get_pokemon_detail(name, refresh=True), names)
+            for name, detail in zip(names, details):
+                record(name, detail)
+        service.get_search_index(limit=limit)
+
+    report.duration = time.perf_counter() - started
+    return report
+
+
+def warm_app(app) -> WarmupReport:
+    """Warm the app's PokeAPI service using its configuration and log the result."""
+    config = app.config
+    report = warm_cache(
+        app.extensions["pokeapi"],
+        limit=config["POKEDEX_SIZE"],
+        page_size=config["POKEDEX_PAGE_SIZE"],
+        concurrency=config["CACHE_WARM_CONCURRENCY"],
+    )
+    app.logger.info("%s", report)
+    if report.failures:
+        app.logger.warning("Warm-up failed for: %s", ", ".join(report.failures[:20]))
+    return report
+
+
+class CacheWarmer:
+    """
+    Background thread that re-warms the cache every `interval` seconds.
+
+    Set the interval below CACHE_TIMEOUT so entries are refreshed before
+    they expire and visitors never wait on the upstream.
+    """
+
+    def __init__(self, app, interval: float):
+        """
+        Initialize the warmer (call start() to run it).
+
+        Args:
+            app: Flask application whose service is warmed
+            interval: Seconds between the end of one run and the next
+        """
+        self.app = app
+        self.interval = interval
+        self.runs = 0
+        self.last_report: Optional[WarmupReport] = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        """Start the background thread."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="pokeapi-warmer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Ask the thread to exit and wait for it."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.last_report = warm_app(self.app)
+            except Exception:  # keep the schedule alive whatever goes wrong
+                logger.exception("Scheduled cache warm-up failed")
+            self.runs += 1
+
+
+def start_cache_warmer(app) -> Optional[CacheWarmer]:
+    """
+    Start re-warming every CACHE_WARM_INTERVAL seconds, if one is set.
+
+    create_app never does this, so CLI commands do not start a schedule.
+    Call it once in the process whose cache it should keep warm. For the
+    memory backend, that is each gunicorn worker or the dev server. For
+    disk and redis, which the workers share, it is the gunicorn master.
+    """
+    if app.config["CACHE_WARM_INTERVAL"] <= 0:
+        return None
+    warmer = CacheWarmer(app, app.config["CACHE_WARM_INTERVAL"])
+    warmer.start()
+    app.extensions["cache_warmer"] = warmer
+    return warmer
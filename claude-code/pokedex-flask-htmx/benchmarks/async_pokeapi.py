@@ -0,0 +1,164 @@
+import asyncio
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+import httpx
+
+from app.services import jsoncodec
+from app.services.cache import CacheBackend
+from app.services.pokeapi import cache_key
+from app.services.snapshot import slim_detail
+
+
+class AsyncPokeAPIService:
+    """
+    Asynchronous PokeAPI client for bulk fetches.
+
+    Mirrors PokeAPIService (same methods, same cache keys and entry format)
+    so both can share one cache backend, and adds get_pokemon_details_many
+    to fetch many records in parallel over one pooled connection set.
+
+    Only bench_async.py uses it, to compare against PokeAPIService; the
+    app, warm-up and snapshot builds go through PokeAPIService. It has no
+    circuit breaker or retry budget, and its cache reads and writes block
+    the event loop, so it is not suited to serving requests.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        max_connections: int = 20,
+        timeout: float = 10,
+        cache: Optional[CacheBackend] = None,
+        cache_timeout: float = 3600,
+        max_stale: float = 0,
+    ):
+        """
+        Initialize the client.
+
+        Args:
+            base_url: PokeAPI base URL
+            max_connections: Size of the HTTP connection pool
+            timeout: Per-request timeout in seconds
+            cache: Cache backend shared with the sync service (optional)
+            cache_timeout: Seconds a cached entry counts as fresh
+            max_stale: Seconds past freshness an entry may be returned if the upstream fails
+        """
+        self.base_url = base_url.rstrip("/")
+        self.cache = cache
+        self.cache_timeout = cache_timeout
+        self.max_stale = max_stale
+        self.client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            timeout=httpx.Timeout(timeout),
+        )
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    @classmethod
+    def for_service(cls, service, **kwargs) -> "AsyncPokeAPIService":
+        """Create a client that talks to the same upstream and cache as a PokeAPIService."""
+        kwargs.setdefault("timeout", service.timeout)
+        return cls(
+            service.base_url,
+            cache=service.cache,
+            cache_timeout=service.cache_timeout,
+            max_stale=service.max_stale,
+            **kwargs,
+        )
+
+    async def aclose(self) -> None:
+        """Close pooled connections."""
+        await self.client.aclose()
+
+    async def __aenter__(self) -> "AsyncPokeAPIService":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+    async def _get_json(
+        self, url: str, params: Optional[Dict] = None, project: Optional[Callable[[Dict], Dict]] = None
+    ) -> Optional[Dict]:
+        """GET a JSON document, using the shared cache and coalescing duplicate requests."""
+        key = cache_key(url, params)
+        entry = self.cache.get(key) if self.cache is not None else None
+        if entry is not None and time.time() - entry["fetched_at"] < self.cache_timeout:
+            return entry["data"]
+
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._fetch(key, url, params, project))
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        data = await asyncio.shield(future)
+
+        if data is None and entry is not None:
+            # Upstream failed: fall back to a stale copy within the window
+            if time.time() - entry["fetched_at"] < self.cache_timeout + self.max_stale:
+                return entry["data"]
+        return data
+
+    async def _fetch(
+        self, key: str, url: str, params: Optional[Dict] = None, project: Optional[Callable[[Dict], Dict]] = None
+    ) -> Optional[Dict]:
+        """Request a document from the upstream and cache it (projected, if asked) on success."""
+        try:
+            response = await self.client.get(url, params=params)
+
+            if response.status_code == 200:
+                data = jsoncodec.loads(response.content)
+                if project is not None:
+                    data = project(data)
+                if self.cache is not None:
+                    self.cache.set(key, {"fetched_at": time.time(), "data": data})
+                return data
+            return None
+        except (httpx.HTTPError, ValueError):
+            return None
+
+    async def get_pokemon_list(self, limit: int = 151, offset: int = 0) -> Optional[Dict]:
+        """
+        Fetch a list of pokemon.
+
+        Args:
+            limit: Number of pokemon to fetch (default 151 for Gen 1)
+            offset: Offset for pagination
+
+        Returns:
+            Dictionary with pokemon list or None on error
+        """
+        url = f"{self.base_url}/pokemon"
+        return await self._get_json(url, params={"limit": int(limit), "offset": int(offset)})
+
+    async def get_pokemon_detail(self, name_or_id: str) -> Optional[Dict]:
+        """
+        Fetch detailed information for a specific pokemon.
+
+        Args:
+            name_or_id: Pokemon name or ID
+
+        Returns:
+            Detail dictionary reduced to the rendered fields (see slim_detail),
+            or None if not found
+        """
+        url = f"{self.base_url}/pokemon/{str(name_or_id).strip().lower()}"
+        return await self._get_json(url, project=slim_detail)
+
+    async def get_pokemon_details_many(self, names: Iterable, concurrency: int = 10) -> List[Optional[Dict]]:
+        """
+        Fetch detailed information for many pokemon in parallel.
+
+        Args:
+            names: Pokemon names or IDs
+            concurrency: Maximum number of requests in flight at once
+
+        Returns:
+            Detail dictionaries in the same order as names, None for failures
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(name):
+            async with semaphore:
+                return await self.get_pokemon_detail(name)
+
+        return await asyncio.gather(*(fetch(name) for name in names))
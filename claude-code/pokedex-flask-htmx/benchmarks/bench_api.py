@@ -0,0 +1,45 @@
+"""
+Fetching the whole dex through the JSON API: one request per pokemon vs batch vs NDJSON.
+
+Runs against a warm cache through the test client, so the difference is
+per-request overhead and bytes on the wire.
+
+Run from the project root:
+    python -m benchmarks.bench_api
+"""
+import time
+
+from app import create_app
+from benchmarks.stub_pokeapi import StubPokeAPI
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - start) * 1000, result
+
+
+def main():
+    with StubPokeAPI() as stub:
+        app = create_app({"TESTING": False, "POKEAPI_BASE_URL": stub.base_url, "PAGE_CACHE_ENABLED": False})
+        client = app.test_client()
+        ids = ",".join(str(i) for i in range(1, 152))
+        client.get("/api/v1/pokemon.ndjson").get_data()  # warm the response cache
+
+        for encoding in ("identity", "gzip", "br"):
+            headers = {"Accept-Encoding": encoding}
+            single_ms, sizes = timed(
+                lambda: [len(client.get(f"/api/v1/pokemon/{i}", headers=headers).data) for i in range(1, 152)]
+            )
+            batch_ms, batch = timed(lambda: client.get(f"/api/v1/pokemon?ids={ids}", headers=headers))
+            stream_ms, stream = timed(lambda: client.get("/api/v1/pokemon.ndjson", headers=headers).get_data())
+
+            print(f"\n{encoding}")
+            print(f"  151 single requests {single_ms:8.1f} ms  {sum(sizes) / 1024:7.1f} KiB")
+            print(f"  1 batch request     {batch_ms:8.1f} ms  {len(batch.data) / 1024:7.1f} KiB")
+            print(f"  NDJSON stream       {stream_ms:8.1f} ms  {len(stream) / 1024:7.1f} KiB")
+        app.extensions["pokeapi"].close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Fetch all Gen 1 details: sync PokeAPIService (serial) vs AsyncPokeAPIService.
+
+The stub server adds artificial latency per request, so the serial client
+pays it 151 times while the async one overlaps up to `concurrency` requests.
+
+Run from the project root:
+    python -m benchmarks.bench_async [--latency 0.05]
+"""
+import argparse
+import asyncio
+import time
+
+from app.services.pokeapi import PokeAPIService
+from benchmarks.async_pokeapi import AsyncPokeAPIService
+from benchmarks.stub_pokeapi import StubPokeAPI
+
+COUNT = 151
+
+
+def run_sync(base_url):
+    service = PokeAPIService(base_url, cache_timeout=0)
+    details = [service.get_pokemon_detail(i) for i in range(1, COUNT + 1)]
+    service.close()
+    return details
+
+
+async def run_async(base_url, concurrency):
+    async with AsyncPokeAPIService(base_url, max_connections=concurrency) as service:
+        return await service.get_pokemon_details_many(range(1, COUNT + 1), concurrency=concurrency)
+
+
+def report(label, stub, fn):
+    stub.reset()
+    start = time.perf_counter()
+    details = fn()
+    elapsed = time.perf_counter() - start
+    ok = sum(d is not None for d in details)
+    print(f"{label:<22} {elapsed:6.2f}s  {ok}/{COUNT} ok  {stub.connections:>3} connections  peak {stub.peak_active}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--latency", type=float, default=0.05, help="stub upstream latency in seconds")
+    args = parser.parse_args()
+
+    with StubPokeAPI(latency=args.latency) as stub:
+        report("sync serial", stub, lambda: run_sync(stub.base_url))
+        for concurrency in (5, 10, 20, 50):
+            report(f"async concurrency={concurrency}", stub, lambda: asyncio.run(run_async(stub.base_url, concurrency)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Request latency with and without the PokeAPI response cache.
+
+The stub server adds artificial latency to stand in for pokeapi.co; the
+cached run pays it once per distinct URL and serves the rest from memory.
+
+Run from the project root:
+    python -m benchmarks.bench_cache [--latency 0.1] [--requests 300]
+"""
+import argparse
+import statistics
+import time
+
+from app.services.pokeapi import PokeAPIService
+from benchmarks.stub_pokeapi import StubPokeAPI
+
+
+def measure(service, requests, distinct):
+    timings = []
+    for i in range(requests):
+        start = time.perf_counter()
+        service.get_pokemon_detail(i % distinct + 1)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def report(label, timings, hits):
+    timings = sorted(timings)
+    p50 = statistics.median(timings) * 1000
+    p95 = timings[int(len(timings) * 0.95) - 1] * 1000
+    print(f"{label:<10} p50 {p50:9.3f} ms   p95 {p95:9.3f} ms   upstream hits {hits}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--latency", type=float, default=0.1, help="stub upstream latency in seconds")
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--distinct", type=int, default=20, help="distinct pokemon requested")
+    args = parser.parse_args()
+
+    with StubPokeAPI(latency=args.latency) as stub:
+        for label, cache_timeout in (("uncached", 0), ("cached", 3600)):
+            stub.reset()
+            service = PokeAPIService(stub.base_url, cache_timeout=cache_timeout)
+            timings = measure(service, args.requests, args.distinct)
+            report(label, timings, stub.total_hits)
+            service.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""
+Count upstream TCP handshakes per 1,000 requests.
+
+Compares building a PokeAPIService per request (the old behaviour of
+get_pokeapi_service) with the shared, pooled instance created in create_app.
+
+Run from the project root:
+    python -m benchmarks.bench_connection_pool
+"""
+import time
+
+from app.services.pokeapi import PokeAPIService
+from benchmarks.stub_pokeapi import StubPokeAPI
+
+REQUESTS = 1000
+
+
+def run(label, stub, get_service):
+    stub.reset()
+    start = time.perf_counter()
+    for i in range(REQUESTS):
+        get_service().get_pokemon_detail(i % 151 + 1)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<22} {stub.connections:>6} handshakes  {elapsed:6.2f}s  ({REQUESTS / elapsed:,.0f} req/s)")
+
+
+def main():
+    with StubPokeAPI() as stub:
+        shared = PokeAPIService(stub.base_url)
+        print(f"{REQUESTS} detail requests against {stub.base_url}")
+        run("service per request", stub, lambda: PokeAPIService(stub.base_url))
+        run("shared pooled service", stub, lambda: shared)
+        shared.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+/pokemon render time with and without the fragment cache.
+
+Renders a single 151-card page (POKEDEX_PAGE_SIZE=151) from a warm
+response cache with the page cache off, so every request renders and the
+timing is template work only.
+
+Run from the project root:
+    python -m benchmarks.bench_fragment_cache [--requests 200]
+"""
+import argparse
+import statistics
+import time
+
+from app import create_app
+from benchmarks.stub_pokeapi import StubPokeAPI
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    with StubPokeAPI() as stub:
+        for label, maxsize in (("no fragment cache", 0), ("fragment cache", 4096)):
+            for enriched in (False, True):
+                app = create_app(
+                    {
+                        "TESTING": False,
+                        "POKEAPI_BASE_URL": stub.base_url,
+                        "POKEDEX_PAGE_SIZE": 151,
+                        "POKEDEX_ENRICHED_LIST": enriched,
+                        "FRAGMENT_CACHE_MAXSIZE": maxsize,
+                        "PAGE_CACHE_ENABLED": False,
+                    }
+                )
+                client = app.test_client()
+                client.get("/pokemon")  # warm the response and fragment caches
+
+                timings = []
+                for _ in range(args.requests):
+                    start = time.perf_counter()
+                    client.get("/pokemon")
+                    timings.append(time.perf_counter() - start)
+
+                mode = "enriched" if enriched else "plain"
+                print(f"{label:<18} {mode:<9} p50 {statistics.median(timings) * 1000:6.2f} ms")
+                app.extensions["pokeapi"].close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Worst-case search latency on a national-dex sized index (~1,000 names).
+
+Every query must stay under the 1 ms budget, including misspellings that
+fall through to fuzzy matching. Each query is timed as the best of
+REPEAT runs, as timeit recommends, so scheduler noise does not count.
+
+Run from the project root:
+    python -m benchmarks.bench_fuzzy_search
+"""
+import random
+import time
+
+from app.services.search import SearchIndex
+from benchmarks.stub_pokeapi import GEN1_NAMES
+
+BUDGET_MS = 1.0
+REPEAT = 5
+DEX_SIZE = 1025
+
+
+def national_dex_names(seed=0):
+    """Gen 1 names plus plausible made-up names stitched from their syllables."""
+    rng = random.Random(seed)
+    names = list(GEN1_NAMES)
+    seen = set(names)
+    while len(names) < DEX_SIZE:
+        a, b = rng.sample(GEN1_NAMES, 2)
+        name = a[: rng.randint(3, 5)] + b[-rng.randint(3, 5) :]
+        if name not in seen:
+            seen.add(name)
+            names.append(name)
+    return names
+
+
+def typo(word, rng):
+    i = rng.randrange(len(word))
+    op = rng.choice("dis")
+    if op == "d":
+        return word[:i] + word[i + 1 :]
+    letter = rng.choice("abcdefghijklmnopqrstuvwxyz")
+    if op == "i":
+        return word[:i] + letter + word[i:]
+    return word[:i] + letter + word[i + 1 :]
+
+
+def main():
+    rng = random.Random(1)
+    names = national_dex_names()
+    index = SearchIndex.from_list_results(
+        [{"name": name, "url": f"https://pokeapi.co/api/v2/pokemon/{i}/"} for i, name in enumerate(names, 1)]
+    )
+
+    queries = ["pikachuu", "charzard", "gyrados", "snorlx", "jigglypuf", "bulbasuar", "xyzzyq", "mewtoo"]
+    queries += [typo(rng.choice(names), rng) for _ in range(500)]
+    queries += [name[:n] for name in rng.sample(names, 100) for n in range(1, len(name) + 1)]
+
+    timings = []
+    for query in queries:
+        runs = []
+        for _ in range(REPEAT):
+            start = time.perf_counter()
+            index.search(query)
+            runs.append(time.perf_counter() - start)
+        timings.append(min(runs) * 1000)
+
+    timings.sort()
+    p50 = timings[len(timings) // 2]
+    p99 = timings[int(len(timings) * 0.99)]
+    worst = timings[-1]
+    print(f"{len(names)} names, {len(queries)} queries")
+    print(f"p50 {p50:.3f} ms   p99 {p99:.3f} ms   max {worst:.3f} ms   budget {BUDGET_MS} ms")
+    if worst > BUDGET_MS:
+        raise SystemExit("over budget")
+
+
+if __name__ == "__main__":
+    main()
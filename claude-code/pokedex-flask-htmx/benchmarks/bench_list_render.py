@@ -0,0 +1,58 @@
+"""
+/pokemon response time: plain vs enriched list, cold and warm cache.
+
+Cold requests pay the (stub) upstream latency; warm ones show the render
+cost alone (the page cache is off, so every request renders). The enriched list fetches details in parallel, at most once
+per pokemon per cache lifetime.
+
+Run from the project root:
+    python -m benchmarks.bench_list_render [--latency 0.05] [--requests 50]
+"""
+import argparse
+import statistics
+import time
+
+from app import create_app
+from benchmarks.stub_pokeapi import StubPokeAPI
+
+
+def timed_get(client, path):
+    start = time.perf_counter()
+    response = client.get(path)
+    assert response.status_code == 200
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--latency", type=float, default=0.05, help="stub upstream latency in seconds")
+    parser.add_argument("--requests", type=int, default=50, help="warm requests to time")
+    args = parser.parse_args()
+
+    with StubPokeAPI(latency=args.latency) as stub:
+        for enriched in (False, True):
+            stub.reset()
+            app = create_app(
+                {
+                    "TESTING": False,
+                    "POKEAPI_BASE_URL": stub.base_url,
+                    "POKEDEX_ENRICHED_LIST": enriched,
+                    "PAGE_CACHE_ENABLED": False,
+                }
+            )
+            client = app.test_client()
+
+            cold = timed_get(client, "/pokemon")
+            upstream = stub.total_hits
+            warm = [timed_get(client, "/pokemon") for _ in range(args.requests)]
+            label = "enriched" if enriched else "plain"
+            print(
+                f"{label:<9} cold {cold * 1000:8.1f} ms ({upstream} upstream calls)   "
+                f"warm p50 {statistics.median(warm) * 1000:6.2f} ms   "
+                f"upstream calls after warm-up {stub.total_hits - upstream}"
+            )
+            app.extensions["pokeapi"].close()
+
+
+if __name__ == "__main__":
+    main()
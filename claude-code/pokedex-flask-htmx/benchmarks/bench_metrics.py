@@ -0,0 +1,141 @@
+"""
+Per-request cost of the metrics instrumentation.
+
+Times each piece of instrumentation a request can pay for against the
+uninstrumented version: the WSGI middleware (request timer, in-flight
+gauge, latency histogram and status counter) around a no-op app, the
+render timer around a trivial template, the model build timer and one
+upstream attempt record. Each pair is timed in alternating runs so
+machine drift hits both sides alike, with the garbage collector off as
+timeit does. The instrumented runs include folding their queued
+observations into the metrics, which a scrape would otherwise pay for.
+Also compares end-to-end cached page throughput with METRICS_ENABLED on
+and off. Exits non-zero if the sum,
+i.e. what a rendered page that fetched once pays, is over the 5 µs budget.
+
+Run from the project root:
+    python -m benchmarks.bench_metrics [--iterations 50000]
+"""
+import argparse
+import gc
+import sys
+import time
+
+from jinja2 import Template
+from werkzeug.test import EnvironBuilder
+
+from app import create_app, metrics
+from benchmarks.stub_pokeapi import StubPokeAPI
+
+BUDGET_US = 5.0
+
+
+def per_call(fn, iterations, then=None):
+    """Average microseconds per call over one run; then() runs inside the timing."""
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        if then is not None:
+            then()
+        return (time.perf_counter() - start) / iterations * 1e6
+    finally:
+        gc.enable()
+
+
+def best_per_call(fn, iterations, repeat=5):
+    """Best average microseconds per call over `repeat` runs."""
+    return min(per_call(fn, iterations) for _ in range(repeat))
+
+
+def overhead_us(bare, instrumented, iterations, repeat=15):
+    """Best per-call cost of instrumented() over bare(), timing the two in alternation."""
+    bare_best = instrumented_best = float("inf")
+    for _ in range(repeat):
+        bare_best = min(bare_best, per_call(bare, iterations))
+        instrumented_best = min(instrumented_best, per_call(instrumented, iterations, then=metrics._fold_pending))
+    return instrumented_best - bare_best
+
+
+def page_rate(app, path, seconds=2.0):
+    """Cached page requests per second through the raw WSGI app."""
+    environ = EnvironBuilder(path=path).get_environ()
+
+    def start_response(status, headers):
+        pass
+
+    for _ in range(100):
+        b"".join(app.wsgi_app(dict(environ), start_response))
+    count = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        b"".join(app.wsgi_app(dict(environ), start_response))
+        count += 1
+    return count / seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=50000)
+    args = parser.parse_args()
+
+    with StubPokeAPI() as stub:
+        app = create_app({"TESTING": True, "POKEAPI_BASE_URL": stub.base_url, "METRICS_ENABLED": True})
+        environ = EnvironBuilder(path="/pokemon").get_environ()
+        environ["werkzeug.request"] = app.request_class(environ)
+
+        def bare_app(environ, start_response):
+            start_response("200 OK", [])
+            return [b"ok"]
+
+        def start_response(status, headers, exc_info=None):
+            pass
+
+        instrumented = metrics.MetricsMiddleware(bare_app)
+        plain_template = Template("{{ x }}")
+        timed_template = metrics.TimedTemplate("{{ x }}")
+
+        def build():
+            return None
+
+        def timed_build():
+            return metrics.timed(metrics.MODEL_BUILD_LATENCY, "Pokemon", build)
+
+        def upstream():
+            metrics.record_upstream("/pokemon/{name}", "200", 0.01)
+
+        costs = {
+            "request middleware": overhead_us(
+                lambda: bare_app(environ, start_response),
+                lambda: instrumented(environ, start_response),
+                args.iterations,
+            ),
+            "render timer": overhead_us(
+                lambda: plain_template.render(x=1), lambda: timed_template.render(x=1), args.iterations
+            ),
+            "model build timer": overhead_us(build, timed_build, args.iterations),
+            "upstream attempt": overhead_us(build, upstream, args.iterations),
+        }
+        total_us = sum(costs.values())
+        for label, cost in costs.items():
+            print(f"{label:<20} {cost:6.2f} µs")
+        print(f"{'total per request':<20} {total_us:6.2f} µs (budget {BUDGET_US:.0f} µs)")
+
+        plain = create_app({"TESTING": True, "POKEAPI_BASE_URL": stub.base_url, "METRICS_ENABLED": False})
+        # Alternate and keep the best of each, to damp machine noise
+        with_metrics = without = 0.0
+        for _ in range(5):
+            without = max(without, page_rate(plain, "/pokemon", seconds=1.0))
+            with_metrics = max(with_metrics, page_rate(app, "/pokemon", seconds=1.0))
+        print(
+            f"\ncached /pokemon      {without:8.0f} req/s without metrics, {with_metrics:8.0f} req/s with"
+            f" ({(1 / with_metrics - 1 / without) * 1e6:+.1f} µs/request)"
+        )
+
+    if total_us > BUDGET_US:
+        sys.exit(f"instrumentation over budget: {total_us:.2f} µs > {BUDGET_US:.0f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Memory held by 10,000 cached Pokemon / PokemonListItem models, before and after.
+
+"Before" is the original plain-dataclass models (per-instance __dict__,
+fresh lists and a stats dict), reproduced below. Each model is built from
+its own JSON-decoded payload, as when documents come out of a disk or Redis
+cache, so nothing is shared by accident. Only the models are kept alive.
+
+Run from the project root:
+    python -m benchmarks.bench_model_memory [--count 10000]
+"""
+import argparse
+import gc
+import json
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from app.models.pokemon import Pokemon, PokemonListItem
+from benchmarks.stub_pokeapi import detail_payload, pokemon_name
+
+
+@dataclass
+class LegacyPokemonListItem:
+    id: int
+    name: str
+    display_name: str
+    types: List[str] = field(default_factory=list)
+    base_stat_total: Optional[int] = None
+
+    @classmethod
+    def from_api(cls, data: Dict) -> "LegacyPokemonListItem":
+        pokemon_id = int(data["url"].rstrip("/").split("/")[-1])
+        return cls(id=pokemon_id, name=data["name"], display_name=data["name"].capitalize())
+
+    @classmethod
+    def from_detail(cls, data: Dict) -> "LegacyPokemonListItem":
+        return cls(
+            id=data["id"],
+            name=data["name"],
+            display_name=data["name"].capitalize(),
+            types=[t["type"]["name"].capitalize() for t in data["types"]],
+            base_stat_total=sum(stat["base_stat"] for stat in data["stats"]),
+        )
+
+
+@dataclass
+class LegacyPokemon:
+    id: int
+    name: str
+    display_name: str
+    height_m: float
+    weight_kg: float
+    types: List[str]
+    stats: Dict[str, int]
+    abilities: List[str]
+    sprite_url: Optional[str]
+    artwork_url: Optional[str]
+
+    @classmethod
+    def from_api(cls, data: Dict) -> "LegacyPokemon":
+        sprites = data.get("sprites", {})
+        return cls(
+            id=data["id"],
+            name=data["name"],
+            display_name=data["name"].capitalize(),
+            height_m=data["height"] / 10,
+            weight_kg=data["weight"] / 10,
+            types=[t["type"]["name"].capitalize() for t in data["types"]],
+            stats={stat["stat"]["name"]: stat["base_stat"] for stat in data["stats"]},
+            abilities=[a["ability"]["name"].capitalize().replace("-", " ") for a in data["abilities"]],
+            sprite_url=sprites.get("front_default"),
+            artwork_url=sprites.get("other", {}).get("official-artwork", {}).get("front_default"),
+        )
+
+
+def measure(build, payloads):
+    """Return bytes still allocated after building one model per payload."""
+    gc.collect()
+    tracemalloc.start()
+    models = []
+    for payload in payloads:
+        models.append(build(json.loads(payload)))
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del models
+    return current
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=10000)
+    args = parser.parse_args()
+
+    details = [json.dumps(detail_payload(i % 151 + 1)) for i in range(args.count)]
+    listings = [
+        json.dumps({"name": pokemon_name(i % 151 + 1), "url": f"https://pokeapi.co/api/v2/pokemon/{i % 151 + 1}/"})
+        for i in range(args.count)
+    ]
+    cases = (
+        ("Pokemon", details, LegacyPokemon.from_api, Pokemon.from_api),
+        ("PokemonListItem (enriched)", details, LegacyPokemonListItem.from_detail, PokemonListItem.from_detail),
+        ("PokemonListItem (plain)", listings, LegacyPokemonListItem.from_api, PokemonListItem.from_api),
+    )
+
+    print(f"{args.count} models")
+    for label, payloads, legacy, compact in cases:
+        before = measure(legacy, payloads)
+        after = measure(compact, payloads)
+        print(
+            f"  {label:<28} before {before / 1024:7.0f} KiB ({before / args.count:5.0f} B each)"
+            f"   after {after / 1024:7.0f} KiB ({after / args.count:5.0f} B each)   {before / after:4.1f}x smaller"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Requests per second for cached pages, with and without the page cache.
+
+Calls the WSGI app directly (no test client, no sockets) in a single
+thread, so the figure approximates one worker's throughput.
+
+Run from the project root:
+    python -m benchmarks.bench_page_cache [--seconds 3]
+"""
+import argparse
+import time
+
+from werkzeug.test import EnvironBuilder
+
+from app import create_app
+from benchmarks.stub_pokeapi import StubPokeAPI
+
+PATHS = ["/", "/pokemon", "/pokemon/pikachu", "/search?q=char"]
+
+
+def start_response(status, headers, exc_info=None):
+    pass
+
+
+def call(app, environ):
+    body = app.wsgi_app(dict(environ), start_response)
+    b"".join(body)
+    if hasattr(body, "close"):
+        body.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args()
+
+    with StubPokeAPI() as stub:
+        for label, enabled in (("no page cache", False), ("page cache", True)):
+            app = create_app({"TESTING": False, "POKEAPI_BASE_URL": stub.base_url, "PAGE_CACHE_ENABLED": enabled})
+            for path in PATHS:
+                environ = EnvironBuilder(path=path).get_environ()
+                call(app, environ)  # warm the response, fragment and page caches
+
+                count = 0
+                deadline = time.perf_counter() + args.seconds / len(PATHS)
+                start = time.perf_counter()
+                while time.perf_counter() < deadline:
+                    call(app, environ)
+                    count += 1
+                rate = count / (time.perf_counter() - start)
+                print(f"{label:<14} {path:<18} {rate:8.0f} req/s")
+            app.extensions["pokeapi"].close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Page weight and render-blocking resources, CDN tags vs built assets.
+
+For a few pages (served from a local stub PokeAPI) reports:
+  - HTML bytes sent uncompressed, gzipped and (when installed) brotli'd
+  - the scripts and stylesheets in <head> that block first render, and
+    their transfer size: CDN ones are fetched (reported as unavailable when
+    offline), built ones are read from app/static/dist
+
+Build the assets first to compare against them:
+    npm install && npm run build:css && flask --app app pokedex build-assets
+
+Run from the project root:
+    python -m benchmarks.bench_page_weight
+"""
+import argparse
+import gzip
+import os
+import re
+from html.parser import HTMLParser
+
+import requests
+
+from app import create_app
+from app.compression import brotli, compress
+from benchmarks.stub_pokeapi import StubPokeAPI
+
+PAGES = ("/", "/pokemon", "/pokemon/pikachu")
+
+
+class HeadResources(HTMLParser):
+    """Collect blocking <script src> and <link rel=stylesheet> in <head>."""
+
+    def __init__(self):
+        super().__init__()
+        self.in_head = False
+        self.blocking = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "head":
+            self.in_head = True
+        elif self.in_head and tag == "script" and "src" in attrs:
+            if "defer" not in attrs and "async" not in attrs:
+                self.blocking.append(attrs["src"])
+        elif self.in_head and tag == "link" and attrs.get("rel") == "stylesheet":
+            self.blocking.append(attrs["href"])
+
+    def handle_endtag(self, tag):
+        if tag == "head":
+            self.in_head = False
+
+
+def transfer_size(app, url):
+    """Gzipped bytes of a resource, or None if it cannot be fetched."""
+    if url.startswith("/static/"):
+        path = os.path.join(app.static_folder, url[len("/static/") :])
+        with open(path, "rb") as f:
+            return len(gzip.compress(f.read()))
+    try:
+        response = requests.get(url, timeout=5, headers={"Accept-Encoding": "gzip"})
+        response.raise_for_status()
+    except requests.RequestException:
+        return None
+    return len(gzip.compress(response.content))
+
+
+def report(app, label):
+    client = app.test_client()
+    print(f"\n{label}")
+    for page in PAGES:
+        html = client.get(page, headers={"Accept-Encoding": "identity"}).data
+        sizes = f"identity {len(html) / 1024:6.1f} KiB   gzip {len(compress(html, 'gzip')) / 1024:5.1f} KiB"
+        if brotli is not None:
+            sizes += f"   br {len(compress(html, 'br')) / 1024:5.1f} KiB"
+        print(f"  {page:<18} {sizes}")
+
+    parser = HeadResources()
+    parser.feed(client.get("/").get_data(as_text=True))
+    print(f"  render-blocking in <head>: {len(parser.blocking)}")
+    for url in parser.blocking:
+        size = transfer_size(app, url)
+        shown = f"{size / 1024:6.1f} KiB gzipped" if size is not None else "unavailable (offline?)"
+        print(f"    {re.sub(r'^https?://', '', url):<45} {shown}")
+
+
+def main():
+    argparse.ArgumentParser(description=__doc__.splitlines()[1]).parse_args()
+
+    with StubPokeAPI() as stub:
+        app = create_app({"TESTING": True, "POKEAPI_BASE_URL": stub.base_url})
+        built = app.extensions["assets"]
+        app.extensions["assets"] = {}
+        report(app, "before: CDN fallback (Tailwind play script + styles.css)")
+        if built:
+            app.extensions["assets"] = built
+            report(app, "after: fingerprinted app.css + deferred htmx")
+        else:
+            print("\nafter: no build in app/static/dist; run `flask pokedex build-assets` first")
+
+
+if __name__ == "__main__":
+    main()
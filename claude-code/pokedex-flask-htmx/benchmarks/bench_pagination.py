@@ -0,0 +1,50 @@
+"""
+/pokemon time-to-first-byte and HTML size as the dex grows.
+
+With pagination both should stay flat: only the first page is fetched and
+rendered, the rest arrives through /pokemon/cards as the user scrolls.
+The page cache is off, so warm requests still render the page.
+
+Run from the project root:
+    python -m benchmarks.bench_pagination [--latency 0.02]
+"""
+import argparse
+import time
+
+from app import create_app
+from benchmarks.stub_pokeapi import StubPokeAPI
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--latency", type=float, default=0.02, help="stub upstream latency in seconds")
+    args = parser.parse_args()
+
+    for dex_size in (151, 1025, 10000):
+        with StubPokeAPI(latency=args.latency, count=dex_size) as stub:
+            app = create_app(
+                {
+                    "TESTING": False,
+                    "POKEAPI_BASE_URL": stub.base_url,
+                    "POKEDEX_SIZE": dex_size,
+                    "PAGE_CACHE_ENABLED": False,
+                }
+            )
+            client = app.test_client()
+
+            start = time.perf_counter()
+            response = client.get("/pokemon")
+            cold = time.perf_counter() - start
+            start = time.perf_counter()
+            client.get("/pokemon")
+            warm = time.perf_counter() - start
+
+            print(
+                f"dex {dex_size:>6}   cold {cold * 1000:7.1f} ms   warm {warm * 1000:6.2f} ms   "
+                f"html {len(response.data) / 1024:6.1f} KiB"
+            )
+            app.extensions["pokeapi"].close()
+
+
+if __name__ == "__main__":
+    main()
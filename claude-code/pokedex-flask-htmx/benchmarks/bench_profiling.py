@@ -0,0 +1,69 @@
+"""
+Cost of the profiling middleware on requests it does not profile.
+
+Times ProfilerMiddleware around a no-op WSGI app against the bare app,
+with sampling off and on, then shows how long a profiled
+cached /pokemon takes in each mode compared to an unprofiled one.
+
+Run from the project root:
+    python -m benchmarks.bench_profiling [--iterations 200000]
+"""
+import argparse
+import tempfile
+import time
+
+from werkzeug.test import EnvironBuilder
+
+from app import create_app
+from app.profiling import ProfilerMiddleware
+from benchmarks.bench_metrics import best_per_call
+from benchmarks.stub_pokeapi import StubPokeAPI
+
+
+def request_ms(app, headers=None, repeat=20):
+    """Best milliseconds for a cached /pokemon through the raw WSGI app."""
+    environ = EnvironBuilder(path="/pokemon", headers=headers).get_environ()
+
+    def start_response(status, headers, exc_info=None):
+        pass
+
+    b"".join(app.wsgi_app(dict(environ), start_response))
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        b"".join(app.wsgi_app(dict(environ), start_response))
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=200000)
+    args = parser.parse_args()
+
+    def bare_app(environ, start_response):
+        return [b"ok"]
+
+    def start_response(status, headers, exc_info=None):
+        pass
+
+    environ = EnvironBuilder(path="/pokemon").get_environ()
+    with tempfile.TemporaryDirectory() as directory:
+        bare_us = best_per_call(lambda: bare_app(environ, start_response), args.iterations)
+        # A tiny nonzero rate pays for the random() draw without profiling anything;
+        # requests that are sampled cost the profiled times below
+        for label, rate in (("off", 0.0), ("on", 1e-12)):
+            middleware = ProfilerMiddleware(bare_app, directory, sample_rate=rate)
+            wrapped_us = best_per_call(lambda: middleware(environ, start_response), args.iterations)
+            print(f"unprofiled request, sampling {label:<3}  {wrapped_us - bare_us:+6.2f} µs")
+
+        with StubPokeAPI() as stub:
+            config = {"TESTING": True, "POKEAPI_BASE_URL": stub.base_url, "ADMIN_TOKEN": "bench"}
+            print(f"\ncached /pokemon unprofiled   {request_ms(create_app(config)):7.2f} ms")
+            for mode in ("cprofile", "sample"):
+                app = create_app({**config, "PROFILE_ENABLED": True, "PROFILE_DIR": directory, "PROFILE_MODE": mode})
+                print(f"cached /pokemon {mode:<8}     {request_ms(app, {'X-Profile': 'bench'}):7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Per-entry cache cost of raw PokeAPI detail documents vs the cached projection.
+
+For each fixture in tests/fixtures/pokeapi reports:
+  - parse time with json and (when installed) orjson, and the projection step
+  - memory held per cached entry (tracemalloc), raw dict vs projection
+  - serialized size, i.e. what a disk or Redis cache stores per entry
+
+Run from the project root:
+    python -m benchmarks.bench_projection [--repeat 50]
+"""
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from pathlib import Path
+
+from app.services.snapshot import slim_detail
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+FIXTURES = Path(__file__).resolve().parent.parent / "tests" / "fixtures" / "pokeapi"
+
+
+def best_time(fn, repeat):
+    """Best wall time of `repeat` calls, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def retained(build, copies=50):
+    """Average bytes still allocated per object build() returns."""
+    gc.collect()
+    tracemalloc.start()
+    values = [build() for _ in range(copies)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del values
+    return current / copies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    for path in sorted(FIXTURES.glob("pokemon_*.json")):
+        payload = path.read_bytes()
+        raw = json.loads(payload)
+        slim = slim_detail(raw)
+
+        print(f"\n{path.stem} ({len(payload) / 1024:.0f} KiB payload)")
+        print(f"  parse json          {best_time(lambda: json.loads(payload), args.repeat):7.3f} ms")
+        if orjson is not None:
+            print(f"  parse orjson        {best_time(lambda: orjson.loads(payload), args.repeat):7.3f} ms")
+        print(f"  project             {best_time(lambda: slim_detail(raw), args.repeat):7.3f} ms")
+
+        raw_bytes = retained(lambda: json.loads(payload))
+        slim_bytes = retained(lambda: slim_detail(json.loads(payload)))
+        print(f"  memory  raw {raw_bytes / 1024:8.1f} KiB   projected {slim_bytes / 1024:6.1f} KiB")
+        raw_size = len(json.dumps(raw, separators=(",", ":")))
+        slim_size = len(json.dumps(slim, separators=(",", ":")))
+        print(f"  stored  raw {raw_size / 1024:8.1f} KiB   projected {slim_size / 1024:6.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
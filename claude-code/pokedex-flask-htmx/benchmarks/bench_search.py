@@ -0,0 +1,60 @@
+"""
+Search latency: prebuilt SearchIndex vs the old per-keystroke linear scan.
+
+The scan reproduces the previous search() view: build a PokemonListItem
+for every list entry whose name contains the query, then keep 10.
+
+Run from the project root:
+    python -m benchmarks.bench_search
+"""
+import random
+import string
+import timeit
+
+from app.models.pokemon import PokemonListItem
+from app.services.search import SearchIndex
+from benchmarks.stub_pokeapi import GEN1_NAMES
+
+
+def list_results(names):
+    return [{"name": name, "url": f"https://pokeapi.co/api/v2/pokemon/{i}/"} for i, name in enumerate(names, 1)]
+
+
+def synthetic_names(count, seed=0):
+    rng = random.Random(seed)
+    return ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 11))) for _ in range(count)]
+
+
+def linear_scan(results, query):
+    query_lower = query.lower()
+    return [PokemonListItem.from_api(p) for p in results if query_lower in p["name"].lower()][:10]
+
+
+def keystrokes(word):
+    return [word[:i] for i in range(1, len(word) + 1)]
+
+
+def bench(label, names, words):
+    results = list_results(names)
+    index = SearchIndex.from_list_results(results)
+    queries = [q for word in words for q in keystrokes(word)]
+    number = 20
+
+    scan = timeit.timeit(lambda: [linear_scan(results, q) for q in queries], number=number)
+    indexed = timeit.timeit(lambda: [index.search(q) for q in queries], number=number)
+    per_query = number * len(queries)
+    print(
+        f"{label:<14} scan {scan / per_query * 1e6:9.1f} us/query   "
+        f"index {indexed / per_query * 1e6:7.1f} us/query   ({scan / indexed:5.1f}x)"
+    )
+
+
+def main():
+    words = ["pikachu", "charizard", "saur", "mew", "eon", "zzz"]
+    bench("151 names", GEN1_NAMES, words)
+    names = synthetic_names(10_000)
+    bench("10,000 names", names, words + [names[1234][:6]])
+
+
+if __name__ == "__main__":
+    main()
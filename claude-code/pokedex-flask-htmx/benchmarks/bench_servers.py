@@ -0,0 +1,137 @@
+"""
+Throughput of the dev server vs gunicorn sync, gthread and gevent workers.
+
+Each server runs as a subprocess against a local stub PokeAPI and is hit by
+concurrent keep-alive clients. Two scenarios:
+
+    cached   default caches; most requests never leave the process
+    upstream response/page caches off, every request waits on the stub's latency
+
+Run from the project root:
+    python -m benchmarks.bench_servers [--seconds 5] [--clients 32] [--workers 4]
+"""
+import argparse
+import os
+import random
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+import requests
+
+from benchmarks.stub_pokeapi import GEN1_NAMES, StubPokeAPI
+
+SERVERS = {
+    "dev server": None,
+    "gunicorn sync": "sync",
+    "gunicorn gthread": "gthread",
+    "gunicorn gevent": "gevent",
+}
+
+SCENARIOS = {
+    "cached": {},
+    "upstream": {"CACHE_TIMEOUT": "0", "PAGE_CACHE_ENABLED": "0"},
+}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(worker_class, port, env, workers):
+    env = dict(os.environ, PORT=str(port), **env)
+    if worker_class is None:
+        command = [sys.executable, "run.py"]
+    else:
+        env.update(GUNICORN_WORKER_CLASS=worker_class, GUNICORN_WORKERS=str(workers))
+        command = [sys.executable, "-m", "gunicorn", "--bind", f"127.0.0.1:{port}", "run:app"]
+    process = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            requests.get(f"http://127.0.0.1:{port}/", timeout=1)
+            return process
+        except requests.RequestException:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f"server {command} did not start")
+
+
+def stop_server(process):
+    process.send_signal(signal.SIGTERM)
+    try:
+        process.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def run_load(base_url, seconds, clients):
+    """Hammer base_url from `clients` threads; return (requests/s, latencies, errors)."""
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    deadline = time.monotonic() + seconds
+
+    def client(seed):
+        rng = random.Random(seed)
+        session = requests.Session()
+        local, failed = [], 0
+        while time.monotonic() < deadline:
+            path = rng.choice(("/", "/pokemon", f"/pokemon/{rng.choice(GEN1_NAMES)}", "/search?q=char"))
+            start = time.perf_counter()
+            try:
+                ok = session.get(base_url + path, timeout=10).status_code == 200
+            except requests.RequestException:
+                ok = False
+            local.append(time.perf_counter() - start)
+            failed += not ok
+        with lock:
+            latencies.extend(local)
+            errors[0] += failed
+
+    threads = [threading.Thread(target=client, args=(seed,)) for seed in range(clients)]
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return len(latencies) / (time.monotonic() - started), latencies, errors[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.02, help="stub PokeAPI latency in seconds")
+    args = parser.parse_args()
+
+    with StubPokeAPI(latency=args.latency) as stub:
+        for scenario, scenario_env in SCENARIOS.items():
+            print(f"\n{scenario} ({args.clients} clients, {args.workers} workers)")
+            for label, worker_class in SERVERS.items():
+                port = free_port()
+                process = start_server(
+                    worker_class, port, dict(scenario_env, POKEAPI_BASE_URL=stub.base_url), args.workers
+                )
+                try:
+                    rate, latencies, errors = run_load(f"http://127.0.0.1:{port}", args.seconds, args.clients)
+                finally:
+                    stop_server(process)
+                latencies.sort()
+                p99 = latencies[int(len(latencies) * 0.99)] * 1000
+                print(
+                    f"  {label:<17} {rate:8.0f} req/s   p50 {statistics.median(latencies) * 1000:7.1f} ms"
+                    f"   p99 {p99:7.1f} ms   errors {errors}"
+                )
+
+
+if __name__ == "__main__":
+    main()
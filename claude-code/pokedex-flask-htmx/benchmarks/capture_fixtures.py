@@ -0,0 +1,32 @@
+"""
+Save live PokeAPI detail documents as test fixtures.
+
+Run from the project root (needs network access):
+    python -m benchmarks.capture_fixtures [names ...]
+"""
+import argparse
+from pathlib import Path
+
+import requests
+
+FIXTURES = Path(__file__).resolve().parent.parent / "tests" / "fixtures" / "pokeapi"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("names", nargs="*", default=["bulbasaur", "pikachu", "mew"])
+    parser.add_argument("--base-url", default="https://pokeapi.co/api/v2")
+    args = parser.parse_args()
+
+    FIXTURES.mkdir(parents=True, exist_ok=True)
+    with requests.Session() as session:
+        for name in args.names:
+            response = session.get(f"{args.base_url}/pokemon/{name}", timeout=30)
+            response.raise_for_status()
+            path = FIXTURES / f"pokemon_{name}.json"
+            path.write_bytes(response.content)
+            print(f"{path} ({len(response.content)} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,310 @@
+"""
+Scripted load test of the app under different servers and worker counts.
+
+Starts the app (as bench_servers does) against a local stub PokeAPI and
+drives it with keep-alive clients, each running a seeded script of what
+visitors do:
+
+    browse   index, the list page, a few detail pages
+    search   a name typed into the navbar search at human speed (50-350 ms
+             between keystrokes). With --typing debounced (the default) it
+             behaves like the shipped search box: a request once typing
+             pauses for SEARCH_DEBOUNCE_MS, numbered so the server can drop
+             overtaken ones. --typing eager sends every keystroke ("p",
+             "pi", "pik", ...) without waiting for the previous response.
+
+Latencies are kept per route (index, list, detail, search), and each is
+reported as requests/s and p50/p95/p99. Search sessions also report
+requests sent, and how many were rendered or dropped (204), per session.
+Results go to a JSON file that a
+later run can be compared against with --baseline; --fail-on-regression
+exits non-zero when a route got slower than --threshold.
+
+Run from the project root:
+    python -m benchmarks.loadtest [--servers gthread,gevent] [--workers 1,4] [--seconds 10]
+        [--clients 16] [--latency 0.02] [--fixtures] [--uncached]
+        [--output results.json] [--baseline benchmarks/results/base.json]
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import requests
+
+from benchmarks.bench_servers import SERVERS, free_port, start_server, stop_server
+from app.config import Config
+from app.sequencing import SEQUENCE_HEADER, SEQUENCE_TOKEN_HEADER
+from benchmarks.stub_pokeapi import GEN1_NAMES, StubPokeAPI
+
+ROUTES = ("index", "list", "detail", "search")
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests", "fixtures", "pokeapi")
+RESULTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+SERVER_NAMES = {"dev": None, **{worker_class: worker_class for worker_class in SERVERS.values() if worker_class}}
+HTMX_HEADERS = {"HX-Request": "true", "HX-Target": "search-results", "HX-Trigger": "search"}
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def browse_script(rng: random.Random):
+    """One visit: index, list, then two to four detail pages, back to back."""
+    yield "index", "/", None, 0.0
+    yield "list", "/pokemon", None, 0.0
+    for _ in range(rng.randint(2, 4)):
+        yield "detail", f"/pokemon/{rng.choice(GEN1_NAMES)}", None, 0.0
+
+
+def search_script(rng: random.Random, debounce: float = 0.0):
+    """
+    A name typed into the search box, as (route, path, headers, pause) steps.
+
+    `pause` is the time since the previous request was sent. With a
+    debounce, only keystrokes followed by a pause at least that long send
+    a request (hx-trigger "delay:"), numbered as the navbar script does.
+    """
+    name = rng.choice(GEN1_NAMES)
+    gaps = [rng.uniform(0.05, 0.35) for _ in name] + [float("inf")]
+    token = f"{rng.getrandbits(48):x}"
+    sequence = 0
+    pause = 0.0
+    for end in range(1, len(name) + 1):
+        pause += gaps[end - 1]
+        if gaps[end] < debounce:
+            continue
+        headers = dict(HTMX_HEADERS)
+        if debounce:
+            sequence += 1
+            headers.update({SEQUENCE_TOKEN_HEADER: token, SEQUENCE_HEADER: str(sequence)})
+        yield "search", f"/search?q={name[:end]}", headers, pause + debounce
+        pause = -debounce
+
+
+def run_load(
+    base_url: str, seconds: float, clients: int, search_share: float, seed: int, debounce: float = 0.0
+) -> Dict:
+    """
+    Run the scripts from `clients` threads for `seconds`.
+
+    Browsing requests are sent one after another. Search requests are sent
+    when the script says, without waiting for earlier ones to finish, as a
+    browser does.
+
+    Returns:
+        {"elapsed": seconds, "latencies": {route: [seconds]}, "errors": {route: count},
+        "sessions": {"sessions", "requests", "rendered", "dropped": count}}
+    """
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    sessions = Counter()
+    lock = threading.Lock()
+    deadline = time.monotonic() + seconds
+
+    def client(client_seed):
+        rng = random.Random(client_seed)
+        local_sessions = threading.local()
+        local, failed, searches = defaultdict(list), defaultdict(int), Counter()
+
+        def get(route, path, headers):
+            if not hasattr(local_sessions, "session"):
+                local_sessions.session = requests.Session()
+            start = time.perf_counter()
+            try:
+                status = local_sessions.session.get(base_url + path, headers=headers, timeout=10).status_code
+            except requests.RequestException:
+                status = None
+            local[route].append(time.perf_counter() - start)
+            failed[route] += status not in (200, 204)
+            if route == "search":
+                searches["rendered" if status == 200 else "dropped" if status == 204 else "failed"] += 1
+
+        with ThreadPoolExecutor(max_workers=4) as in_flight:
+            while time.monotonic() < deadline:
+                searching = rng.random() < search_share
+                script = search_script(rng, debounce) if searching else browse_script(rng)
+                pending = []
+                for route, path, headers, pause in script:
+                    time.sleep(pause)
+                    if time.monotonic() >= deadline:
+                        break
+                    if searching:
+                        pending.append(in_flight.submit(get, route, path, headers))
+                        searches["requests"] += 1
+                    else:
+                        get(route, path, headers)
+                for future in pending:
+                    future.result()
+                searches["sessions"] += searching
+        with lock:
+            for route in local:
+                latencies[route].extend(local[route])
+                errors[route] += failed[route]
+            sessions.update(searches)
+
+    threads = [threading.Thread(target=client, args=(seed * 1000 + n,)) for n in range(clients)]
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return {"elapsed": time.monotonic() - started, "latencies": latencies, "errors": errors, "sessions": sessions}
+
+
+def summarize(load: Dict) -> Dict[str, Dict]:
+    """Requests/s and latency percentiles (ms) per route, plus "all"."""
+    elapsed = load["elapsed"]
+    routes = {route: sorted(load["latencies"][route]) for route in ROUTES if load["latencies"].get(route)}
+    routes["all"] = sorted(latency for samples in routes.values() for latency in samples)
+    summary = {}
+    for route, ordered in routes.items():
+        summary[route] = {
+            "requests": len(ordered),
+            "rps": round(len(ordered) / elapsed, 1),
+            "p50_ms": round(percentile(ordered, 0.50) * 1000, 2),
+            "p95_ms": round(percentile(ordered, 0.95) * 1000, 2),
+            "p99_ms": round(percentile(ordered, 0.99) * 1000, 2),
+            "errors": sum(load["errors"].values()) if route == "all" else load["errors"].get(route, 0),
+        }
+    return summary
+
+
+def summarize_sessions(load: Dict) -> Dict[str, float]:
+    """Search requests sent, rendered and dropped per typing session."""
+    sessions = load["sessions"]
+    count = sessions["sessions"] or 1
+    return {
+        "sessions": sessions["sessions"],
+        "requests_per_session": round(sessions["requests"] / count, 2),
+        "rendered_per_session": round(sessions["rendered"] / count, 2),
+        "dropped_per_session": round(sessions["dropped"] / count, 2),
+    }
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """
+    Print per-route changes against a baseline run.
+
+    Returns:
+        Descriptions of routes whose throughput fell, or whose p95 rose,
+        by more than `threshold` (a fraction)
+    """
+    regressions = []
+    print(f"\nvs baseline {baseline.get('revision') or ''} ({baseline.get('timestamp')})")
+    for config, routes in results["configs"].items():
+        before_routes = baseline["configs"].get(config)
+        if before_routes is None:
+            print(f"  {config:<22} not in baseline")
+            continue
+        for route, now in routes.items():
+            before = before_routes.get(route)
+            if not before:
+                continue
+            rps_change = now["rps"] / before["rps"] - 1 if before["rps"] else 0.0
+            p95_change = now["p95_ms"] / before["p95_ms"] - 1 if before["p95_ms"] else 0.0
+            flag = ""
+            if rps_change < -threshold or p95_change > threshold:
+                flag = "  REGRESSION"
+                regressions.append(f"{config} {route}: rps {rps_change:+.0%}, p95 {p95_change:+.0%}")
+            print(f"  {config:<22} {route:<7} rps {rps_change:+7.1%}   p95 {p95_change:+7.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--servers", default="sync,gthread,gevent", help=f"any of {','.join(SERVER_NAMES)}")
+    parser.add_argument("--workers", default="1,4", help="gunicorn worker counts to try")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--warmup", type=float, default=2.0, help="seconds of unmeasured load first")
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--search-share", type=float, default=0.3, help="fraction of visits that search")
+    parser.add_argument("--typing", choices=("debounced", "eager"), default="debounced")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.02, help="stub PokeAPI latency in seconds")
+    parser.add_argument("--fixtures", action="store_true", help="answer with captured PokeAPI documents")
+    parser.add_argument("--uncached", action="store_true", help="disable response and page caches")
+    parser.add_argument("--output", default=None, help="results file (default benchmarks/results/<time>.json)")
+    parser.add_argument("--baseline", default=None, help="earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="change counted as a regression")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args()
+
+    servers = args.servers.split(",")
+    unknown = set(servers) - set(SERVER_NAMES)
+    if unknown:
+        parser.error(f"unknown servers: {', '.join(sorted(unknown))}")
+    env = {"CACHE_TIMEOUT": "0", "PAGE_CACHE_ENABLED": "0"} if args.uncached else {}
+    debounce = Config.SEARCH_DEBOUNCE_MS / 1000 if args.typing == "debounced" else 0.0
+
+    results = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "cpus": os.cpu_count(),
+        "settings": {key: value for key, value in vars(args).items() if key not in ("output", "baseline")},
+        "configs": {},
+        "search_sessions": {},
+    }
+    with StubPokeAPI(latency=args.latency, fixtures=FIXTURES if args.fixtures else None) as stub:
+        for server in servers:
+            for workers in [1] if server == "dev" else [int(count) for count in args.workers.split(",")]:
+                config = "dev server" if server == "dev" else f"{server} x{workers}"
+                port = free_port()
+                process = start_server(SERVER_NAMES[server], port, dict(env, POKEAPI_BASE_URL=stub.base_url), workers)
+                base_url = f"http://127.0.0.1:{port}"
+                try:
+                    if args.warmup:
+                        run_load(base_url, args.warmup, args.clients, args.search_share, args.seed + 1, debounce)
+                    load = run_load(base_url, args.seconds, args.clients, args.search_share, args.seed, debounce)
+                finally:
+                    stop_server(process)
+                summary = results["configs"][config] = summarize(load)
+                typing = results["search_sessions"][config] = summarize_sessions(load)
+
+                print(f"\n{config} ({args.clients} clients)")
+                for route, row in summary.items():
+                    print(
+                        f"  {route:<7} {row['rps']:8.1f} req/s   p50 {row['p50_ms']:7.1f} ms"
+                        f"   p95 {row['p95_ms']:7.1f} ms   p99 {row['p99_ms']:7.1f} ms   errors {row['errors']}"
+                    )
+                print(
+                    f"  {typing['sessions']} search sessions ({args.typing}): {typing['requests_per_session']}"
+                    f" requests, {typing['rendered_per_session']} rendered, {typing['dropped_per_session']} dropped"
+                    " per session"
+                )
+
+    output = args.output or os.path.join(RESULTS, time.strftime("loadtest-%Y%m%d-%H%M%S.json"))
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nWrote {output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions and args.fail_on_regression:
+            sys.exit("Regressions:\n  " + "\n  ".join(regressions))
+
+
+if __name__ == "__main__":
+    main()
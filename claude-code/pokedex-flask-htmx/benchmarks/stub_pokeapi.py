@@ -0,0 +1,245 @@
+"""Local stand-in for pokeapi.co used by benchmarks and tests."""
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from collections import Counter
+from glob import glob
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+
+GEN1_NAMES = (
+    "bulbasaur ivysaur venusaur charmander charmeleon charizard squirtle wartortle blastoise caterpie "
+    "metapod butterfree weedle kakuna beedrill pidgey pidgeotto pidgeot rattata raticate spearow fearow "
+    "ekans arbok pikachu raichu sandshrew sandslash nidoran-f nidorina nidoqueen nidoran-m nidorino "
+    "nidoking clefairy clefable vulpix ninetales jigglypuff wigglytuff zubat golbat oddish gloom vileplume "
+    "paras parasect venonat venomoth diglett dugtrio meowth persian psyduck golduck mankey primeape "
+    "growlithe arcanine poliwag poliwhirl poliwrath abra kadabra alakazam machop machoke machamp "
+    "bellsprout weepinbell victreebel tentacool tentacruel geodude graveler golem ponyta rapidash slowpoke "
+    "slowbro magnemite magneton farfetchd doduo dodrio seel dewgong grimer muk shellder cloyster gastly "
+    "haunter gengar onix drowzee hypno krabby kingler voltorb electrode exeggcute exeggutor cubone marowak "
+    "hitmonlee hitmonchan lickitung koffing weezing rhyhorn rhydon chansey tangela kangaskhan horsea seadra "
+    "goldeen seaking staryu starmie mr-mime scyther jynx electabuzz magmar pinsir tauros magikarp gyarados "
+    "lapras ditto eevee vaporeon jolteon flareon porygon omanyte omastar kabuto kabutops aerodactyl snorlax "
+    "articuno zapdos moltres dratini dragonair dragonite mewtwo mew"
+).split()
+
+
+def pokemon_name(pokemon_id: int) -> str:
+    """Return the Gen 1 name for an ID, or a synthetic one beyond Gen 1."""
+    if 1 <= pokemon_id <= len(GEN1_NAMES):
+        return GEN1_NAMES[pokemon_id - 1]
+    return f"pokemon-{pokemon_id}"
+
+
+def detail_payload(pokemon_id: int, base_url: str = "https://pokeapi.co/api/v2") -> dict:
+    """Build a PokeAPI-shaped detail document for a pokemon."""
+    stat_names = ("hp", "attack", "defense", "special-attack", "special-defense", "speed")
+    return {
+        "id": pokemon_id,
+        "name": pokemon_name(pokemon_id),
+        "height": 7,
+        "weight": 69,
+        "types": [{"slot": 1, "type": {"name": "grass"}}, {"slot": 2, "type": {"name": "poison"}}],
+        "stats": [{"base_stat": 40 + i * 5, "stat": {"name": name}} for i, name in enumerate(stat_names)],
+        "abilities": [{"ability": {"name": "overgrow"}}, {"ability": {"name": "chlorophyll"}}],
+        "sprites": {
+            "front_default": f"https://example.com/sprites/{pokemon_id}.png",
+            "other": {"official-artwork": {"front_default": f"https://example.com/artwork/{pokemon_id}.png"}},
+        },
+    }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        stub = self.server.stub
+        parsed = urlparse(self.path)
+        stub.record_hit(parsed.path)
+        try:
+            if stub.latency:
+                time.sleep(stub.latency)
+            if stub.take_fault():
+                self._send_json(stub.error_status, {"detail": "Injected failure."})
+            else:
+                self._respond(stub, parsed)
+        finally:
+            stub.record_done()
+
+    def _respond(self, stub, parsed):
+        parts = [p for p in parsed.path.split("/") if p]
+        if parts[:3] == ["api", "v2", "pokemon"] and len(parts) == 3:
+            query = parse_qs(parsed.query)
+            limit = int(query.get("limit", ["20"])[0])
+            offset = int(query.get("offset", ["0"])[0])
+            self._send_json(200, stub.list_payload(limit, offset))
+        elif parts[:3] == ["api", "v2", "pokemon"] and len(parts) == 4:
+            pokemon_id = stub.resolve(parts[3])
+            if pokemon_id is None:
+                self._send_json(404, {"detail": "Not found."})
+            else:
+                self._send_body(200, stub.detail_body(pokemon_id))
+        else:
+            self._send_json(404, {"detail": "Not found."})
+
+    def _send_json(self, status, payload):
+        self._send_body(status, json.dumps(payload).encode())
+
+    def _send_body(self, status, body):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def process_request(self, request, client_address):
+        self.stub.record_connection(request)
+        super().process_request(request, client_address)
+
+    def handle_error(self, request, client_address):
+        # Clients that give up on a slow response (timeouts under test) are expected
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class StubPokeAPI:
+    """
+    Threaded HTTP server that mimics the PokeAPI endpoints the app uses.
+
+    Counts accepted TCP connections and hits per path so callers can assert
+    on how much upstream work a code path really causes. Faults can be
+    injected while it runs: set `latency` to slow every response down, or
+    `fail_next` to answer that many requests with `error_status`.
+
+    Detail documents are small synthetic ones by default. Pass `fixtures`
+    (a directory of `pokemon_<name>.json` captures, such as
+    tests/fixtures/pokeapi) to answer with captured PokeAPI documents
+    instead, cycled over the IDs with the id and name swapped in.
+    """
+
+    def __init__(self, latency: float = 0.0, count: int = 151, error_status: int = 503, fixtures: Optional[str] = None):
+        self.latency = latency
+        self.count = count
+        self.error_status = error_status
+        self.templates = []
+        for path in sorted(glob(os.path.join(fixtures, "pokemon_*.json"))) if fixtures else ():
+            with open(path, encoding="utf-8") as f:
+                self.templates.append(json.load(f))
+        if fixtures and not self.templates:
+            raise ValueError(f"No pokemon_*.json fixtures in {fixtures}")
+        self._bodies = {}
+        self.fail_next = 0
+        self.failed = 0
+        self.connections = 0
+        self.active = 0
+        self.peak_active = 0
+        self.hits = Counter()
+        self._sockets = []
+        self._lock = threading.Lock()
+        self._server = _Server(("127.0.0.1", 0), _Handler)
+        self._server.stub = self
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/api/v2"
+
+    @property
+    def total_hits(self) -> int:
+        return sum(self.hits.values())
+
+    def record_connection(self, sock=None):
+        with self._lock:
+            self.connections += 1
+            if sock is not None:
+                self._sockets.append(sock)
+
+    def record_hit(self, path: str):
+        with self._lock:
+            self.hits[path] += 1
+            self.active += 1
+            self.peak_active = max(self.peak_active, self.active)
+
+    def take_fault(self) -> bool:
+        """Consume one injected failure, if any are pending."""
+        with self._lock:
+            if self.fail_next <= 0:
+                return False
+            self.fail_next -= 1
+            self.failed += 1
+            return True
+
+    def record_done(self):
+        with self._lock:
+            self.active -= 1
+
+    def reset(self):
+        with self._lock:
+            self.connections = 0
+            self.peak_active = self.active
+            self.hits.clear()
+
+    def resolve(self, name_or_id: str):
+        """Map a name or ID path segment to a pokemon ID."""
+        if name_or_id.isdigit():
+            pokemon_id = int(name_or_id)
+            return pokemon_id if 1 <= pokemon_id <= self.count else None
+        for pokemon_id in range(1, self.count + 1):
+            if pokemon_name(pokemon_id) == name_or_id:
+                return pokemon_id
+        return None
+
+    def detail_body(self, pokemon_id: int) -> bytes:
+        """Encoded detail document, built once per ID."""
+        body = self._bodies.get(pokemon_id)
+        if body is None:
+            if self.templates:
+                payload = dict(self.templates[pokemon_id % len(self.templates)])
+                payload.update(id=pokemon_id, name=pokemon_name(pokemon_id))
+            else:
+                payload = detail_payload(pokemon_id, self.base_url)
+            body = self._bodies[pokemon_id] = json.dumps(payload).encode()
+        return body
+
+    def list_payload(self, limit: int, offset: int) -> dict:
+        ids = range(offset + 1, min(offset + limit, self.count) + 1)
+        return {
+            "count": self.count,
+            "results": [{"name": pokemon_name(i), "url": f"{self.base_url}/pokemon/{i}/"} for i in ids],
+        }
+
+    def start(self) -> "StubPokeAPI":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop accepting connections and drop open keep-alive ones."""
+        self._server.shutdown()
+        self._server.server_close()
+        with self._lock:
+            for sock in self._sockets:
+                try:
+                    sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+            self._sockets.clear()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,111 @@
+"""
+Gunicorn settings for production (picked up automatically from the working directory).
+
+    gunicorn run:app
+
+Everything is tunable through environment variables:
+
+    GUNICORN_WORKER_CLASS   sync (default), gthread or gevent
+    GUNICORN_WORKERS        worker processes (default derived from CPU count)
+    GUNICORN_THREADS        threads per gthread worker (default 4)
+    GUNICORN_CONNECTIONS    concurrent requests per gevent worker (default 1000)
+    GUNICORN_TIMEOUT        seconds before a silent worker is killed (default 30)
+    GUNICORN_MAX_REQUESTS   recycle a worker after this many requests (default 2000, 0 disables)
+    PORT                    listen port (default 5000)
+
+The app is imported once in the master (preload_app) and warmed there (see
+app/services/warmup.py), so every forked worker starts with a populated
+response cache and search index shared copy-on-write. post_fork then replaces what must not be shared:
+pooled sockets, executor threads, locks and sqlite/redis connections.
+
+Reloads: SIGHUP starts fresh workers from the already-loaded app, finishing
+in-flight requests within graceful_timeout. To pick up new code with a
+preloaded app, send SIGUSR2 (start a new master), then SIGWINCH and SIGQUIT
+to the old one - or simply restart the container.
+"""
+import multiprocessing
+import os
+
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "sync")
+
+if worker_class == "gevent":
+    # Must run before the preloaded app imports socket/ssl/threading (via requests)
+    from gevent import monkey
+
+    monkey.patch_all()
+
+_cpus = multiprocessing.cpu_count()
+if worker_class == "gevent":
+    # One process per core; concurrency comes from greenlets
+    _default_workers = _cpus
+else:
+    _default_workers = _cpus * 2 + 1
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+workers = int(os.environ.get("GUNICORN_WORKERS", _default_workers))
+threads = int(os.environ.get("GUNICORN_THREADS", 4)) if worker_class == "gthread" else 1
+worker_connections = int(os.environ.get("GUNICORN_CONNECTIONS", 1000))
+
+preload_app = True
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+graceful_timeout = 30
+keepalive = 5
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 2000))
+max_requests_jitter = max_requests // 10
+
+accesslog = os.environ.get("GUNICORN_ACCESS_LOG") or None
+errorlog = "-"
+
+# Pages requested once in the master before any worker is forked
+WARM_PATHS = ("/", "/pokemon")
+# Cache backends every worker reads, re-warmed by the master
+SHARED_BACKENDS = ("disk", "redis")
+
+
+def _flask_app(server):
+    return server.app.wsgi()
+
+
+def when_ready(server):
+    """Warm caches in the master so workers inherit them."""
+    from app.services.warmup import start_cache_warmer, warm_app
+
+    app = _flask_app(server)
+    app.extensions["cache_warmup"] = warm_app(app)
+    server.log.info("%s", app.extensions["cache_warmup"])
+    client = app.test_client()
+    for path in WARM_PATHS:
+        status = client.get(path).status_code
+        server.log.info("Warmed %s (%s)", path, status)
+    # Leave no executor threads or open sockets behind to be inherited by fork()
+    service = app.extensions["pokeapi"]
+    service.close()
+    service.reset_after_fork()
+    # Workers share disk/redis caches, so the master alone keeps them warm
+    if app.config["CACHE_BACKEND"] in SHARED_BACKENDS:
+        start_cache_warmer(app)
+
+
+def post_fork(server, worker):
+    """Give the worker its own connections, threads and locks."""
+    app = _flask_app(server)
+    app.extensions["pokeapi"].reset_after_fork()
+    if app.extensions.get("page_cache") is not None:
+        app.extensions["page_cache"].reset_after_fork()
+        app.extensions["page_responses"].reset_after_fork()
+        if app.extensions["page_purges"] is not None:
+            app.extensions["page_purges"].reset_after_fork()
+    app.extensions["compressed_bodies"].reset_after_fork()
+    app.extensions["request_sequencer"].reset_after_fork()
+    from app import metrics
+    from app.services.warmup import start_cache_warmer
+
+    metrics.reset_after_fork()
+    # A memory cache is private to each worker, so each re-warms its own
+    if app.config["CACHE_BACKEND"] == "memory":
+        start_cache_warmer(app)
+
+
+def worker_exit(server, worker):
+    """Close pooled connections when a worker shuts down."""
+    _flask_app(server).extensions["pokeapi"].close()
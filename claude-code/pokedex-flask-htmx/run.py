@@ -1,10 +1,16 @@
 #!/usr/bin/env python3
-"""Run the Flask application."""
+"""Run the Flask development server (production uses gunicorn, see gunicorn.conf.py)."""
 import os
 from app import create_app
+from app.services.warmup import start_cache_warmer, warm_app
 
 app = create_app()
 
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
+    # With the reloader on, only the child process serves requests
+    if not app.debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        if app.config['CACHE_WARM_ON_START']:
+            app.extensions['cache_warmup'] = warm_app(app)
+        start_cache_warmer(app)
     app.run(host='0.0.0.0', port=port)
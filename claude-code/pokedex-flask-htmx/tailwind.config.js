@@ -0,0 +1,8 @@
+/** Tailwind build config: only classes used by the templates (and the type colors in pokemon.py) are kept. */
+module.exports = {
+  content: ["./app/templates/**/*.html", "./app/models/pokemon.py"],
+  theme: {
+    extend: {},
+  },
+  plugins: [],
+};
@@ -0,0 +1,10 @@
+import pytest
+
+from benchmarks.stub_pokeapi import StubPokeAPI
+
+
+@pytest.fixture
+def stub():
+    """Start a local PokeAPI stub for the test."""
+    with StubPokeAPI() as stub:
+        yield stub
@@ -0,0 +1,137 @@
+import gzip
+import json
+import zlib
+
+import pytest
+
+from app import create_app
+from app.compression import brotli
+
+
+@pytest.fixture
+def client(stub):
+    app = create_app({"TESTING": True, "POKEAPI_BASE_URL": stub.base_url})
+    with app.test_client() as client:
+        yield client
+
+
+def test_pokemon_detail_json(client):
+    """Test that a single pokemon is returned as compact JSON."""
+    response = client.get("/api/v1/pokemon/pikachu")
+
+    assert response.status_code == 200
+    assert response.mimetype == "application/json"
+    assert b", " not in response.data and b"\n" not in response.data
+    data = response.json
+    assert data["id"] == 25
+    assert data["display_name"] == "Pikachu"
+    assert data["stats"]["special-attack"] == 55
+    assert data["types"] == ["Grass", "Poison"]
+
+
+def test_pokemon_detail_by_id_reuses_name_cache(client, stub):
+    """Test that IDs are resolved to names so cached detail entries are shared."""
+    client.get("/api/v1/pokemon/pikachu")
+
+    assert client.get("/api/v1/pokemon/25").json["name"] == "pikachu"
+    assert "/api/v2/pokemon/25" not in stub.hits
+    assert stub.hits["/api/v2/pokemon/pikachu"] == 1
+
+
+def test_unknown_pokemon_is_json_404(client):
+    """Test that errors are JSON too."""
+    response = client.get("/api/v1/pokemon/missingno")
+
+    assert response.status_code == 404
+    assert "missingno" in response.json["error"]
+
+
+def test_batch_lookup(client, stub):
+    """Test that one request answers many lookups, reporting unknown ones."""
+    response = client.get("/api/v1/pokemon?ids=1,4,pikachu,4,missingno")
+
+    data = response.json
+    assert [p["name"] for p in data["results"]] == ["bulbasaur", "charmander", "pikachu"]
+    assert data["missing"] == ["missingno"]
+
+    stub.reset()
+    client.get("/api/v1/pokemon?ids=7,1")
+    assert stub.hits == {"/api/v2/pokemon/squirtle": 1}
+
+
+@pytest.mark.parametrize("path", ["/api/v1/pokemon/pikachu", "/api/v1/pokemon?ids=1,pikachu"])
+def test_outage_is_503_not_missing(stub, path):
+    """Test that lookups the upstream could not answer are 503s and are not page-cached."""
+    app = create_app({"TESTING": True, "POKEAPI_BASE_URL": stub.base_url, "POKEAPI_MAX_RETRIES": 0})
+    client = app.test_client()
+    stub.fail_next = 100
+
+    response = client.get(path)
+
+    assert response.status_code == 503
+    assert response.json["error"] == "Pokemon details unavailable"
+    stub.fail_next = 0
+    app.extensions["pokeapi"].breaker.reset_timeout = 0
+    assert client.get(path).status_code == 200
+
+
+@pytest.mark.parametrize("ids", ["", ",,", ",".join(str(i) for i in range(1, 300))])
+def test_batch_lookup_validation(client, ids):
+    """Test that empty and oversized batches are rejected."""
+    response = client.get(f"/api/v1/pokemon?ids={ids}")
+
+    assert response.status_code == 400
+    assert response.json["error"]
+
+
+def test_list_pages(client):
+    """Test paging through list items with next_offset."""
+    first = client.get("/api/v1/pokemon?limit=100").json
+    second = client.get(f"/api/v1/pokemon?limit=100&offset={first['next_offset']}").json
+
+    assert first["count"] == 151
+    assert len(first["results"]) == 100
+    assert first["results"][0] == {"id": 1, "name": "bulbasaur", "display_name": "Bulbasaur"}
+    assert len(second["results"]) == 51
+    assert second["next_offset"] is None
+
+
+def test_ndjson_streams_full_dex(client):
+    """Test that the NDJSON export has one pokemon per line, in dex order."""
+    response = client.get("/api/v1/pokemon.ndjson")
+
+    assert response.mimetype == "application/x-ndjson"
+    assert response.is_streamed
+    lines = response.get_data(as_text=True).splitlines()
+    assert len(lines) == 151
+    assert json.loads(lines[24])["name"] == "pikachu"
+
+
+def test_responses_are_gzipped_when_accepted(client):
+    """Test gzip for buffered and streamed responses."""
+    batch = client.get(
+        "/api/v1/pokemon?ids=" + ",".join(str(i) for i in range(1, 20)), headers={"Accept-Encoding": "gzip"}
+    )
+    stream = client.get("/api/v1/pokemon.ndjson", headers={"Accept-Encoding": "gzip"})
+
+    assert batch.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in batch.headers["Vary"]
+    assert len(json.loads(gzip.decompress(batch.data))["results"]) == 19
+    assert stream.headers["Content-Encoding"] == "gzip"
+    assert len(zlib.decompress(stream.data, 31).splitlines()) == 151
+
+
+def test_small_responses_are_not_compressed(client):
+    """Test that bodies under the minimum size are sent as is."""
+    response = client.get("/api/v1/pokemon/missingno", headers={"Accept-Encoding": "gzip"})
+
+    assert "Content-Encoding" not in response.headers
+
+
+@pytest.mark.skipif(brotli is None, reason="brotli not installed")
+def test_brotli_preferred_when_available(client):
+    """Test that br is chosen over gzip when the client accepts both."""
+    response = client.get("/api/v1/pokemon?limit=100", headers={"Accept-Encoding": "gzip, br"})
+
+    assert response.headers["Content-Encoding"] == "br"
+    assert len(json.loads(brotli.decompress(response.data))["results"]) == 100
@@ -12,3 +12,17 @@ def test_app_test_config():
     """Test that app can be created with test config."""
     app = create_app({"TESTING": True})
     assert app.config["TESTING"] is True
+
+
+def test_app_shares_pokeapi_service():
+    """Test that one pooled PokeAPI service is created per app."""
+    app = create_app({"TESTING": True, "POKEAPI_POOL_MAXSIZE": 25})
+    service = app.extensions["pokeapi"]
+    assert service.base_url == "https://pokeapi.co/api/v2"
+    assert service.session.get_adapter("https://pokeapi.co")._pool_maxsize == 25
+
+    with app.app_context():
+        from app.routes.main import get_pokeapi_service
+
+        assert get_pokeapi_service() is service
+        assert get_pokeapi_service() is service
@@ -0,0 +1,156 @@
+import gzip
+import json
+import os
+
+import pytest
+
+from app import create_app
+from app.assets import IMMUTABLE_CACHE_CONTROL, build_assets, load_manifest
+
+CSS = b".bg-red-500{background-color:#ef4444}" * 40
+HTMX = b"(function(){/* htmx */})();" * 40
+
+
+@pytest.fixture
+def app(stub, tmp_path):
+    app = create_app({"TESTING": True, "POKEAPI_BASE_URL": stub.base_url})
+    app.static_folder = str(tmp_path)
+    return app
+
+
+def test_build_assets_writes_hashed_files_and_manifest(tmp_path):
+    """Test that assets get content-hashed names and stale builds are removed."""
+    manifest = build_assets(str(tmp_path), {"app.css": CSS, "htmx.js": HTMX})
+
+    assert manifest["app.css"].startswith("dist/app.") and manifest["app.css"].endswith(".css")
+    assert (tmp_path / manifest["htmx.js"]).read_bytes() == HTMX
+    assert load_manifest(str(tmp_path)) == manifest
+
+    rebuilt = build_assets(str(tmp_path), {"app.css": CSS + b"a{}", "htmx.js": HTMX})
+    assert rebuilt["app.css"] != manifest["app.css"]
+    assert rebuilt["htmx.js"] == manifest["htmx.js"]
+    assert not (tmp_path / manifest["app.css"]).exists()
+
+
+def test_pages_use_cdn_until_assets_are_built(app):
+    """Test the development fallback to the CDN scripts."""
+    html = app.test_client().get("/").get_data(as_text=True)
+
+    assert "cdn.tailwindcss.com" in html
+    assert "unpkg.com/htmx.org" in html
+
+
+def test_pages_link_fingerprinted_assets(app):
+    """Test that built assets replace the CDN scripts."""
+    app.extensions["assets"] = build_assets(app.static_folder, {"app.css": CSS, "htmx.js": HTMX})
+
+    html = app.test_client().get("/").get_data(as_text=True)
+
+    assert f'href="/static/{app.extensions["assets"]["app.css"]}"' in html
+    assert f'src="/static/{app.extensions["assets"]["htmx.js"]}" defer' in html
+    assert "cdn.tailwindcss.com" not in html
+
+
+def test_fingerprinted_assets_are_immutable_and_compressed(app):
+    """Test far-future caching and gzip for files under static/dist."""
+    manifest = build_assets(app.static_folder, {"app.css": CSS, "htmx.js": HTMX})
+
+    response = app.test_client().get(f"/static/{manifest['app.css']}", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["Cache-Control"] == IMMUTABLE_CACHE_CONTROL
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(response.data) == CSS
+
+
+def test_manifest_is_not_immutable(app):
+    """Test that the manifest itself keeps the default caching."""
+    build_assets(app.static_folder, {"app.css": CSS})
+
+    response = app.test_client().get("/static/dist/manifest.json")
+
+    assert response.headers.get("Cache-Control") != IMMUTABLE_CACHE_CONTROL
+
+
+def test_html_pages_are_compressed(app):
+    """Test that pages are gzipped and cache hits reuse the compressed body."""
+    client = app.test_client()
+
+    miss = client.get("/pokemon", headers={"Accept-Encoding": "gzip"})
+    hit = client.get("/pokemon", headers={"Accept-Encoding": "gzip"})
+
+    assert miss.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in miss.headers["Vary"]
+    assert b"Pikachu" in gzip.decompress(miss.data)
+    assert hit.headers["X-Cache"] == "HIT"
+    assert hit.data == miss.data
+    assert len(app.extensions["compressed_bodies"]) == 1
+
+
+def test_compressed_bodies_have_their_own_etag(app):
+    """Test that gzip and identity bodies get different ETags, and both revalidate."""
+    client = app.test_client()
+
+    identity = client.get("/pokemon")
+    gzipped = client.get("/pokemon", headers={"Accept-Encoding": "gzip"})
+
+    assert gzipped.headers["ETag"] == identity.headers["ETag"][:-1] + '-gz"'
+    for response, headers in ((identity, {}), (gzipped, {"Accept-Encoding": "gzip"})):
+        revalidated = client.get("/pokemon", headers={**headers, "If-None-Match": response.headers["ETag"]})
+        assert revalidated.status_code == 304
+        assert revalidated.headers["ETag"] == response.headers["ETag"]
+        assert "Content-Encoding" not in revalidated.headers
+
+
+def test_compressed_static_files_revalidate(app):
+    """Test that a static file sent gzipped answers its gzip ETag with 304."""
+    manifest = build_assets(app.static_folder, {"app.css": CSS})
+    client = app.test_client()
+    path = f"/static/{manifest['app.css']}"
+
+    etag = client.get(path, headers={"Accept-Encoding": "gzip"}).headers["ETag"]
+    revalidated = client.get(path, headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+
+    assert etag.endswith('-gz"')
+    assert revalidated.status_code == 304
+    assert revalidated.data == b""
+
+
+def test_compression_can_be_disabled(stub):
+    """Test COMPRESS_ENABLED=False."""
+    app = create_app({"TESTING": True, "POKEAPI_BASE_URL": stub.base_url, "COMPRESS_ENABLED": False})
+
+    response = app.test_client().get("/pokemon", headers={"Accept-Encoding": "gzip"})
+
+    assert "Content-Encoding" not in response.headers
+
+
+def test_build_assets_command(app, tmp_path):
+    """Test the CLI combines the Tailwind output with styles.css."""
+    (tmp_path / "css").mkdir()
+    (tmp_path / "css" / "styles.css").write_bytes(b".custom{}")
+    (tmp_path / "tailwind.css").write_bytes(CSS)
+    (tmp_path / "htmx.min.js").write_bytes(HTMX)
+
+    result = app.test_cli_runner().invoke(
+        args=[
+            "pokedex",
+            "build-assets",
+            "--css",
+            str(tmp_path / "tailwind.css"),
+            "--htmx",
+            str(tmp_path / "htmx.min.js"),
+        ]
+    )
+
+    assert result.exit_code == 0, result.output
+    manifest = json.loads((tmp_path / "dist" / "manifest.json").read_text())
+    assert (tmp_path / manifest["app.css"]).read_bytes() == CSS + b"\n.custom{}"
+    assert "htmx.js -> static/dist/htmx." in result.output
+
+
+def test_build_assets_command_without_build(app):
+    """Test a readable error when npm has not been run."""
+    result = app.test_cli_runner().invoke(args=["pokedex", "build-assets", "--css", os.devnull + ".missing"])
+
+    assert result.exit_code != 0
+    assert "npm install" in result.output
@@ -0,0 +1,252 @@
+import socket
+import socketserver
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from app.services.cache import DiskCache, MemoryCache, RedisCache, create_cache
+from app.services.pokeapi import PokeAPIService
+
+
+class FakeClock:
+    """Manually advanced clock for TTL tests."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeRedisHandler(socketserver.StreamRequestHandler):
+    """Minimal RESP2 server supporting the commands RedisCache uses."""
+
+    def handle(self):
+        store = self.server.store
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            args = []
+            for _ in range(int(line[1:])):
+                length = int(self.rfile.readline()[1:])
+                args.append(self.rfile.read(length + 2)[:-2])
+            command = args[0].upper()
+
+            if command == b"GET":
+                value = store.get(args[1])
+                reply = b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value)
+            elif command == b"SET":
+                store[args[1]] = args[2]
+                if len(args) == 5 and args[3].upper() == b"EX":
+                    self.server.expiry[args[1].decode()] = int(args[4])
+                reply = b"+OK\r\n"
+            elif command == b"SCAN":
+                prefix = args[3].rstrip(b"*")
+                keys = [k for k in store if k.startswith(prefix)]
+                reply = b"*2\r\n$1\r\n0\r\n*%d\r\n" % len(keys)
+                reply += b"".join(b"$%d\r\n%s\r\n" % (len(k), k) for k in keys)
+            elif command == b"DEL":
+                removed = sum(store.pop(k, None) is not None for k in args[1:])
+                reply = b":%d\r\n" % removed
+            else:
+                reply = b"-ERR unknown command\r\n"
+            self.wfile.write(reply)
+
+
+@pytest.fixture
+def fake_redis():
+    """Run a fake Redis-protocol server on a free local port."""
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), FakeRedisHandler)
+    server.daemon_threads = True
+    server.store = {}
+    server.expiry = {}
+    server.port = server.server_address[1]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_cache_hit_and_miss():
+    """Test that stored values are returned and counted."""
+    cache = MemoryCache(maxsize=10, ttl=60)
+
+    assert cache.get("a") is None
+    cache.set("a", {"name": "bulbasaur"})
+    assert cache.get("a") == {"name": "bulbasaur"}
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["size"] == 1
+
+
+def test_cache_entries_expire():
+    """Test that entries are dropped once their TTL has passed."""
+    clock = FakeClock()
+    cache = MemoryCache(maxsize=10, ttl=60, clock=clock)
+    cache.set("a", 1)
+
+    clock.now = 59
+    assert cache.get("a") == 1
+
+    clock.now = 60
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_cache_evicts_least_recently_used():
+    """Test LRU eviction when the cache is full."""
+    cache = MemoryCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "b" is now least recently used
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_disk_cache_is_shared_between_instances(tmp_path):
+    """Test that two DiskCache instances on one file see each other's entries."""
+    path = tmp_path / "cache.sqlite3"
+    first = DiskCache(path, ttl=60)
+    second = DiskCache(path, ttl=60)
+
+    first.set("pokemon/1", {"name": "bulbasaur"})
+
+    assert second.get("pokemon/1") == {"name": "bulbasaur"}
+    assert second.get("pokemon/2") is None
+    assert second.stats()["hits"] == 1
+
+
+def test_disk_cache_expiry_and_eviction(tmp_path):
+    """Test that expired entries are misses and the size is bounded."""
+    cache = DiskCache(tmp_path / "cache.sqlite3", maxsize=2, ttl=0.01)
+    cache.set("a", 1)
+    time.sleep(0.02)
+    assert cache.get("a") is None
+
+    cache.ttl = 60
+    for key in ("a", "b", "c"):
+        cache.set(key, key)
+    assert cache.get("a") is None
+    assert cache.get("c") == "c"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_disk_cache_evicts_every_few_sets(tmp_path):
+    """Test that eviction runs every evict_every sets and leaves other namespaces alone."""
+    path = tmp_path / "cache.sqlite3"
+    other = DiskCache(path, namespace="pokeapi2", ttl=60)
+    other.set("k", 1)
+    cache = DiskCache(path, maxsize=200, ttl=60)
+    assert cache.evict_every == 2
+
+    for index in range(201):
+        cache.set(str(index), index)
+    assert cache.stats()["evictions"] == 0
+
+    cache.set("201", 201)
+    assert cache.stats()["evictions"] == 2
+    assert other.get("k") == 1
+
+
+def test_disk_cache_clear_only_touches_namespace(tmp_path):
+    """Test that clear() leaves other namespaces in the same file alone."""
+    path = tmp_path / "cache.sqlite3"
+    api = DiskCache(path, namespace="pokeapi")
+    pages = DiskCache(path, namespace="page")
+    api.set("k", 1)
+    pages.set("k", 2)
+
+    pages.clear()
+
+    assert api.get("k") == 1
+    assert pages.get("k") is None
+
+
+def test_disk_cache_undecodable_row_is_an_error(tmp_path):
+    """Test that a row that is not valid JSON is counted as an error and read as a miss."""
+    path = tmp_path / "cache.sqlite3"
+    cache = DiskCache(path, ttl=60)
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            "INSERT INTO cache (key, value, expires_at) VALUES (?, ?, ?)", ("pokeapi:k", "{not json", time.time() + 60)
+        )
+
+    assert cache.get("k") is None
+    assert cache.stats()["errors"] == 1
+    assert cache.stats()["hits"] == 0
+
+
+def test_redis_cache_round_trip(fake_redis):
+    """Test get/set/clear against a Redis-protocol server."""
+    cache = RedisCache(f"redis://127.0.0.1:{fake_redis.port}/0", ttl=60)
+
+    assert cache.get("pokemon/25") is None
+    cache.set("pokemon/25", {"name": "pikachu"})
+    assert cache.get("pokemon/25") == {"name": "pikachu"}
+    assert fake_redis.expiry["pokeapi:pokemon/25"] == 60
+
+    cache.clear()
+    assert cache.get("pokemon/25") is None
+    assert cache.stats() == {"hits": 1, "misses": 2, "errors": 0}
+    cache.close()
+
+
+def test_redis_cache_unavailable_is_a_miss():
+    """Test that an unreachable server degrades to cache misses."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    cache = RedisCache(f"redis://127.0.0.1:{port}/0", timeout=0.2)
+
+    cache.set("k", 1)
+    assert cache.get("k") is None
+    assert cache.stats()["errors"] == 2
+
+
+def test_create_cache_from_config(tmp_path):
+    """Test that CACHE_BACKEND picks the backend."""
+    config = {
+        "CACHE_TIMEOUT": 60,
+        "CACHE_MAXSIZE": 10,
+        "CACHE_PATH": str(tmp_path / "cache.sqlite3"),
+        "CACHE_REDIS_URL": "redis://localhost:6379/0",
+    }
+
+    assert isinstance(create_cache({**config, "CACHE_BACKEND": "memory"}), MemoryCache)
+    assert isinstance(create_cache({**config, "CACHE_BACKEND": "disk"}), DiskCache)
+    assert isinstance(create_cache({**config, "CACHE_BACKEND": "redis"}), RedisCache)
+    assert create_cache({**config, "CACHE_BACKEND": "none"}) is None
+
+
+def test_workers_sharing_disk_cache_fetch_once(stub, tmp_path):
+    """Test that two workers on one disk cache send a single upstream call."""
+    path = tmp_path / "cache.sqlite3"
+
+    workers = [PokeAPIService(stub.base_url, cache=DiskCache(path, ttl=60)) for _ in range(2)]
+    for worker in workers:
+        assert worker.get_pokemon_detail("pikachu")["id"] == 25
+    for worker in workers:
+        worker.close()
+
+    assert stub.hits["/api/v2/pokemon/pikachu"] == 1
+
+
+def test_disk_cache_reconnects_after_fork_reset(tmp_path):
+    """Test that reset_after_fork drops the inherited sqlite connection but not the data."""
+    cache = DiskCache(tmp_path / "cache.sqlite3", ttl=60)
+    cache.set("a", {"v": 1})
+    inherited = cache._connect()
+
+    cache.reset_after_fork()
+
+    assert cache._connect() is not inherited
+    assert cache.get("a") == {"v": 1}
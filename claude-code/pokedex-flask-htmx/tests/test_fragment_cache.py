@@ -0,0 +1,66 @@
+from flask import render_template_string
+
+from app import create_app
+from app.models.pokemon import PokemonListItem
+
+CARDS = '{% for pokemon in items %}{% include "components/pokemon_card.html" %}{% endfor %}'
+
+
+def render_cards(app, items):
+    with app.test_request_context():
+        return render_template_string(CARDS, items=items)
+
+
+def make_items(count=3):
+    return [PokemonListItem(id=i, name=f"mon{i}", display_name=f"Mon{i}") for i in range(1, count + 1)]
+
+
+def test_cached_cards_match_uncached_output():
+    """Test that cached fragments render exactly what the template would."""
+    cached_app = create_app({"TESTING": True})
+    plain_app = create_app({"TESTING": True, "FRAGMENT_CACHE_MAXSIZE": 0})
+    items = make_items()
+
+    first = render_cards(cached_app, items)
+    second = render_cards(cached_app, items)
+
+    assert first == second == render_cards(plain_app, items)
+    stats = cached_app.jinja_env.fragment_cache.stats()
+    assert stats["misses"] == 3
+    assert stats["hits"] == 3
+    assert plain_app.jinja_env.fragment_cache is None
+
+
+def test_fragment_key_follows_the_model():
+    """Test that changed model fields render fresh markup."""
+    app = create_app({"TESTING": True})
+    render_cards(app, [PokemonListItem(id=1, name="bulbasaur", display_name="Bulbasaur")])
+
+    html = render_cards(app, [PokemonListItem(id=1, name="bulbasaur", display_name="Bulbasaur", types=("Grass",))])
+
+    assert "Grass" in html
+
+
+def test_fragment_cache_is_bounded():
+    """Test that the fragment store evicts beyond its size."""
+    app = create_app({"TESTING": True, "FRAGMENT_CACHE_MAXSIZE": 10})
+
+    render_cards(app, make_items(25))
+
+    stats = app.jinja_env.fragment_cache.stats()
+    assert stats["size"] == 10
+    assert stats["evictions"] == 15
+
+
+def test_stat_bars_are_cached():
+    """Test that the stat bar macro reuses rendered markup."""
+    app = create_app({"TESTING": True})
+    template = '{% from "components/stat_bar.html" import render_stat %}{{ render_stat("HP", 45) }}'
+
+    with app.test_request_context():
+        first = render_template_string(template)
+        second = render_template_string(template)
+
+    assert first == second
+    assert "width: 18%" in first
+    assert app.jinja_env.fragment_cache.stats()["hits"] == 1
@@ -0,0 +1,188 @@
+import pytest
+
+from app import create_app
+
+
+@pytest.fixture
+def client(stub):
+    app = create_app({"TESTING": True, "POKEAPI_BASE_URL": stub.base_url})
+    with app.test_client() as client:
+        yield client
+
+
+@pytest.mark.parametrize("path", ["/", "/pokemon", "/pokemon/cards?offset=48", "/pokemon/pikachu", "/search?q=char"])
+def test_pages_answer_if_none_match_with_304(client, path):
+    """Test that a matching If-None-Match gets an empty 304."""
+    first = client.get(path)
+    assert first.status_code == 200
+    assert first.headers["ETag"]
+
+    revalidated = client.get(path, headers={"If-None-Match": first.headers["ETag"]})
+    assert revalidated.status_code == 304
+    assert revalidated.data == b""
+    assert revalidated.headers["ETag"] == first.headers["ETag"]
+
+
+def test_etag_is_stable_and_data_dependent(client):
+    """Test that ETags repeat for the same data and differ between pages."""
+    assert client.get("/pokemon/pikachu").headers["ETag"] == client.get("/pokemon/pikachu").headers["ETag"]
+    assert client.get("/pokemon/pikachu").headers["ETag"] != client.get("/pokemon/raichu").headers["ETag"]
+    assert client.get("/search?q=char").headers["ETag"] != client.get("/search?q=pika").headers["ETag"]
+
+
+def test_stale_etag_gets_full_response(client):
+    """Test that a non-matching If-None-Match renders the page."""
+    response = client.get("/pokemon/pikachu", headers={"If-None-Match": '"outdated"'})
+
+    assert response.status_code == 200
+    assert b"Pikachu" in response.data
+
+
+def test_template_version_is_part_of_the_etag(stub):
+    """Test that a new template version invalidates ETags."""
+    etags = set()
+    for version in ("v1", "v2"):
+        app = create_app({"TESTING": True, "POKEAPI_BASE_URL": stub.base_url, "TEMPLATE_VERSION": version})
+        etags.add(app.test_client().get("/pokemon/pikachu").headers["ETag"])
+
+    assert len(etags) == 2
+
+
+def test_304_skips_rendering(client, mocker):
+    """Test that revalidated requests do not render templates."""
+    etag = client.get("/pokemon/pikachu").headers["ETag"]
+    render = mocker.patch("app.routes.main.render_template")
+
+    response = client.get("/pokemon/pikachu", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    render.assert_not_called()
+
+
+def test_pages_are_served_from_the_page_cache(client, mocker):
+    """Test that a repeated request is answered without running the view."""
+    first = client.get("/pokemon/pikachu")
+    render = mocker.patch("app.routes.main.render_template")
+
+    second = client.get("/pokemon/pikachu")
+
+    assert first.headers["X-Cache"] == "MISS"
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.data == first.data
+    assert second.headers["ETag"] == first.headers["ETag"]
+    render.assert_not_called()
+
+
+def test_page_hits_are_replayed_before_routing(client, mocker):
+    """Test that a repeated page is answered with the same bytes without reaching Flask's page cache."""
+    gzip = {"Accept-Encoding": "gzip"}
+    plain = client.get("/pokemon")
+    first = client.get("/pokemon", headers=gzip)
+    lookup = mocker.patch.object(client.application.extensions["page_cache"], "get")
+
+    replayed = client.get("/pokemon", headers=gzip)
+
+    lookup.assert_not_called()
+    assert replayed.headers["X-Cache"] == "HIT"
+    assert replayed.headers["Content-Encoding"] == "gzip"
+    assert replayed.headers["ETag"] == first.headers["ETag"] != plain.headers["ETag"]
+    assert replayed.data == first.data
+    assert client.get("/pokemon").data == plain.data
+
+
+def test_cache_control_and_vary_headers(client):
+    """Test that cached routes advertise their TTL to browsers and proxies."""
+    page = client.get("/pokemon")
+    search = client.get("/search?q=pika")
+
+    assert page.headers["Cache-Control"] == "public, max-age=3600"
+    assert search.headers["Cache-Control"] == "public, max-age=600"
+    assert "HX-Request" in page.headers["Vary"]
+
+
+def test_page_cache_key_includes_query_and_vary_headers(client):
+    """Test that query args and HX-Request select separate entries."""
+    client.get("/search?q=pika")
+
+    assert client.get("/search?q=char").headers["X-Cache"] == "MISS"
+    assert client.get("/search?q=pika", headers={"HX-Request": "true"}).headers["X-Cache"] == "MISS"
+    assert client.get("/search?q=pika").headers["X-Cache"] == "HIT"
+
+
+def test_errors_are_not_page_cached(client):
+    """Test that 404 pages are rendered every time."""
+    client.get("/pokemon/missingno")
+    response = client.get("/pokemon/missingno")
+
+    assert response.status_code == 404
+    assert "X-Cache" not in response.headers
+
+
+@pytest.mark.parametrize("path", ["/", "/pokemon", "/search?q=char"])
+def test_pages_built_during_an_outage_are_not_cached(stub, path):
+    """Test that pages rendered without upstream data are no-store and not page-cached."""
+    app = create_app(
+        {"TESTING": True, "POKEAPI_BASE_URL": stub.base_url, "POKEAPI_MAX_RETRIES": 0, "POKEAPI_BREAKER_RESET": 0}
+    )
+    client = app.test_client()
+    stub.fail_next = 100
+
+    degraded = client.get(path)
+
+    assert degraded.status_code == 200
+    assert degraded.headers["Cache-Control"] == "no-store"
+    assert b"pokemon-card" not in degraded.data
+    stub.fail_next = 0
+    recovered = client.get(path)
+    assert recovered.headers["X-Cache"] == "MISS"
+    assert b"pokemon-card" in recovered.data
+    assert recovered.headers["Cache-Control"].startswith("public")
+
+
+def test_admin_purge_requires_token(stub):
+    """Test the purge endpoint is hidden without the admin token."""
+    app = create_app({"TESTING": True, "POKEAPI_BASE_URL": stub.base_url, "ADMIN_TOKEN": "s3cret"})
+    client = app.test_client()
+    client.get("/pokemon")
+
+    assert client.post("/admin/cache/purge").status_code == 404
+    assert client.post("/admin/cache/purge", headers={"Authorization": "Bearer wrong"}).status_code == 404
+
+    response = client.post("/admin/cache/purge", headers={"Authorization": "Bearer s3cret"})
+    assert response.json == {"purged": ["pages"]}
+    assert client.get("/pokemon").headers["X-Cache"] == "MISS"
+
+
+def test_admin_endpoints_disabled_without_token(client):
+    """Test that no token configured means no admin endpoints."""
+    assert client.post("/admin/cache/purge", headers={"Authorization": "Bearer "}).status_code == 404
+
+
+def test_purge_cache_command_with_shared_backend(stub, tmp_path):
+    """Test that `flask pokedex purge-cache` clears pages shared through the disk backend."""
+    config = {
+        "TESTING": True,
+        "POKEAPI_BASE_URL": stub.base_url,
+        "CACHE_BACKEND": "disk",
+        "CACHE_PATH": str(tmp_path / "cache.sqlite3"),
+    }
+    app = create_app(config)
+    client = app.test_client()
+    client.get("/pokemon")
+    assert create_app(config).test_client().get("/pokemon").headers["X-Cache"] == "HIT"
+
+    result = app.test_cli_runner().invoke(args=["pokedex", "purge-cache"])
+
+    assert result.exit_code == 0, result.output
+    assert client.get("/pokemon").headers["X-Cache"] == "MISS"
+
+
+def test_purge_cache_command_refuses_memory_backend(stub):
+    """Test that purging a process-local cache from the CLI fails instead of claiming success."""
+    app = create_app({"TESTING": True, "POKEAPI_BASE_URL": stub.base_url, "CACHE_BACKEND": "memory"})
+
+    result = app.test_cli_runner().invoke(args=["pokedex", "purge-cache"])
+
+    assert result.exit_code != 0
+    assert "POST /admin/cache/purge" in result.output
+    assert "Purged" not in result.output
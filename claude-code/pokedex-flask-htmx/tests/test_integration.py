@@ -1,5 +1,6 @@
 import pytest
 from app import create_app
+from app.services.search import SearchIndex
 
 
 @pytest.fixture
@@ -36,11 +37,11 @@ def test_full_user_journey(client, mocker):
     assert b"All Pok" in response.data
 
     # 3. Search for a specific pokemon
-    mock_service.return_value.get_pokemon_list.return_value = {
-        "results": [
+    mock_service.return_value.get_search_index.return_value = SearchIndex.from_list_results(
+        [
             {"name": "pikachu", "url": "https://pokeapi.co/api/v2/pokemon/25/"},
         ]
-    }
+    )
     response = client.get("/search?q=pikachu")
     assert response.status_code == 200
     assert b"pikachu" in response.data or b"Pikachu" in response.data
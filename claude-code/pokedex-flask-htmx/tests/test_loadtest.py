@@ -0,0 +1,72 @@
+import random
+
+import requests
+
+from app.sequencing import SEQUENCE_HEADER
+from benchmarks.loadtest import FIXTURES, compare, percentile, search_script, summarize
+from benchmarks.stub_pokeapi import StubPokeAPI
+
+
+def test_percentile_nearest_rank():
+    """Test percentiles of a sorted sample."""
+    ordered = [i / 100 for i in range(1, 101)]
+
+    assert percentile(ordered, 0.50) == 0.51
+    assert percentile(ordered, 0.99) == 1.0
+    assert percentile([], 0.95) == 0.0
+
+
+def test_summarize_reports_each_route_and_all():
+    """Test requests/s, percentiles and errors per route."""
+    load = {"elapsed": 2.0, "latencies": {"list": [0.01, 0.03], "search": [0.002] * 4}, "errors": {"search": 1}}
+
+    summary = summarize(load)
+
+    assert set(summary) == {"list", "search", "all"}
+    assert summary["all"]["rps"] == 3.0
+    assert summary["list"]["p50_ms"] == 30.0
+    assert summary["all"]["errors"] == 1
+
+
+def test_compare_flags_regressions_beyond_threshold():
+    """Test that lower throughput or higher p95 than the baseline is reported."""
+    baseline = {"configs": {"gthread x4": {"list": {"rps": 100.0, "p95_ms": 10.0}}}}
+    slower = {"configs": {"gthread x4": {"list": {"rps": 95.0, "p95_ms": 13.0}}}}
+    similar = {"configs": {"gthread x4": {"list": {"rps": 95.0, "p95_ms": 10.5}}}}
+
+    assert compare(slower, baseline, threshold=0.1) == ["gthread x4 list: rps -5%, p95 +30%"]
+    assert compare(similar, baseline, threshold=0.1) == []
+
+
+def test_eager_search_script_sends_every_keystroke():
+    """Test that without a debounce each keystroke is a request for a growing prefix."""
+    steps = list(search_script(random.Random(3)))
+
+    queries = [path.split("q=")[1] for _, path, _, _ in steps]
+    assert [len(query) for query in queries] == list(range(1, len(queries) + 1))
+    assert all(headers["HX-Request"] == "true" for _, _, headers, _ in steps)
+    assert all(SEQUENCE_HEADER not in headers for _, _, headers, _ in steps)
+
+
+def test_debounced_search_script_waits_for_pauses():
+    """Test that a debounce sends fewer, numbered requests, ending with the full name."""
+    eager = list(search_script(random.Random(3)))
+    debounced = list(search_script(random.Random(3), debounce=0.25))
+
+    assert len(debounced) < len(eager)
+    assert debounced[-1][1] == eager[-1][1]
+    assert [headers[SEQUENCE_HEADER] for _, _, headers, _ in debounced] == [
+        str(n) for n in range(1, len(debounced) + 1)
+    ]
+    assert all(pause >= 0.25 for _, _, _, pause in debounced)
+
+
+def test_stub_serves_full_size_fixtures():
+    """Test that the stub can answer with captured PokeAPI documents."""
+    with StubPokeAPI(fixtures=FIXTURES) as stub:
+        response = requests.get(f"{stub.base_url}/pokemon/charmander", timeout=5)
+
+    assert response.json()["id"] == 4
+    assert response.json()["name"] == "charmander"
+    assert len(response.json()["moves"]) > 20
+    assert len(response.content) > 25_000
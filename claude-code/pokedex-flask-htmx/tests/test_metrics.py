@@ -0,0 +1,153 @@
+import re
+
+import pytest
+
+from app import create_app
+from app import metrics
+from app.metrics import CONTENT_TYPE, Histogram
+from app.services.pokeapi import endpoint_label
+from app.services.resilience import CircuitBreaker
+
+
+@pytest.fixture
+def client(stub):
+    app = create_app({"TESTING": True, "POKEAPI_BASE_URL": stub.base_url, "METRICS_ENABLED": True})
+    with app.test_client() as client:
+        yield client
+
+
+def sample(text, name, **labels):
+    """Value of the sample with these labels (besides pid), or 0 if absent."""
+    for line in text.splitlines():
+        match = re.match(rf"{re.escape(name)}\{{(.*)\}} (\S+)$", line)
+        if not match:
+            continue
+        pairs = dict(re.findall(r'(\w+)="([^"]*)"', match.group(1)))
+        pairs.pop("pid", None)
+        if pairs == {key: str(value) for key, value in labels.items()}:
+            return float(match.group(2))
+    return 0.0
+
+
+def test_histogram_exposition():
+    """Test cumulative buckets, +Inf, sum and count."""
+    histogram = Histogram("demo_seconds", "Demo.", ("route",), buckets=(0.1, 1))
+    histogram.labels("a").observe(0.05)
+    histogram.labels("a").observe(0.5)
+    histogram.labels("a").observe(5)
+
+    lines = histogram.collect(('pid="1"',))
+
+    assert lines[:2] == ["# HELP demo_seconds Demo.", "# TYPE demo_seconds histogram"]
+    assert 'demo_seconds_bucket{pid="1",route="a",le="0.1"} 1' in lines
+    assert 'demo_seconds_bucket{pid="1",route="a",le="1.0"} 2' in lines
+    assert 'demo_seconds_bucket{pid="1",route="a",le="+Inf"} 3' in lines
+    assert 'demo_seconds_sum{pid="1",route="a"} 5.55' in lines
+    assert 'demo_seconds_count{pid="1",route="a"} 3' in lines
+
+
+def test_endpoint_label():
+    """Test that names and IDs are folded out of upstream labels."""
+    base = "https://pokeapi.co/api/v2"
+
+    assert endpoint_label(base, f"{base}/pokemon") == "/pokemon"
+    assert endpoint_label(base, f"{base}/pokemon/pikachu") == "/pokemon/{name}"
+
+
+def test_request_latency_and_status_per_route(client):
+    """Test that requests are counted and timed by endpoint."""
+    before = client.get("/metrics").get_data(as_text=True)
+    client.get("/pokemon/pikachu")
+    client.get("/pokemon/missingno")
+
+    response = client.get("/metrics")
+    text = response.get_data(as_text=True)
+
+    assert response.content_type == CONTENT_TYPE
+    assert response.headers["Cache-Control"] == "no-store"
+    labels = {"endpoint": "main.pokemon_detail", "method": "GET"}
+    assert sample(text, "pokedex_http_requests_total", status=200, **labels) == (
+        sample(before, "pokedex_http_requests_total", status=200, **labels) + 1
+    )
+    assert sample(text, "pokedex_http_requests_total", status=404, **labels) >= 1
+    assert sample(text, "pokedex_http_request_duration_seconds_count", **labels) == (
+        sample(before, "pokedex_http_request_duration_seconds_count", **labels) + 2
+    )
+    assert sample(text, "pokedex_http_requests_in_flight") == 1  # the scrape itself
+
+
+def test_upstream_calls_are_timed_by_endpoint_and_status(client):
+    """Test upstream latency and outcome metrics."""
+    before = client.get("/metrics").get_data(as_text=True)
+    client.get("/pokemon/eevee")
+    client.get("/pokemon/missingno")
+
+    text = client.get("/metrics").get_data(as_text=True)
+
+    detail = {"endpoint": "/pokemon/{name}"}
+    for status in (200, 404):
+        assert sample(text, "pokedex_upstream_requests_total", status=status, **detail) == (
+            sample(before, "pokedex_upstream_requests_total", status=status, **detail) + 1
+        )
+    assert sample(text, "pokedex_upstream_request_duration_seconds_count", **detail) == (
+        sample(before, "pokedex_upstream_request_duration_seconds_count", **detail) + 2
+    )
+
+
+def test_short_circuited_calls_are_counted(stub):
+    """Test that calls refused by an open breaker are visible."""
+    app = create_app({"TESTING": True, "POKEAPI_BASE_URL": stub.base_url, "METRICS_ENABLED": True})
+    service = app.extensions["pokeapi"]
+    service.breaker = CircuitBreaker(failure_threshold=1)
+    service.max_retries = 0
+    stub.fail_next = 1
+    client = app.test_client()
+    before = client.get("/metrics").get_data(as_text=True)
+
+    client.get("/pokemon/abra")
+    client.get("/pokemon/kadabra")
+
+    text = client.get("/metrics").get_data(as_text=True)
+    detail = {"endpoint": "/pokemon/{name}"}
+    assert sample(text, "pokedex_upstream_requests_total", status="short_circuit", **detail) == (
+        sample(before, "pokedex_upstream_requests_total", status="short_circuit", **detail) + 1
+    )
+    assert sample(text, "pokedex_upstream_circuit_open") == 1
+
+
+def test_render_time_and_cache_ratios(client):
+    """Test template render histograms and per-cache hit ratios."""
+    client.get("/pokemon")
+    client.get("/pokemon")
+
+    text = client.get("/metrics").get_data(as_text=True)
+
+    assert sample(text, "pokedex_template_render_seconds_count", template="pokemon_list.html") >= 1
+    assert sample(text, "pokedex_model_build_seconds_count", model="PokemonListItem") >= 1
+    # The repeat is replayed by PageCacheMiddleware, ahead of the page cache; it
+    # also looked up (and missed) the first request and this scrape
+    assert sample(text, "pokedex_cache_hits_total", cache="page_responses") == 1
+    assert sample(text, "pokedex_cache_hit_ratio", cache="page_responses") == 1 / 3
+    assert sample(text, "pokedex_cache_misses_total", cache="pages") == 1
+    assert 'cache="responses"' in text
+
+
+def test_metrics_are_off_by_default(stub):
+    """Test that metrics are off unless METRICS_ENABLED is set."""
+    app = create_app({"TESTING": True, "POKEAPI_BASE_URL": stub.base_url})
+
+    assert app.test_client().get("/metrics").status_code == 404
+
+
+def test_recording_is_a_no_op_until_init_metrics(monkeypatch):
+    """Test that timed() and record_upstream() queue nothing while metrics are off."""
+    monkeypatch.setattr(metrics, "_enabled", False)
+    build = metrics.MODEL_BUILD_LATENCY.labels("Disabled")
+    attempts = metrics.UPSTREAM_REQUESTS.labels("/disabled", "200")
+
+    assert metrics.timed(metrics.MODEL_BUILD_LATENCY, "Disabled", len, "abc") == 3
+    metrics.record_upstream("/disabled", "200", 0.01)
+
+    assert not build.pending
+    assert not attempts.pending
+    assert "/disabled" not in "".join(metrics.UPSTREAM_LATENCY.collect())
@@ -0,0 +1,68 @@
+import asyncio
+
+from app.services.cache import MemoryCache
+from app.services.pokeapi import PokeAPIService
+from benchmarks.async_pokeapi import AsyncPokeAPIService
+from benchmarks.stub_pokeapi import StubPokeAPI
+
+
+def test_get_pokemon_detail_and_list(stub):
+    """Test the single-record methods against the stub server."""
+
+    async def run(base_url):
+        async with AsyncPokeAPIService(base_url) as service:
+            listing = await service.get_pokemon_list(limit=3)
+            detail = await service.get_pokemon_detail("Pikachu")
+            missing = await service.get_pokemon_detail("missingno")
+            return listing, detail, missing
+
+    listing, detail, missing = asyncio.run(run(stub.base_url))
+
+    assert [p["name"] for p in listing["results"]] == ["bulbasaur", "ivysaur", "venusaur"]
+    assert detail["id"] == 25
+    assert missing is None
+
+
+def test_details_many_keeps_order_and_limits_concurrency():
+    """Test batch fetches run in parallel up to the concurrency limit."""
+
+    async def run(base_url):
+        async with AsyncPokeAPIService(base_url) as service:
+            return await service.get_pokemon_details_many(range(1, 31), concurrency=5)
+
+    with StubPokeAPI(latency=0.05) as stub:
+        details = asyncio.run(run(stub.base_url))
+
+    assert [d["id"] for d in details] == list(range(1, 31))
+    assert stub.peak_active == 5
+    assert stub.connections <= 5
+
+
+def test_duplicate_names_are_fetched_once():
+    """Test that concurrent requests for one name share a fetch."""
+
+    async def run(base_url):
+        async with AsyncPokeAPIService(base_url) as service:
+            return await service.get_pokemon_details_many(["pikachu"] * 10, concurrency=10)
+
+    with StubPokeAPI(latency=0.05) as stub:
+        details = asyncio.run(run(stub.base_url))
+
+    assert all(d["name"] == "pikachu" for d in details)
+    assert stub.total_hits == 1
+
+
+def test_shares_cache_with_sync_service(stub):
+    """Test that records fetched asynchronously are cache hits for the sync service."""
+    service = PokeAPIService(stub.base_url, cache=MemoryCache(ttl=60))
+
+    async def warm():
+        async with AsyncPokeAPIService.for_service(service) as client:
+            await client.get_pokemon_details_many(range(1, 11))
+
+    asyncio.run(warm())
+    for pokemon_id in range(1, 11):
+        assert service.get_pokemon_detail(pokemon_id)["id"] == pokemon_id
+    service.close()
+
+    assert stub.total_hits == 10
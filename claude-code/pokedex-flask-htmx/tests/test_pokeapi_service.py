@@ -1,5 +1,11 @@
+import json
+import os
+import threading
+import time
+
 import pytest
 from app.services.pokeapi import PokeAPIService
+from benchmarks.stub_pokeapi import StubPokeAPI
 
 
 @pytest.fixture
@@ -19,7 +25,7 @@ def test_get_pokemon_list(pokeapi_service, mocker):
     }
 
     mock_get = mocker.patch.object(pokeapi_service.session, "get")
-    mock_get.return_value.json.return_value = mock_response
+    mock_get.return_value.content = json.dumps(mock_response).encode()
     mock_get.return_value.status_code = 200
 
     result = pokeapi_service.get_pokemon_list(limit=151)
@@ -44,7 +50,7 @@ def test_get_pokemon_detail(pokeapi_service, mocker):
     }
 
     mock_get = mocker.patch.object(pokeapi_service.session, "get")
-    mock_get.return_value.json.return_value = mock_response
+    mock_get.return_value.content = json.dumps(mock_response).encode()
     mock_get.return_value.status_code = 200
 
     result = pokeapi_service.get_pokemon_detail("bulbasaur")
@@ -64,3 +70,153 @@ def test_get_pokemon_detail_not_found(pokeapi_service, mocker):
     result = pokeapi_service.get_pokemon_detail("notapokemon")
 
     assert result is None
+
+
+def test_session_reuses_connections(stub):
+    """Test that repeated calls reuse one keep-alive connection."""
+    service = PokeAPIService(stub.base_url)
+    for name in ("bulbasaur", "ivysaur", "venusaur"):
+        assert service.get_pokemon_detail(name)["name"] == name
+    service.close()
+
+    assert stub.connections == 1
+    assert stub.total_hits == 3
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork()")
+@pytest.mark.filterwarnings("ignore:This process .* is multi-threaded")  # the stub server's threads
+def test_service_is_usable_after_fork(stub, tmp_path):
+    """Test that a forked worker keeps warmed data but opens its own connections."""
+    service = PokeAPIService(stub.base_url)
+    service.get_pokemon_detail("pikachu")
+    read_fd, write_fd = os.pipe()
+
+    pid = os.fork()
+    if pid == 0:
+        try:
+            service.reset_after_fork()
+            result = {
+                "cached": service.get_pokemon_detail("pikachu")["id"],
+                "fetched": service.get_pokemon_detail("eevee")["id"],
+                "batch": [p["id"] for p in service.get_pokemon_details_many(["mew", "ditto"])],
+            }
+            os.write(write_fd, json.dumps(result).encode())
+        finally:
+            os._exit(0)
+
+    os.close(write_fd)
+    os.waitpid(pid, 0)
+    with os.fdopen(read_fd) as pipe:
+        result = json.loads(pipe.read())
+    service.close()
+
+    assert result == {"cached": 25, "fetched": 133, "batch": [151, 132]}
+    assert stub.hits["/api/v2/pokemon/pikachu"] == 1
+    assert stub.connections >= 2
+
+
+def test_responses_are_cached(pokeapi_service, mocker):
+    """Test that repeated lookups are served from the cache."""
+    mock_get = mocker.patch.object(pokeapi_service.session, "get")
+    mock_get.return_value.content = b'{"id": 1, "name": "bulbasaur"}'
+    mock_get.return_value.status_code = 200
+
+    assert pokeapi_service.get_pokemon_detail("bulbasaur")["id"] == 1
+    assert pokeapi_service.get_pokemon_detail("Bulbasaur")["id"] == 1
+    pokeapi_service.get_pokemon_list(limit=151, offset=0)
+    pokeapi_service.get_pokemon_list(offset=0, limit=151)
+
+    assert mock_get.call_count == 2
+    stats = pokeapi_service.cache_stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 2
+
+
+def test_errors_are_not_cached(pokeapi_service, mocker):
+    """Test that failed lookups are retried on the next call."""
+    mock_get = mocker.patch.object(pokeapi_service.session, "get")
+    mock_get.return_value.status_code = 404
+
+    pokeapi_service.get_pokemon_detail("notapokemon")
+    pokeapi_service.get_pokemon_detail("notapokemon")
+
+    assert mock_get.call_count == 2
+
+
+def wait_for(condition, timeout=2.0):
+    """Poll until condition() is true or the timeout passes."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_stale_entries_are_served_while_refreshing():
+    """Test that an expired entry is returned at once and refreshed in the background."""
+    with StubPokeAPI(latency=0.3) as stub:
+        service = PokeAPIService(stub.base_url, cache_timeout=0.05, max_stale=60)
+        assert service.get_pokemon_detail("pikachu")["id"] == 25
+        time.sleep(0.1)
+
+        start = time.monotonic()
+        assert service.get_pokemon_detail("pikachu")["id"] == 25
+        assert service.get_pokemon_detail("pikachu")["id"] == 25
+        assert time.monotonic() - start < 0.2
+
+        assert wait_for(lambda: stub.total_hits == 2)
+        assert wait_for(lambda: service.cache_stats()["refreshes"] == 1 and not service._refreshing)
+        assert service.get_pokemon_detail("pikachu")["id"] == 25
+        service.close()
+
+    stats = service.cache_stats()
+    assert stats["stale_served"] == 2
+    assert stats["refreshes"] == 1
+    assert stub.total_hits == 2
+
+
+def test_stale_entries_survive_upstream_outage():
+    """Test that a failed refresh keeps serving the stale copy."""
+    stub = StubPokeAPI().start()
+    service = PokeAPIService(stub.base_url, timeout=1, cache_timeout=0.05, max_stale=60)
+    assert service.get_pokemon_detail("pikachu")["id"] == 25
+    stub.stop()
+    time.sleep(0.1)
+
+    assert service.get_pokemon_detail("pikachu")["id"] == 25
+    assert wait_for(lambda: service.cache_stats()["refresh_failures"] == 1)
+    assert service.get_pokemon_detail("pikachu")["id"] == 25
+    service.close()
+
+
+def test_stale_refreshes_share_a_bounded_pool():
+    """Test that many stale keys are refreshed by at most refresh_concurrency threads."""
+    names = ["bulbasaur", "ivysaur", "venusaur", "charmander", "charmeleon", "charizard"]
+    with StubPokeAPI(latency=0.05) as stub:
+        service = PokeAPIService(stub.base_url, cache_timeout=0.05, max_stale=60, refresh_concurrency=2)
+        for name in names:
+            service.get_pokemon_detail(name)
+        time.sleep(0.1)
+
+        for name in names * 3:
+            service.get_pokemon_detail(name)
+        threads = {thread.name for thread in threading.enumerate() if thread.name.startswith("pokeapi-refresh")}
+
+        assert wait_for(lambda: service.cache_stats()["refreshes"] == len(names) and not service._refreshing)
+        assert stub.total_hits == 2 * len(names)
+        service.close()
+
+    assert 1 <= len(threads) <= 2
+
+
+def test_entries_past_max_stale_are_refetched(stub):
+    """Test that entries older than the stale window are fetched synchronously."""
+    service = PokeAPIService(stub.base_url, cache_timeout=0.05, max_stale=0.05)
+    service.get_pokemon_detail("pikachu")
+    time.sleep(0.15)
+    service.get_pokemon_detail("pikachu")
+    service.close()
+
+    assert stub.total_hits == 2
+    assert service.cache_stats()["stale_served"] == 0
@@ -1,4 +1,8 @@
-from app.models.pokemon import Pokemon, PokemonListItem
+from dataclasses import FrozenInstanceError
+
+import pytest
+
+from app.models.pokemon import Pokemon, PokemonListItem, Stats
 
 
 def test_pokemon_list_item_from_api():
@@ -68,3 +72,86 @@ def test_pokemon_type_colors():
     assert "water" in TYPE_COLORS
     assert "grass" in TYPE_COLORS
     assert TYPE_COLORS["fire"] == "bg-red-500"
+
+
+def test_pokemon_list_item_from_detail():
+    """Test creating an enriched PokemonListItem from a detail response."""
+    api_data = {
+        "id": 25,
+        "name": "pikachu",
+        "types": [{"slot": 1, "type": {"name": "electric"}}],
+        "stats": [
+            {"base_stat": 35, "stat": {"name": "hp"}},
+            {"base_stat": 55, "stat": {"name": "attack"}},
+            {"base_stat": 40, "stat": {"name": "defense"}},
+            {"base_stat": 50, "stat": {"name": "special-attack"}},
+            {"base_stat": 50, "stat": {"name": "special-defense"}},
+            {"base_stat": 90, "stat": {"name": "speed"}},
+        ],
+    }
+
+    item = PokemonListItem.from_detail(api_data)
+
+    assert item.id == 25
+    assert item.display_name == "Pikachu"
+    assert item.types == ("Electric",)
+    assert item.base_stat_total == 320
+    assert item.get_type_color("Electric") == "bg-yellow-400"
+
+
+def test_stats_read_like_a_dict():
+    """Test that Stats supports the attribute and key access templates use."""
+    stats = Stats.from_api(
+        [
+            {"base_stat": 35, "stat": {"name": "hp"}},
+            {"base_stat": 50, "stat": {"name": "special-attack"}},
+            {"base_stat": 1, "stat": {"name": "accuracy"}},
+        ]
+    )
+
+    assert stats.hp == stats["hp"] == 35
+    assert stats["special-attack"] == stats.special_attack == 50
+    assert stats.speed == 0
+    assert stats[0] == 35
+    assert stats.total == 85
+    assert dict(stats.items())["special-attack"] == 50
+    with pytest.raises(KeyError):
+        stats["accuracy"]
+
+
+def test_stats_mapping_interface():
+    """Test membership, keys, values and get by PokeAPI stat name."""
+    stats = Stats(hp=35, attack=55, defense=40, special_attack=50, special_defense=50, speed=90)
+
+    assert "hp" in stats and "special-attack" in stats
+    assert "accuracy" not in stats and 35 not in stats
+    assert list(stats.keys()) == ["hp", "attack", "defense", "special-attack", "special-defense", "speed"]
+    assert list(stats.values()) == [35, 55, 40, 50, 50, 90]
+    assert stats.get("speed") == 90
+    assert stats.get("accuracy") is None
+    assert stats.get("accuracy", 0) == 0
+    assert dict(stats.items()) == dict(zip(stats.keys(), stats.values()))
+
+
+def test_pokemon_from_api_without_height_or_weight():
+    """Test that a slimmed document missing height and weight still builds a Pokemon."""
+    pokemon = Pokemon.from_api(
+        {"id": 25, "name": "pikachu", "height": None, "weight": None, "types": [], "stats": [], "abilities": []}
+    )
+
+    assert pokemon.height_m is None
+    assert pokemon.weight_kg is None
+    assert pokemon.to_dict()["height_m"] is None
+
+
+def test_models_are_compact_and_immutable():
+    """Test that models have no per-instance __dict__ and share interned strings."""
+    api_data = {"name": "bulbasaur", "url": "https://pokeapi.co/api/v2/pokemon/1/"}
+    first = PokemonListItem.from_api(api_data)
+    second = PokemonListItem.from_api(dict(api_data, name="".join(["bulba", "saur"])))
+
+    assert not hasattr(first, "__dict__")
+    assert first.display_name is second.display_name
+    assert first == second
+    with pytest.raises(FrozenInstanceError):
+        first.name = "ivysaur"
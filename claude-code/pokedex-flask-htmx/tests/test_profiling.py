@@ -0,0 +1,100 @@
+import os
+import pstats
+
+
+from app import create_app
+from app.profiling import ProfilerMiddleware, profile_files, summarize_collapsed
+
+
+def make_app(stub, tmp_path, **config):
+    return create_app(
+        {
+            "TESTING": True,
+            "POKEAPI_BASE_URL": stub.base_url,
+            "ADMIN_TOKEN": "s3cret",
+            "PROFILE_ENABLED": True,
+            "PROFILE_DIR": str(tmp_path),
+            **config,
+        }
+    )
+
+
+def test_header_with_token_writes_pstats(stub, tmp_path):
+    """Test that a request sending the profile header gets a .pstats file."""
+    client = make_app(stub, tmp_path).test_client()
+
+    response = client.get("/pokemon", headers={"X-Profile": "s3cret"})
+
+    assert response.status_code == 200
+    [path] = profile_files(str(tmp_path))
+    assert "-GET-pokemon-" in os.path.basename(path)
+    functions = {func for _, _, func in pstats.Stats(path).stats}
+    assert "render_template" in functions
+
+
+def test_unsampled_and_unauthorized_requests_are_not_profiled(stub, tmp_path):
+    """Test that requests without the header, or with a wrong token, pass straight through."""
+    client = make_app(stub, tmp_path).test_client()
+
+    client.get("/pokemon")
+    client.get("/pokemon", headers={"X-Profile": "guess"})
+
+    assert profile_files(str(tmp_path)) == []
+
+
+def test_sample_rate_profiles_without_header(stub, tmp_path):
+    """Test that PROFILE_SAMPLE_RATE=1 profiles every request."""
+    client = make_app(stub, tmp_path, PROFILE_SAMPLE_RATE=1.0, PROFILE_KEEP=2).test_client()
+
+    for _ in range(3):
+        client.get("/")
+
+    assert len(profile_files(str(tmp_path))) == 2  # oldest removed
+
+
+def test_sampling_mode_writes_collapsed_stacks(tmp_path):
+    """Test collapsed-stack output of the sampling profiler."""
+
+    def slow_app(environ, start_response):
+        busy_wait()
+        start_response("200 OK", [])
+        return [b"ok"]
+
+    def busy_wait():
+        total = 0
+        for i in range(3_000_000):
+            total += i
+        return total
+
+    middleware = ProfilerMiddleware(slow_app, str(tmp_path), mode="sample", sample_rate=1.0, interval=0.001)
+    assert middleware({"PATH_INFO": "/slow"}, lambda status, headers: None) == [b"ok"]
+
+    [path] = profile_files(str(tmp_path))
+    assert path.endswith(".collapsed")
+    [(frame, own, total)] = summarize_collapsed([path], top=1, sort="own")
+    assert frame.startswith("busy_wait (test_profiling.py:")
+    assert own == total > 0
+
+
+def test_profile_summary_cli(stub, tmp_path):
+    """Test that the summary lists hot functions across captured profiles."""
+    app = make_app(stub, tmp_path)
+    client = app.test_client()
+    client.get("/pokemon", headers={"X-Profile": "s3cret"})
+    client.get("/pokemon/pikachu", headers={"X-Profile": "s3cret"})
+
+    result = app.test_cli_runner().invoke(args=["pokedex", "profile-summary", "--top", "5"])
+
+    assert result.exit_code == 0
+    assert "2 cProfile profiles, by cumulative time" in result.output
+    assert len(result.output.splitlines()) == 2 + 5
+
+
+def test_profile_summary_without_profiles(stub, tmp_path):
+    """Test a clear error before anything was captured."""
+    app = make_app(stub, tmp_path)
+
+    result = app.test_cli_runner().invoke(args=["pokedex", "profile-summary"])
+
+    assert result.exit_code != 0
+    assert "No profiles captured yet" in result.output
@@ -0,0 +1,54 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from app.models.pokemon import Pokemon
+from app.services.pokeapi import PokeAPIService
+from app.services.snapshot import slim_detail
+
+FIXTURES = Path(__file__).parent / "fixtures" / "pokeapi"
+NAMES = ["bulbasaur", "pikachu", "mew"]
+
+
+def load_fixture(name):
+    return (FIXTURES / f"pokemon_{name}.json").read_bytes()
+
+
+@pytest.mark.parametrize("name", NAMES)
+def test_projection_renders_like_the_full_document(name):
+    """Test that a model built from the projection equals one built from the payload."""
+    raw = json.loads(load_fixture(name))
+
+    slim = slim_detail(raw)
+
+    assert Pokemon.from_api(slim) == Pokemon.from_api(raw)
+    assert slim_detail(slim) == slim
+    assert len(json.dumps(slim)) < len(json.dumps(raw)) / 20
+
+
+def test_service_caches_the_projection(mocker):
+    """Test that only the projected record is kept in the cache."""
+    service = PokeAPIService("https://pokeapi.co/api/v2")
+    mock_get = mocker.patch.object(service.session, "get")
+    mock_get.return_value.status_code = 200
+    mock_get.return_value.content = load_fixture("pikachu")
+
+    detail = service.get_pokemon_detail("pikachu")
+    entry = service.cache.get("https://pokeapi.co/api/v2/pokemon/pikachu")
+
+    assert detail["id"] == 25
+    assert entry["data"] == detail
+    assert "moves" not in entry["data"]
+    assert "game_indices" not in entry["data"]
+
+
+def test_invalid_json_is_a_failed_fetch(mocker):
+    """Test that an unparsable body is treated like an upstream error."""
+    service = PokeAPIService("https://pokeapi.co/api/v2")
+    mock_get = mocker.patch.object(service.session, "get")
+    mock_get.return_value.status_code = 200
+    mock_get.return_value.content = b"<html>maintenance</html>"
+
+    assert service.get_pokemon_detail("pikachu") is None
+    assert service.cache.get("https://pokeapi.co/api/v2/pokemon/pikachu") is None
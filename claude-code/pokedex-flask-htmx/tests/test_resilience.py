@@ -0,0 +1,246 @@
+import time
+
+import pytest
+
+from app import create_app
+from app.services.pokeapi import PokeAPIService, UpstreamUnavailable
+from app.services.resilience import CLOSED, HALF_OPEN, OPEN, AdaptiveTimeout, CircuitBreaker, RetryBudget
+from app.services.snapshot import Snapshot, build_snapshot
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_service(stub, **kwargs):
+    kwargs.setdefault("breaker", CircuitBreaker(failure_threshold=3, reset_timeout=0.2))
+    return PokeAPIService(stub.base_url, **kwargs)
+
+
+def test_breaker_opens_after_threshold_and_probes_after_reset():
+    """Test closed -> open -> half-open -> closed."""
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=3, window=10, reset_timeout=5, clock=clock)
+
+    for _ in range(3):
+        assert breaker.allow()
+        breaker.record_failure()
+
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    clock.now += 5
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()  # one probe at a time
+    breaker.record_success(0.01)
+    assert breaker.state == CLOSED
+    assert breaker.stats() == {"state": CLOSED, "opened": 1, "rejected": 2}
+
+
+def test_breaker_failed_probe_reopens():
+    """Test that a failing half-open probe opens the breaker again."""
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=5, clock=clock)
+    breaker.record_failure()
+    clock.now += 5
+
+    assert breaker.allow()
+    breaker.record_failure()
+
+    assert breaker.state == OPEN
+    assert breaker.opened == 2
+
+
+def test_breaker_forgets_failures_outside_window():
+    """Test that old failures do not count towards the threshold."""
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, window=10, clock=clock)
+    breaker.record_failure()
+    clock.now += 11
+    breaker.record_failure()
+
+    assert breaker.state == CLOSED
+
+
+def test_slow_calls_count_as_failures():
+    """Test that successful but slow calls open the breaker."""
+    breaker = CircuitBreaker(failure_threshold=2, slow_call=1)
+    breaker.record_success(1.5)
+    breaker.record_success(0.1)
+    breaker.record_success(2.0)
+
+    assert breaker.state == OPEN
+
+
+def test_retry_budget_is_a_fraction_of_requests():
+    """Test that retries are limited by deposits from first attempts."""
+    budget = RetryBudget(ratio=0.5, min_tokens=1)
+
+    assert budget.try_spend()
+    assert not budget.try_spend()
+    budget.deposit()
+    budget.deposit()
+    assert budget.try_spend()
+    assert budget.stats() == {"tokens": 0.0, "retries": 2, "exhausted": 1}
+
+
+def test_adaptive_timeout_follows_latency():
+    """Test that timeouts start at the ceiling and track observed percentiles."""
+    timeouts = AdaptiveTimeout(ceiling=10, floor=0.5, multiplier=3, min_samples=10)
+    assert timeouts.current == (10, 10)
+
+    for _ in range(99):
+        timeouts.record(0.2)
+    timeouts.record(2.0)
+    assert timeouts.current == pytest.approx((0.6, 6.0))
+
+    for _ in range(200):
+        timeouts.record(0.01)
+    assert timeouts.current == (0.5, 0.5)
+
+
+def test_transient_errors_are_retried(stub):
+    """Test that a 503 is retried and the caller sees the success."""
+    service = make_service(stub)
+    stub.fail_next = 1
+
+    assert service.get_pokemon_detail("pikachu")["id"] == 25
+    assert stub.hits["/api/v2/pokemon/pikachu"] == 2
+    assert service.upstream_stats()["retry_budget"]["retries"] == 1
+    service.close()
+
+
+def test_not_found_is_not_retried_or_counted(stub):
+    """Test that 404 is an answer, not an upstream failure."""
+    service = make_service(stub)
+
+    for _ in range(5):
+        assert service.get_pokemon_detail("missingno") is None
+
+    assert stub.total_hits == 5
+    assert service.breaker.state == CLOSED
+    service.close()
+
+
+def test_open_breaker_fails_fast(stub):
+    """Test that once the upstream keeps failing, calls stop reaching it."""
+    service = make_service(stub, max_retries=0)
+    stub.fail_next = 100
+
+    for name in ("bulbasaur", "ivysaur", "venusaur"):
+        assert service.get_pokemon_detail(name) is None
+    hits = stub.total_hits
+
+    start = time.monotonic()
+    assert service.get_pokemon_detail("charmander") is None
+    assert time.monotonic() - start < 0.05
+    assert stub.total_hits == hits
+    assert service.breaker.state == OPEN
+    service.close()
+
+
+def test_breaker_closes_when_upstream_recovers(stub):
+    """Test that a successful probe after the reset timeout closes the breaker."""
+    service = make_service(stub, max_retries=0)
+    stub.fail_next = 3
+    for name in ("bulbasaur", "ivysaur", "venusaur"):
+        service.get_pokemon_detail(name)
+    assert service.breaker.state == OPEN
+
+    time.sleep(0.25)
+
+    assert service.get_pokemon_detail("pikachu")["id"] == 25
+    assert service.breaker.state == CLOSED
+    service.close()
+
+
+def test_open_breaker_keeps_serving_stale_cache(stub):
+    """Test that cached pages stay available while the upstream is down."""
+    service = make_service(stub, max_retries=0, cache_timeout=0.05, max_stale=60)
+    assert service.get_pokemon_detail("pikachu")["id"] == 25
+    stub.fail_next = 100
+    for name in ("bulbasaur", "ivysaur", "venusaur"):
+        service.get_pokemon_detail(name)
+    time.sleep(0.1)
+
+    assert service.breaker.state == OPEN
+    assert service.get_pokemon_detail("pikachu")["id"] == 25
+    service.close()
+
+
+def test_slow_upstream_trips_breaker(stub):
+    """Test that slow responses open the breaker so later calls do not wait."""
+    service = make_service(stub, breaker=CircuitBreaker(failure_threshold=2, slow_call=0.1))
+    stub.latency = 0.15
+    service.get_pokemon_detail("bulbasaur")
+    service.get_pokemon_detail("ivysaur")
+
+    start = time.monotonic()
+    assert service.get_pokemon_detail("venusaur") is None
+    assert time.monotonic() - start < 0.05
+    service.close()
+
+
+def test_adapted_read_timeout_cuts_off_hung_requests(stub):
+    """Test that a learned low latency bounds how long a hung request blocks."""
+    service = make_service(stub, max_retries=0)
+    service.get_pokemon_details_many(range(1, 31))
+    assert service.upstream_stats()["timeouts"]["read_timeout"] == 1  # the floor
+
+    stub.latency = 3
+    start = time.monotonic()
+    assert service.get_pokemon_detail("mew") is None
+    assert time.monotonic() - start < 2
+    service.close()
+
+
+def test_snapshot_fallback_answers_while_upstream_fails(stub):
+    """Test that a fallback snapshot answers when the upstream and cache cannot."""
+    healthy = PokeAPIService(stub.base_url, cache_timeout=0)
+    snapshot = Snapshot(build_snapshot(healthy, limit=151))
+    healthy.close()
+    service = make_service(stub, max_retries=0, fallback=snapshot)
+    stub.fail_next = 100
+
+    assert service.get_pokemon_detail("pikachu")["id"] == 25
+    assert len(service.get_pokemon_list(limit=10)["results"]) == 10
+    service.close()
+
+
+def test_strict_lookups_tell_outages_from_missing_pokemon(stub):
+    """Test that strict lookups raise on failures and return None only for a 404."""
+    service = make_service(stub, max_retries=0)
+
+    assert service.get_pokemon_detail("missingno", strict=True) is None
+    stub.fail_next = 1
+    with pytest.raises(UpstreamUnavailable):
+        service.get_pokemon_detail("pikachu", strict=True)
+    stub.fail_next = 1
+    assert service.get_pokemon_detail("pikachu") is None
+    service.close()
+
+
+def test_detail_page_is_503_during_outage(stub):
+    """Test that the detail page does not claim a pokemon is missing while PokeAPI fails."""
+    app = create_app({"TESTING": True, "POKEAPI_BASE_URL": stub.base_url, "POKEAPI_MAX_RETRIES": 0})
+    stub.fail_next = 100
+
+    response = app.test_client().get("/pokemon/pikachu")
+
+    assert response.status_code == 503
+    assert b"PokeAPI Is Unavailable" in response.data
+
+
+def test_admin_upstream_status(stub):
+    """Test that breaker state is exposed to admins."""
+    app = create_app({"TESTING": True, "POKEAPI_BASE_URL": stub.base_url, "ADMIN_TOKEN": "s3cret"})
+    client = app.test_client()
+
+    assert client.get("/admin/upstream").status_code == 404
+    data = client.get("/admin/upstream", headers={"Authorization": "Bearer s3cret"}).json
+    assert data["breaker"]["state"] == CLOSED
+    assert data["timeouts"]["read_timeout"] == app.config["POKEAPI_TIMEOUT"]
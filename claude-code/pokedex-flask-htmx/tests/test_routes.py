@@ -1,5 +1,7 @@
 import pytest
 from app import create_app
+from app.services.search import SearchIndex
+from benchmarks.stub_pokeapi import StubPokeAPI
 
 
 @pytest.fixture
@@ -75,13 +77,13 @@ def test_pokemon_detail_not_found(client, mocker):
 def test_search_route(client, mocker):
     """Test search by name with mocked service."""
     mock_service = mocker.patch("app.routes.main.get_pokeapi_service")
-    mock_service.return_value.get_pokemon_list.return_value = {
-        "results": [
+    mock_service.return_value.get_search_index.return_value = SearchIndex.from_list_results(
+        [
             {"name": "bulbasaur", "url": "https://pokeapi.co/api/v2/pokemon/1/"},
             {"name": "ivysaur", "url": "https://pokeapi.co/api/v2/pokemon/2/"},
             {"name": "venusaur", "url": "https://pokeapi.co/api/v2/pokemon/3/"},
         ]
-    }
+    )
 
     response = client.get("/search?q=saur")
     assert response.status_code == 200
@@ -91,16 +93,12 @@ def test_search_route(client, mocker):
 def test_search_by_number(client, mocker):
     """Test search by ID with mocked service."""
     mock_service = mocker.patch("app.routes.main.get_pokeapi_service")
-    mock_service.return_value.get_pokemon_detail.return_value = {
-        "id": 25,
-        "name": "pikachu",
-        "height": 4,
-        "weight": 60,
-        "types": [{"type": {"name": "electric"}}],
-        "stats": [],
-        "abilities": [],
-        "sprites": {"front_default": "https://example.com/25.png"},
-    }
+    mock_service.return_value.get_search_index.return_value = SearchIndex.from_list_results(
+        [
+            {"name": "raichu", "url": "https://pokeapi.co/api/v2/pokemon/26/"},
+            {"name": "pikachu", "url": "https://pokeapi.co/api/v2/pokemon/25/"},
+        ]
+    )
 
     response = client.get("/search?q=25")
     assert response.status_code == 200
@@ -112,3 +110,53 @@ def test_search_empty_query(client):
     response = client.get("/search?q=")
     assert response.status_code == 200
     assert b"No results" in response.data or b"no results" in response.data
+
+
+def test_enriched_pokemon_list_fetches_each_pokemon_once(stub):
+    """Test the enriched list shows types and costs one upstream call per pokemon per TTL."""
+    app = create_app({"TESTING": True, "POKEAPI_BASE_URL": stub.base_url, "POKEDEX_ENRICHED_LIST": True})
+    client = app.test_client()
+
+    for _ in range(3):
+        for path in ("/pokemon", "/pokemon/cards?offset=48", "/pokemon/cards?offset=96", "/pokemon/cards?offset=144"):
+            response = client.get(path)
+            assert response.status_code == 200
+            assert b"Grass" in response.data
+            assert b"Total 315" in response.data
+
+    detail_hits = sum(count for path, count in stub.hits.items() if path != "/api/v2/pokemon")
+    assert stub.hits["/api/v2/pokemon"] == 4
+    assert detail_hits == 151
+    assert max(count for path, count in stub.hits.items() if path != "/api/v2/pokemon") == 1
+
+
+def test_pokemon_list_pagination():
+    """Test that the list renders one page and links the next one for infinite scroll."""
+    with StubPokeAPI(count=1025) as stub:
+        app = create_app(
+            {"TESTING": True, "POKEAPI_BASE_URL": stub.base_url, "POKEDEX_SIZE": 1025, "POKEDEX_PAGE_SIZE": 48}
+        )
+        client = app.test_client()
+
+        first = client.get("/pokemon")
+        assert first.status_code == 200
+        assert b"1025 Pok" in first.data
+        assert first.data.count(b"pokemon-card ") == 48
+        assert b'hx-get="/pokemon/cards?offset=48"' in first.data
+        assert b'hx-trigger="revealed"' in first.data
+
+        page = client.get("/pokemon/cards?offset=48")
+        assert page.data.count(b"pokemon-card ") == 48
+        assert b"<html" not in page.data
+        assert b'hx-get="/pokemon/cards?offset=96"' in page.data
+
+        # Offsets snap to page boundaries so pages stay cacheable
+        assert client.get("/pokemon/cards?offset=50").data == page.data
+
+        last = client.get("/pokemon/cards?offset=1008")
+        assert last.data.count(b"pokemon-card ") == 17
+        assert b"hx-get" not in last.data
+
+        assert client.get("/pokemon/cards?offset=5000").data.strip() == b""
+
+    assert stub.hits["/api/v2/pokemon"] == 3
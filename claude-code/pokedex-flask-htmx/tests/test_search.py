@@ -0,0 +1,87 @@
+from app.services.pokeapi import PokeAPIService
+from app.services.search import SearchIndex, prefix_edit_distance
+from benchmarks.stub_pokeapi import GEN1_NAMES
+
+
+def make_index():
+    return SearchIndex.from_list_results(
+        [{"name": name, "url": f"https://pokeapi.co/api/v2/pokemon/{i}/"} for i, name in enumerate(GEN1_NAMES, 1)]
+    )
+
+
+def test_search_by_number():
+    """Test that numeric queries match the ID exactly."""
+    index = make_index()
+
+    assert [p.name for p in index.search("25")] == ["pikachu"]
+    assert index.search("999") == []
+
+
+def test_search_prefix_before_substring():
+    """Test that prefix matches rank ahead of other substring matches."""
+    index = make_index()
+
+    names = [p.name for p in index.search("char")]
+
+    assert names[:3] == ["charmander", "charmeleon", "charizard"]
+    names = [p.name for p in index.search("saur")]
+    assert names[:3] == ["bulbasaur", "ivysaur", "venusaur"]
+    names = [p.name for p in index.search("ra")]
+    assert names[:2] == ["rattata", "raticate"]
+    assert "zubat" not in names
+
+
+def test_search_matches_linear_scan():
+    """Test that the index finds the same names as a substring scan."""
+    index = make_index()
+
+    for query in ("a", "ee", "pid", "chu", "dos", "ditto", "mr-", "xyz", "eon"):
+        expected = {name for name in GEN1_NAMES if query in name}
+        assert set(index.substring_matches(query)) == {GEN1_NAMES.index(name) for name in expected}, query
+        assert {p.name for p in index.search(query, limit=200)} >= expected, query
+
+
+def test_prefix_edit_distance():
+    """Test the distance to the closest prefix and its cutoff."""
+    assert prefix_edit_distance("charzard", "charizard", 2) == 1
+    assert prefix_edit_distance("pikachuu", "pikachu", 2) == 1
+    assert prefix_edit_distance("charz", "charizard", 1) == 1
+    assert prefix_edit_distance("kitten", "sitting", 3) == 2
+    assert prefix_edit_distance("kitten", "sitting", 1) is None
+    assert prefix_edit_distance("mewtwo", "mew", 2) is None
+
+
+def test_search_tolerates_typos():
+    """Test that misspelled names still find the intended pokemon first."""
+    index = make_index()
+
+    assert index.search("pikachuu")[0].name == "pikachu"
+    assert index.search("charzard")[0].name == "charizard"
+    assert index.search("bulbasuar")[0].name == "bulbasaur"
+    assert index.search("snorlx")[0].name == "snorlax"
+    assert index.search("jigglypuf")[0].name == "jigglypuff"
+    assert index.search("xyzzy") == []
+
+
+def test_search_ranks_exact_before_fuzzy():
+    """Test that an exact name comes first and prefix matches outrank typos."""
+    names = [p.name for p in make_index().search("mew")]
+
+    assert names[:2] == ["mew", "mewtwo"]
+
+
+def test_search_limit():
+    """Test that at most `limit` results are returned."""
+    assert len(make_index().search("a", limit=10)) == 10
+
+
+def test_service_reuses_search_index(stub):
+    """Test that repeated searches do not refetch the list."""
+    service = PokeAPIService(stub.base_url)
+    first = service.get_search_index(limit=151)
+    for _ in range(5):
+        assert service.get_search_index(limit=151) is first
+    service.close()
+
+    assert len(first) == 151
+    assert stub.total_hits == 1
@@ -0,0 +1,88 @@
+import pytest
+
+from app import create_app
+from app.sequencing import SEQUENCE_HEADER, SEQUENCE_TOKEN_HEADER, RequestSequencer
+
+
+@pytest.fixture
+def app(stub):
+    return create_app({"TESTING": True, "POKEAPI_BASE_URL": stub.base_url})
+
+
+def keystroke(token, sequence):
+    return {"HX-Request": "true", SEQUENCE_TOKEN_HEADER: token, SEQUENCE_HEADER: str(sequence)}
+
+
+def test_sequencer_rejects_older_numbers_per_token():
+    """Test that only requests older than the newest seen are superseded."""
+    sequencer = RequestSequencer()
+
+    assert sequencer.advance("a", 2)
+    assert not sequencer.advance("a", 1)
+    assert sequencer.advance("b", 1)
+    assert sequencer.is_latest("a", 2)
+    assert sequencer.advance("a", 3)
+    assert not sequencer.is_latest("a", 2)
+    assert sequencer.stats() == {"clients": 2, "superseded": 2}
+
+
+def test_overtaken_search_gets_204(app):
+    """Test that a keystroke arriving after a newer one is not searched."""
+    client = app.test_client()
+
+    assert client.get("/search?q=char", headers=keystroke("t1", 2)).status_code == 200
+    response = client.get("/search?q=cha", headers=keystroke("t1", 1))
+
+    assert response.status_code == 204
+    assert response.data == b""
+    assert client.get("/search?q=cha", headers=keystroke("t2", 1)).status_code == 200
+
+
+def test_search_superseded_while_running_is_not_rendered(app, mocker):
+    """Test that a newer keystroke arriving during the lookup skips rendering."""
+    client = app.test_client()
+    index = app.extensions["pokeapi"].get_search_index(limit=151)
+    sequencer = app.extensions["request_sequencer"]
+
+    def search_then_type(query, limit):
+        sequencer.advance("t1", 2)
+        return []
+
+    mocker.patch.object(index, "search", side_effect=search_then_type)
+    render = mocker.patch("app.routes.main.render_template")
+
+    response = client.get("/search?q=pika", headers=keystroke("t1", 1))
+
+    assert response.status_code == 204
+    render.assert_not_called()
+    assert app.extensions["request_sequencer"].stats()["superseded"] == 1
+
+
+def test_short_name_queries_get_204(app):
+    """Test the minimum length for names, which numbers are exempt from."""
+    client = app.test_client()
+
+    assert client.get("/search?q=p", headers={"HX-Request": "true"}).status_code == 204
+    assert b"Bulbasaur" in client.get("/search?q=1").data
+    assert client.get("/search?q=pi").status_code == 200
+
+
+def test_cleared_search_box_empties_results(app):
+    """Test that an empty HTMX query returns an empty fragment."""
+    response = app.test_client().get("/search?q=", headers={"HX-Request": "true"})
+
+    assert response.status_code == 200
+    assert response.data == b""
+
+
+def test_navbar_search_uses_configured_debounce():
+    """Test that hx-trigger carries SEARCH_DEBOUNCE_MS and requests are numbered."""
+    app = create_app({"TESTING": True, "SEARCH_DEBOUNCE_MS": 400, "PAGE_CACHE_ENABLED": False})
+    with app.test_request_context():
+        from flask import render_template
+
+        navbar = render_template("components/navbar.html")
+
+    assert 'hx-trigger="input changed delay:400ms, search"' in navbar
+    assert 'hx-sync="this:replace"' in navbar
+    assert SEQUENCE_HEADER in navbar
@@ -0,0 +1,86 @@
+import threading
+import time
+
+from app.services.pokeapi import PokeAPIService
+from app.services.singleflight import SingleFlight
+from benchmarks.stub_pokeapi import StubPokeAPI
+
+
+def run_concurrently(count, target):
+    """Start count threads at once and collect what target returns or raises."""
+    barrier = threading.Barrier(count)
+    results = [None] * count
+
+    def worker(i):
+        barrier.wait()
+        try:
+            results[i] = target()
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_concurrent_calls_share_one_execution():
+    """Test that callers for the same key wait on one execution."""
+    group = SingleFlight()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.2)
+        return {"name": "pikachu"}
+
+    results = run_concurrently(20, lambda: group.do("pikachu", slow))
+
+    assert len(calls) == 1
+    assert all(r == {"name": "pikachu"} for r in results)
+    assert group.stats() == {"executed": 1, "shared": 19}
+
+
+def test_errors_are_shared_and_not_remembered():
+    """Test that waiters see the leader's exception and later calls retry."""
+    group = SingleFlight()
+
+    def failing():
+        time.sleep(0.1)
+        raise ValueError("upstream down")
+
+    results = run_concurrently(5, lambda: group.do("k", failing))
+    assert all(isinstance(r, ValueError) for r in results)
+
+    assert group.do("k", lambda: 42) == 42
+
+
+def test_different_keys_run_independently():
+    """Test that distinct keys are not coalesced."""
+    group = SingleFlight()
+
+    assert group.do("a", lambda: 1) == 1
+    assert group.do("b", lambda: 2) == 2
+    assert group.stats()["executed"] == 2
+
+
+def test_sequential_calls_are_not_cached():
+    """Test that a finished call is not reused."""
+    group = SingleFlight()
+    counter = iter(range(10))
+
+    assert group.do("k", lambda: next(counter)) == 0
+    assert group.do("k", lambda: next(counter)) == 1
+
+
+def test_service_burst_sends_one_upstream_request():
+    """Test a 100-thread burst on an uncached pokemon against a stub server."""
+    with StubPokeAPI(latency=0.3) as stub:
+        service = PokeAPIService(stub.base_url, pool_maxsize=100)
+        results = run_concurrently(100, lambda: service.get_pokemon_detail("pikachu"))
+        service.close()
+
+    assert stub.hits["/api/v2/pokemon/pikachu"] == 1
+    assert all(r["name"] == "pikachu" for r in results)
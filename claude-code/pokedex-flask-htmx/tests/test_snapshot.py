@@ -0,0 +1,101 @@
+import pytest
+
+from app import create_app
+from app.services.pokeapi import PokeAPIService
+from app.services.snapshot import Snapshot, SnapshotError, build_snapshot, save_snapshot, slim_detail
+from benchmarks.stub_pokeapi import StubPokeAPI, detail_payload
+
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    """Build a small snapshot from the stub server."""
+    path = tmp_path / "snapshot.json"
+    with StubPokeAPI(count=151) as stub:
+        service = PokeAPIService(stub.base_url)
+        save_snapshot(build_snapshot(service, limit=151), str(path))
+        service.close()
+    return path
+
+
+def test_slim_detail_keeps_rendered_fields():
+    """Test that slimmed records drop everything the app does not render."""
+    raw = detail_payload(1)
+    raw["moves"] = [{"move": {"name": "tackle"}}] * 50
+    raw["game_indices"] = [{"game_index": 153}]
+
+    slim = slim_detail(raw)
+
+    assert "moves" not in slim
+    assert "game_indices" not in slim
+    assert (
+        slim["sprites"]["other"]["official-artwork"]["front_default"]
+        == raw["sprites"]["other"]["official-artwork"]["front_default"]
+    )
+
+
+def test_snapshot_lookup(snapshot_path):
+    """Test list paging and name/ID lookups from a saved snapshot."""
+    snapshot = Snapshot.load(str(snapshot_path))
+
+    assert len(snapshot) == 151
+    page = snapshot.get_pokemon_list(limit=9, offset=3)
+    assert [p["name"] for p in page["results"]][:2] == ["charmander", "charmeleon"]
+    assert snapshot.get_pokemon_detail("Pikachu")["id"] == 25
+    assert snapshot.get_pokemon_detail(25)["name"] == "pikachu"
+    assert snapshot.get_pokemon_detail("missingno") is None
+
+
+def test_snapshot_rejects_unknown_version(tmp_path):
+    """Test that snapshots from another format version are refused."""
+    path = tmp_path / "snapshot.json"
+    path.write_text('{"version": 999}')
+
+    with pytest.raises(SnapshotError):
+        Snapshot.load(str(path))
+
+
+def test_snapshot_command(tmp_path):
+    """Test that `flask pokedex snapshot` writes a loadable file."""
+    output = tmp_path / "snapshot.json"
+    with StubPokeAPI(count=12) as stub:
+        app = create_app({"TESTING": True, "POKEAPI_BASE_URL": stub.base_url})
+        result = app.test_cli_runner().invoke(args=["pokedex", "snapshot", "--limit", "12", "--output", str(output)])
+
+    assert result.exit_code == 0, result.output
+    assert "Wrote 12 pokemon" in result.output
+    assert len(Snapshot.load(str(output))) == 12
+
+
+def test_snapshot_command_defaults_to_pokedex_size(tmp_path):
+    """Test that the snapshot covers POKEDEX_SIZE pokemon, in list order, unless --limit says otherwise."""
+    output = tmp_path / "snapshot.json"
+    with StubPokeAPI(count=20) as stub:
+        app = create_app({"TESTING": True, "POKEAPI_BASE_URL": stub.base_url, "POKEDEX_SIZE": 9})
+        result = app.test_cli_runner().invoke(args=["pokedex", "snapshot", "--output", str(output)])
+
+    assert result.exit_code == 0, result.output
+    snapshot = Snapshot.load(str(output))
+    assert [record["name"] for record in snapshot.pokemon] == [entry["name"] for entry in snapshot.results]
+    assert len(snapshot) == 9
+
+
+def test_local_mode_makes_no_network_calls(stub, snapshot_path):
+    """Test that local data mode serves every page from the snapshot."""
+    app = create_app(
+        {
+            "TESTING": True,
+            "POKEAPI_BASE_URL": stub.base_url,
+            "POKEDEX_DATA_MODE": "local",
+            "POKEDEX_SNAPSHOT_PATH": str(snapshot_path),
+        }
+    )
+    client = app.test_client()
+
+    assert b"Bulbasaur" in client.get("/").data
+    assert b"Bulbasaur" in client.get("/pokemon").data
+    assert b"Mew" in client.get("/pokemon/cards?offset=144").data
+    assert b"Pikachu" in client.get("/pokemon/pikachu").data
+    assert client.get("/pokemon/missingno").status_code == 404
+    assert b"Charizard" in client.get("/search?q=char").data
+
+    assert stub.total_hits == 0
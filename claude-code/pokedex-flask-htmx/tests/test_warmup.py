@@ -0,0 +1,138 @@
+import time
+
+
+from app import create_app
+from app.services.pokeapi import PokeAPIService
+from app.services.warmup import CacheWarmer, start_cache_warmer, warm_app, warm_cache
+from benchmarks.stub_pokeapi import StubPokeAPI
+
+
+def test_warm_cache_fetches_list_pages_and_details(stub):
+    """Test that warming fills the cache for every page the app renders."""
+    service = PokeAPIService(stub.base_url)
+
+    report = warm_cache(service, limit=151, page_size=48)
+
+    assert report.failed == 0
+    assert report.fetched == 1 + 4 + 151  # full list, 4 list pages, details
+    assert report.duration > 0
+    stub.reset()
+    assert service.get_pokemon_detail("mew")["id"] == 151
+    assert service.get_pokemon_list(limit=48, offset=96)["results"][0]["name"] == "hypno"
+    assert service.get_search_index(limit=151).search("pika")[0].name == "pikachu"
+    assert stub.total_hits == 0
+    service.close()
+
+
+def test_warm_cache_refreshes_fresh_entries(stub):
+    """Test that a second run re-fetches so entries get a new lifetime."""
+    service = PokeAPIService(stub.base_url)
+    service.get_pokemon_detail("pikachu")
+
+    warm_cache(service, limit=30)
+
+    assert stub.hits["/api/v2/pokemon/pikachu"] == 2
+    service.close()
+
+
+def test_warm_cache_bounds_concurrency():
+    """Test that no more than `concurrency` requests are in flight."""
+    with StubPokeAPI(latency=0.01) as stub:
+        service = PokeAPIService(stub.base_url)
+        warm_cache(service, limit=40, concurrency=4)
+        service.close()
+
+    assert stub.peak_active <= 4
+
+
+def test_warm_cache_reports_failures(stub, mocker):
+    """Test that failed fetches are counted and named."""
+    service = PokeAPIService(stub.base_url)
+    fetch = service.get_pokemon_detail
+    mocker.patch.object(
+        service, "get_pokemon_detail", side_effect=lambda name, refresh: None if name == "mew" else fetch(name, refresh)
+    )
+
+    report = warm_cache(service, limit=151)
+
+    assert report.fetched == 151
+    assert report.failed == 1
+    assert report.failures == ["mew"]
+    assert str(report).startswith("Warmed 151 documents in")
+    service.close()
+
+
+def test_create_app_never_warms(stub):
+    """Test that create_app leaves warming to the serving process, even with CACHE_WARM_ON_START."""
+    stub.reset()
+    app = create_app({"TESTING": True, "POKEAPI_BASE_URL": stub.base_url, "CACHE_WARM_ON_START": True})
+
+    assert "cache_warmup" not in app.extensions
+    assert stub.total_hits == 0
+
+
+def test_warm_app_fills_the_cache(stub):
+    """Test that warm_app, as gunicorn and run.py call it, warms before the first request."""
+    app = create_app({"TESTING": True, "POKEAPI_BASE_URL": stub.base_url})
+
+    assert warm_app(app).failed == 0
+    stub.reset()
+    assert app.test_client().get("/pokemon/charizard").status_code == 200
+    assert stub.total_hits == 0
+
+
+def test_scheduled_rewarm(stub):
+    """Test that the warmer re-runs every interval."""
+    app = create_app({"TESTING": True, "POKEAPI_BASE_URL": stub.base_url, "POKEDEX_SIZE": 10})
+    warmer = CacheWarmer(app, interval=0.05)
+    warmer.start()
+    deadline = time.monotonic() + 5
+    while warmer.runs < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    warmer.stop()
+
+    assert warmer.runs >= 2
+    assert warmer.last_report.fetched == 1 + 10
+    assert stub.hits["/api/v2/pokemon/bulbasaur"] >= 2
+
+
+def test_schedule_is_started_by_the_serving_process_only(stub):
+    """Test that create_app (and so every CLI command) starts no warmer."""
+    app = create_app({"TESTING": True, "POKEAPI_BASE_URL": stub.base_url, "CACHE_WARM_INTERVAL": 3600})
+
+    assert "cache_warmer" not in app.extensions
+    warmer = start_cache_warmer(app)
+    try:
+        assert app.extensions["cache_warmer"] is warmer
+    finally:
+        warmer.stop()
+    assert start_cache_warmer(create_app({"TESTING": True, "POKEAPI_BASE_URL": stub.base_url})) is None
+
+
+def test_warm_command_fills_shared_cache(stub, tmp_path):
+    """Test that `flask pokedex warm` fills a disk cache the workers read."""
+    config = {
+        "TESTING": True,
+        "POKEAPI_BASE_URL": stub.base_url,
+        "CACHE_BACKEND": "disk",
+        "CACHE_PATH": str(tmp_path / "cache.sqlite3"),
+    }
+
+    result = create_app(config).test_cli_runner().invoke(args=["pokedex", "warm"])
+
+    assert result.exit_code == 0, result.output
+    assert "Warmed 156 documents" in result.output
+    stub.reset()
+    worker = create_app(config).test_client()
+    assert worker.get("/pokemon/dragonite").status_code == 200
+    assert stub.total_hits == 0
+
+
+def test_warm_command_without_cache():
+    """Test that warming an app with caching disabled is reported as an error."""
+    app = create_app({"TESTING": True, "CACHE_TIMEOUT": 0})
+
+    result = app.test_cli_runner().invoke(args=["pokedex", "warm"])
+
+    assert result.exit_code != 0
+    assert "Nothing to warm" in result.output